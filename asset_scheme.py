@@ -0,0 +1,92 @@
+"""
+sambar-asset:// for the HUD page: index.html and everything it loads from the app (sidebar.html,
+SVGs, img/, the pre-scaled images from assets.py) served from memory.
+The files are read once when the HUD is built; after that the page, and reloading it on Home,
+never touch the SD card. Responses carry long-lived cache headers where Qt supports them.
+Only used by hud_web, and by main.py to register the scheme at startup; never in low-power mode.
+"""
+
+import os
+
+from PyQt6.QtCore import QBuffer, QByteArray
+from PyQt6.QtWebEngineCore import QWebEngineUrlRequestJob, QWebEngineUrlScheme, QWebEngineUrlSchemeHandler
+
+SCHEME = b"sambar-asset"
+HOST = "hud"
+
+_MIME_TYPES = {
+    ".html": b"text/html",
+    ".js": b"text/javascript",
+    ".css": b"text/css",
+    ".svg": b"image/svg+xml",
+    ".png": b"image/png",
+    ".jpg": b"image/jpeg",
+    ".jpeg": b"image/jpeg",
+    ".webp": b"image/webp",
+}
+
+_CACHE_HEADERS = {b"Cache-Control": b"public, max-age=31536000, immutable"}
+
+
+def register_scheme() -> None:
+    """Make sambar-asset:// known to Chromium. Qt needs this before the QApplication and the first web engine
+    profile or page exist, so main.py calls it at startup."""
+    if QWebEngineUrlScheme.schemeByName(SCHEME).name() == SCHEME:
+        return
+    scheme = QWebEngineUrlScheme(SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    # Local: the page also loads qrc:///qtwebchannel/qwebchannel.js; secure: and https fonts
+    scheme.setFlags(QWebEngineUrlScheme.Flag.SecureScheme | QWebEngineUrlScheme.Flag.LocalAccessAllowed)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+def asset_url(path: str) -> str:
+    """URL of a served file, path relative to the app directory (e.g. "index.html", "img/van-3d.png")."""
+    return f"{SCHEME.decode()}://{HOST}/{path}"
+
+
+class AssetStore(QWebEngineUrlSchemeHandler):
+    """Serves files read into memory by add_file() / add_app_files()."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._files: dict[str, tuple[bytes, bytes]] = {}  # path -> (data, MIME type)
+
+    def add_file(self, path: str, source: str) -> bool:
+        """Serve the contents of file source as path. False if it can't be read."""
+        mime = _MIME_TYPES.get(os.path.splitext(source)[1].lower(), b"application/octet-stream")
+        try:
+            with open(source, "rb") as f:
+                self._files[path] = (f.read(), mime)
+        except OSError as e:
+            print(f"Could not load HUD asset {source}: {e}")
+            return False
+        return True
+
+    def add_app_files(self, app_dir: str) -> None:
+        """The app's pages and SVGs, and img/."""
+        for name in sorted(os.listdir(app_dir)):
+            if os.path.splitext(name)[1].lower() in (".html", ".svg"):
+                self.add_file(name, os.path.join(app_dir, name))
+        img_dir = os.path.join(app_dir, "img")
+        if os.path.isdir(img_dir):
+            for name in sorted(os.listdir(img_dir)):
+                if os.path.splitext(name)[1].lower() in _MIME_TYPES:
+                    self.add_file(f"img/{name}", os.path.join(img_dir, name))
+
+    def size(self) -> int:
+        return sum(len(data) for data, _mime in self._files.values())
+
+    def requestStarted(self, job: QWebEngineUrlRequestJob) -> None:
+        url = job.requestUrl()
+        entry = self._files.get(url.path().lstrip("/")) if url.host() == HOST else None
+        if entry is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        data, mime = entry
+        if hasattr(job, "setAdditionalResponseHeaders"):  # Qt 6.6+
+            job.setAdditionalResponseHeaders({QByteArray(k): QByteArray(v) for k, v in _CACHE_HEADERS.items()})
+        buffer = QBuffer(job)  # freed with the job
+        buffer.setData(data)
+        buffer.open(QBuffer.OpenModeFlag.ReadOnly)
+        job.reply(mime, buffer)
@@ -0,0 +1,166 @@
+"""
+Pre-scaled images from img/ for Sambar HUD.
+Each image is needed at one size per screen resolution (the splash logo, the HUD and sleep screen
+van, ...). scaled_path() returns a copy scaled to fit a box, re-encoded as PNG in
+~/.cache/sambar_hud/assets and keyed by the source's CRC32 and the box, so at runtime the image is
+only decoded at the size it is shown. scripts/build_assets.py builds the copies for RESOLUTIONS
+ahead of time; a copy missing at runtime is built on first use. Imported before the boot splash:
+keep it light.
+"""
+
+import os
+import pickle
+import zlib
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImageReader, QPixmap
+
+from config import CACHE_DIR
+
+IMG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "img")
+ASSET_DIR = os.path.join(CACHE_DIR, "assets")
+
+# Window sizes we run at: the 2560x720 ultrawide, it at 80%, and the Steam Deck (1280x800 panel) with fit_to_screen
+RESOLUTIONS = ((2560, 720), (2048, 576), (1280, 720))
+
+# How the images are laid out (boot_splash, index.html / native_hud, entertainment_panel, carplay_panel)
+SPLASH_LOGO_SCALE = 0.7  # logo fits 70% of the splash
+HUD_VAN_BOX = (420, 240)  # CSS pixels; scaled by the HUD zoom
+SLEEP_VAN_BOX = (500, 350)
+CARPLAY_LOGO_BOX = (320, 320)
+
+_INDEX_PATH = os.path.join(ASSET_DIR, "index.pickle")
+_index = None  # {(source path, mtime_ns, size): crc32}, loaded on first use
+
+
+def hud_zoom(width: int, height: int, fit_to_screen: bool) -> float:
+    """Zoom of the 2560x720 HUD in a width x height window (as MainWindow._apply_hud_zoom)."""
+    if not fit_to_screen:
+        return 1.0
+    return min(width / 2560.0, height / 720.0, 1.0)
+
+
+def asset_boxes(width: int, height: int, zoom: float):
+    """(image, box width, box height, upscale) for each image shown in a width x height window."""
+    yield "subaru-logo.png", int(width * SPLASH_LOGO_SCALE), int(height * SPLASH_LOGO_SCALE), True
+    yield "car-logo.png", int(width * SPLASH_LOGO_SCALE), int(height * SPLASH_LOGO_SCALE), True
+    yield "van-3d.png", round(HUD_VAN_BOX[0] * zoom), round(HUD_VAN_BOX[1] * zoom), False
+    yield "van-3d.png", SLEEP_VAN_BOX[0], SLEEP_VAN_BOX[1], True
+    yield "car-logo.png", CARPLAY_LOGO_BOX[0], CARPLAY_LOGO_BOX[1], True
+
+
+def _load_index() -> dict:
+    global _index
+    if _index is None:
+        try:
+            with open(_INDEX_PATH, "rb") as f:
+                _index = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError):
+            _index = {}
+    return _index
+
+
+def _save_index() -> None:
+    tmp = f"{_INDEX_PATH}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(ASSET_DIR, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump(_index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, _INDEX_PATH)
+    except OSError as e:
+        print(f"Warning: Could not write asset index: {e}")
+
+
+def source_hash(path: str) -> int | None:
+    """CRC32 of the file's contents (remembered by mtime and size, so unchanged files aren't re-read)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (path, st.st_mtime_ns, st.st_size)
+    index = _load_index()
+    crc = index.get(key)
+    if crc is None:
+        crc = 0
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    crc = zlib.crc32(chunk, crc)
+        except OSError:
+            return None
+        for stale in [k for k in index if k[0] == path]:
+            del index[stale]
+        index[key] = crc
+        _save_index()
+    return crc
+
+
+def scaled_path(name: str, box_width: int, box_height: int, upscale: bool = True) -> str | None:
+    """img/<name> scaled to fit box_width x box_height (aspect kept; never enlarged unless upscale),
+    from the cache or built now. None if the image is missing or can't be read."""
+    source = os.path.join(IMG_DIR, name)
+    crc = source_hash(source)
+    if crc is None:
+        return None
+    stem = os.path.splitext(name)[0]
+    path = os.path.join(ASSET_DIR, f"{stem}-{crc:08x}-{box_width}x{box_height}{'' if upscale else '-max'}.png")
+    if os.path.isfile(path):
+        return path
+    return path if _build(source, path, box_width, box_height, upscale) else None
+
+
+def scaled_pixmap(name: str, box_width: int, box_height: int, upscale: bool = True) -> QPixmap | None:
+    path = scaled_path(name, box_width, box_height, upscale)
+    if path is None:
+        return None
+    pixmap = QPixmap(path)
+    return None if pixmap.isNull() else pixmap
+
+
+def _fit(size, box_width: int, box_height: int, upscale: bool):
+    if not upscale and size.width() <= box_width and size.height() <= box_height:
+        return size
+    return size.scaled(max(1, box_width), max(1, box_height), Qt.AspectRatioMode.KeepAspectRatio)
+
+
+def _build(source: str, path: str, box_width: int, box_height: int, upscale: bool) -> bool:
+    reader = QImageReader(source)
+    size = reader.size()
+    if size.isValid():
+        # Decoders that can (JPEG) decode straight to the smaller size; others are scaled smoothly after
+        reader.setScaledSize(_fit(size, box_width, box_height, upscale))
+    image = reader.read()
+    if image.isNull():
+        print(f"Could not read {source}: {reader.errorString()}")
+        return False
+    target = _fit(image.size(), box_width, box_height, upscale)
+    if image.size() != target:
+        image = image.scaled(target, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(ASSET_DIR, exist_ok=True)
+        if not image.save(tmp, "PNG"):
+            raise OSError("QImage.save failed")
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: Could not cache {os.path.basename(path)}: {e}")
+        return False
+    return True
+
+
+def prune(keep: set[str]) -> int:
+    """Delete cached images not in keep (paths). Returns how many were removed."""
+    removed = 0
+    try:
+        names = os.listdir(ASSET_DIR)
+    except OSError:
+        return 0
+    for name in names:
+        path = os.path.join(ASSET_DIR, name)
+        if name.endswith(".png") and path not in keep:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
@@ -0,0 +1,93 @@
+"""
+asyncio on the Qt GUI thread for Sambar HUD.
+Launch and layout flows are coroutines started with spawn(name, coro). They run on the GUI
+thread, so they may touch widgets directly. They wait with asyncio.sleep or awaitable window
+lookups instead of parking a thread in time.sleep, and they can be cancelled by name, so Home
+stops a half-finished Steam Link launch.
+Uses qasync's QEventLoop when it is installed. Otherwise a plain asyncio loop is stepped from
+a QTimer, but only while a task is pending, so an idle HUD pays nothing for it.
+"""
+
+import asyncio
+
+from PyQt6.QtCore import QTimer
+
+try:
+    import qasync
+    _QASYNC_AVAILABLE = True
+except ImportError:
+    _QASYNC_AVAILABLE = False
+
+# Fallback loop step interval (ms) while tasks are pending
+_PUMP_INTERVAL_MS = 15
+
+_loop: asyncio.AbstractEventLoop | None = None
+_pump: QTimer | None = None
+_tasks: dict[str, asyncio.Task] = {}
+
+
+def install_event_loop(app) -> asyncio.AbstractEventLoop:
+    """Create the GUI thread's asyncio loop. Call once, right after creating the QApplication."""
+    global _loop, _pump
+    if _QASYNC_AVAILABLE:
+        _loop = qasync.QEventLoop(app)
+    else:
+        _loop = asyncio.new_event_loop()
+        _pump = QTimer()
+        _pump.setInterval(_PUMP_INTERVAL_MS)
+        _pump.timeout.connect(_step)
+    asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def run_event_loop(app) -> int:
+    """Run the application (instead of app.exec()) and return its exit code."""
+    if _QASYNC_AVAILABLE and _loop is not None:
+        with _loop:
+            code = _loop.run_forever()  # qasync returns app.exec()'s code
+        return code if code is not None else 0  # older qasync returns nothing
+    return app.exec()
+
+
+def spawn(name: str, coro) -> asyncio.Task:
+    """Run coro as the flow called name, cancelling a flow of that name that is still running."""
+    cancel(name)
+    task = _loop.create_task(coro)
+    _tasks[name] = task
+    task.add_done_callback(lambda t, n=name: _on_done(n, t))
+    if _pump is not None and not _pump.isActive():
+        _pump.start()
+    return task
+
+
+def cancel(*names: str) -> None:
+    """Cancel running flows (e.g. the user pressed Home mid-launch). Unknown names are ignored."""
+    for name in names:
+        task = _tasks.pop(name, None)
+        if task is not None and not task.done():
+            task.cancel()
+    if _pump is not None:
+        _pump.start()  # let the cancelled tasks unwind (their finally blocks)
+
+
+def is_running(name: str) -> bool:
+    task = _tasks.get(name)
+    return task is not None and not task.done()
+
+
+def _on_done(name: str, task: asyncio.Task) -> None:
+    if _tasks.get(name) is task:
+        del _tasks[name]
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        print(f"{name} failed: {exc!r}")
+
+
+def _step() -> None:
+    """Run one iteration of the fallback loop; stop the timer once nothing is pending."""
+    _loop.call_soon(_loop.stop)
+    _loop.run_forever()
+    if not asyncio.all_tasks(_loop):
+        _pump.stop()
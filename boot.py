@@ -0,0 +1,127 @@
+"""
+Boot pipeline for Sambar HUD.
+Boot is a small dependency graph of stages (HUD page load, LIVI discovery, LIVI's Xephyr frame,
+LIVI itself, boot sound, ...). Each stage is an asyncio task that starts as soon as its
+dependencies have finished, so independent stages overlap while the splash is on screen. The
+splash is told to close once every critical stage has finished, instead of after a fixed delay.
+"""
+
+import asyncio
+import inspect
+import time
+
+import boot_trace
+
+
+class BootGraph:
+    """
+    Stages with dependencies, run on the GUI thread's asyncio loop (see async_qt).
+    A stage is a callable returning a value or an awaitable. A stage added without one is an
+    external event, completed with set_done() (e.g. "main window shown").
+    A stage that raises counts as finished with result None, and its dependents are skipped,
+    so a broken stage cannot keep the splash up.
+    """
+
+    def __init__(self, on_ready=None):
+        self._stages: dict[str, tuple] = {}  # name -> (fn, deps, critical)
+        self._done: dict[str, asyncio.Future] = {}
+        self._timings: dict[str, tuple] = {}  # name -> (start, end) monotonic
+        self._failed: set[str] = set()
+        self._on_ready = on_ready
+        self._started = None
+
+    def add(self, name: str, fn=None, deps=(), critical: bool = False) -> None:
+        if name in self._stages:
+            raise ValueError(f"duplicate boot stage {name!r}")
+        self._stages[name] = (fn, tuple(deps), critical)
+
+    def set_done(self, name: str, value=None) -> None:
+        """Complete an external-event stage."""
+        future = self._future(name)
+        if not future.done():
+            future.set_result(value)
+            self._timings[name] = (self._started or time.monotonic(), time.monotonic())
+            boot_trace.mark(name)
+
+    def abort(self) -> None:
+        """The graph's flow was cancelled: stages that haven't finished count as failed, so anyone waiting
+        on them (e.g. a stage of another graph) goes on."""
+        for name in self._stages:
+            future = self._future(name)
+            if not future.done():
+                self._failed.add(name)
+                future.set_result(None)
+
+    def result(self, name: str):
+        """Result of a finished stage (None if it failed, was skipped or hasn't finished)."""
+        future = self._done.get(name)
+        if future is None or not future.done() or future.cancelled():
+            return None
+        return future.result()
+
+    async def wait(self, name: str):
+        """Wait for a stage (from inside another stage) and return its result."""
+        return await asyncio.shield(self._future(name))
+
+    async def run(self) -> dict:
+        """Run every stage; returns {name: result} once all have finished."""
+        missing = {dep for _fn, deps, _c in self._stages.values() for dep in deps} - set(self._stages)
+        if missing:
+            raise ValueError(f"unknown boot stage dependencies: {sorted(missing)}")
+        self._started = time.monotonic()
+        tasks = [asyncio.ensure_future(self._run_stage(name)) for name, (fn, _d, _c) in self._stages.items() if fn]
+        critical = [self._future(name) for name, (_fn, _d, c) in self._stages.items() if c]
+        try:
+            if critical:
+                await asyncio.wait(critical)
+            self._report("ready")
+            boot_trace.mark("boot_ready")
+            if self._on_ready is not None:
+                self._on_ready()
+            await asyncio.gather(*tasks, *[self._future(name) for name in self._stages])
+        finally:
+            for task in tasks:
+                task.cancel()
+        self._report("done")
+        return {name: self.result(name) for name in self._stages}
+
+    def _future(self, name: str) -> asyncio.Future:
+        future = self._done.get(name)
+        if future is None:
+            future = asyncio.get_event_loop().create_future()
+            self._done[name] = future
+        return future
+
+    async def _run_stage(self, name: str) -> None:
+        fn, deps, _critical = self._stages[name]
+        future = self._future(name)
+        for dep in deps:
+            await self.wait(dep)
+        failed = [dep for dep in deps if dep in self._failed]
+        start = time.monotonic()
+        value = None
+        if failed:
+            print(f"Boot stage {name} skipped (failed: {', '.join(failed)})")
+            self._failed.add(name)
+        else:
+            try:
+                value = fn()
+                if inspect.isawaitable(value):
+                    value = await value
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Boot stage {name} failed: {e!r}")
+                self._failed.add(name)
+                value = None
+        self._timings[name] = (start, time.monotonic())
+        boot_trace.record(f"stage:{name}", start, self._timings[name][1], failed=name in self._failed)
+        if not future.done():
+            future.set_result(value)
+
+    def _report(self, what: str) -> None:
+        elapsed = time.monotonic() - self._started
+        stages = ", ".join(
+            f"{name} {end - start:.2f}s" for name, (start, end) in sorted(self._timings.items(), key=lambda kv: kv[1][1])
+        )
+        print(f"Boot {what} after {elapsed:.2f}s ({stages})")
@@ -0,0 +1,166 @@
+"""
+Boot sound for Sambar HUD.
+sound/bootintro.mp3 is decoded once into a WAV in ~/.cache/sambar_hud/sound, named after the
+source's mtime and size and the output format, so a replaced mp3 or a changed format gets a fresh
+decode and every other boot only reads PCM. Playback goes through pw-play (PipeWire) or aplay
+(ALSA), which stream the file themselves, with pygame as the fallback. Nothing here touches Qt;
+call play_boot_sound() from a worker thread (main.py starts it with the splash, through
+play_boot_sound_in_background()). How long the sound took to start is recorded in the boot trace.
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+import time
+import wave
+
+import boot_trace
+
+SOUND_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sound", "bootintro.mp3")
+CACHE_DIR = os.path.expanduser("~/.cache/sambar_hud/sound")
+
+# PipeWire's default graph rate; playing at it avoids resampling in the server
+OUTPUT_RATE = 48000
+OUTPUT_CHANNELS = 2
+
+# Process supervisor child name, so quitting during the sound stops it
+_CHILD = "boot-sound"
+
+_pygame_sound = None  # the playing pygame Sound, kept alive until it finishes
+
+
+def cached_wav(source: str = SOUND_PATH, rate: int = OUTPUT_RATE, channels: int = OUTPUT_CHANNELS) -> str | None:
+    """Path of source decoded to 16-bit WAV, decoding it on first use. None if it can't be decoded."""
+    try:
+        st = os.stat(source)
+    except OSError:
+        return None
+    stem = os.path.splitext(os.path.basename(source))[0]
+    path = os.path.join(CACHE_DIR, f"{stem}-{st.st_mtime_ns}-{st.st_size}-{rate}hz-{channels}ch-s16.wav")
+    if os.path.isfile(path):
+        return path
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+    except OSError as e:
+        print(f"Boot sound cache unavailable: {e}")
+        return None
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with boot_trace.span("boot_sound_decode", source=os.path.basename(source)):
+        ok = _decode_ffmpeg(source, tmp, rate, channels) or _decode_pygame(source, tmp, rate, channels)
+    if not ok:
+        _remove(tmp)
+        return None
+    os.replace(tmp, path)
+    _prune(stem, keep=path)
+    return path
+
+
+def _decode_ffmpeg(source: str, dest: str, rate: int, channels: int) -> bool:
+    if shutil.which("ffmpeg") is None:
+        return False
+    try:
+        subprocess.run(
+            ["ffmpeg", "-nostdin", "-v", "error", "-y", "-i", source,
+             "-ar", str(rate), "-ac", str(channels), "-c:a", "pcm_s16le", "-f", "wav", dest],
+            check=True,
+            timeout=30,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        return True
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+
+def _decode_pygame(source: str, dest: str, rate: int, channels: int) -> bool:
+    try:
+        import pygame
+    except ImportError:
+        return False
+    try:
+        pygame.mixer.init(frequency=rate, size=-16, channels=channels)
+        # The mixer may not have got the format we asked for; the WAV header says what it did get
+        got_rate, _size, got_channels = pygame.mixer.get_init()
+        pcm = pygame.mixer.Sound(source).get_raw()
+        with wave.open(dest, "wb") as w:
+            w.setnchannels(got_channels)
+            w.setsampwidth(2)
+            w.setframerate(got_rate)
+            w.writeframes(pcm)
+        return True
+    except Exception:
+        return False
+    finally:
+        pygame.mixer.quit()  # don't hold the audio device the player is about to open
+
+
+def _prune(stem: str, keep: str) -> None:
+    """Remove decodes of older versions of the same sound."""
+    try:
+        names = os.listdir(CACHE_DIR)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(CACHE_DIR, name)
+        if name.startswith(stem + "-") and path != keep and not name.endswith(".tmp"):
+            _remove(path)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _play_process(wav: str) -> str | None:
+    """Start a PipeWire / ALSA player on wav; returns the backend name, None if there is none."""
+    from process_supervisor import get_supervisor
+    for backend, argv in (("pw-play", ["pw-play", wav]), ("aplay", ["aplay", "-q", wav])):
+        if shutil.which(backend) is None:
+            continue
+        try:
+            get_supervisor().start(_CHILD, argv)
+            return backend
+        except OSError:
+            continue
+    return None
+
+
+def _play_pygame(path: str) -> bool:
+    global _pygame_sound
+    try:
+        import pygame
+    except ImportError:
+        return False
+    try:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(frequency=OUTPUT_RATE, size=-16, channels=OUTPUT_CHANNELS)
+        _pygame_sound = pygame.mixer.Sound(path)
+        _pygame_sound.play()
+        return True
+    except Exception:
+        return False
+
+
+def play_boot_sound() -> None:
+    """Play sound/bootintro.mp3 if present. Returns once playback has started; no-op if nothing can play it."""
+    if not os.path.isfile(SOUND_PATH):
+        return
+    requested = time.monotonic()
+    wav = cached_wav()
+    backend = _play_process(wav) if wav else None
+    if backend is None:
+        # pygame plays the cached WAV if there is one; decoding the mp3 itself is the slow path
+        if _play_pygame(wav or SOUND_PATH):
+            backend = "pygame"
+    if backend is None:
+        return
+    # Request to playback started (including a first-boot decode), as an interval in the boot trace
+    boot_trace.record("boot_sound_start", requested, time.monotonic(), backend=backend, pcm=wav is not None)
+
+
+def play_boot_sound_in_background() -> None:
+    """play_boot_sound() on a worker thread, for callers on the GUI thread."""
+    threading.Thread(target=play_boot_sound, name="boot-sound", daemon=True).start()
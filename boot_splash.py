@@ -1,45 +1,47 @@
 """
 Boot splash screen - full screen (2560x720) shown on startup.
-Plays sound/bootintro.mp3 and shows Subaru logo for 3 seconds, then fades to main.
+Plays sound/bootintro.mp3 and shows Subaru logo until boot is ready (or for a fixed time), then fades to main.
 """
 
-import os
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel
 from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QPixmap
 
-try:
-    import pygame
-    _PYGAME_AVAILABLE = True
-except ImportError:
-    _PYGAME_AVAILABLE = False
+import assets
+import boot_trace
 
 
-def _play_boot_sound() -> None:
-    """Play sound/bootintro.mp3 if present. No-op if pygame or file missing."""
-    if not _PYGAME_AVAILABLE:
-        return
-    sound_dir = os.path.join(os.path.dirname(__file__), "sound")
-    path = os.path.join(sound_dir, "bootintro.mp3")
-    if not os.path.isfile(path):
-        return
-    try:
-        pygame.mixer.init()
-        s = pygame.mixer.Sound(path)
-        s.play()
-    except Exception:
-        pass
+def get_effective_screen_size(desired_width: int, desired_height: int, fit_to_screen: bool = True):
+    """Return (width, height). If fit_to_screen is True, use full primary screen size (geometry); else use desired size (e.g. 2560x720 on Pi)."""
+    if not fit_to_screen:
+        return desired_width, desired_height
+    app = QApplication.instance()
+    if app is None:
+        return desired_width, desired_height
+    screen = app.primaryScreen()
+    if screen is None:
+        return desired_width, desired_height
+    # Use geometry() (full screen) so the window fills the display; availableGeometry() would subtract taskbar/panels and make the window too small
+    geom = screen.geometry()
+    w = min(desired_width, geom.width())
+    h = min(desired_height, geom.height())
+    return w, h
 
 
 class BootSplash(QWidget):
     """Full-screen boot animation with Subaru logo and optional boot sound."""
 
-    def __init__(self, width=2560, height=720, duration_ms=3000, parent=None):
+    def __init__(self, width=2560, height=720, duration_ms=3000, parent=None, max_duration_ms=None):
+        """duration_ms: how long the splash shows; with max_duration_ms set it is the minimum and
+        the splash stays until set_ready() is called or max_duration_ms has passed."""
         super().__init__(parent)
         self.width = width
         self.height = height
         self.duration_ms = duration_ms
+        self.max_duration_ms = max_duration_ms
         self.on_finished = None
+        self._ready = False
+        self._min_elapsed = False
+        self._finished = False
         self.setup_ui()
 
     def setup_ui(self):
@@ -49,23 +51,15 @@ class BootSplash(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
 
-        # Subaru logo scaled to fit within screen (width x height)
-        img_dir = os.path.join(os.path.dirname(__file__), "img")
-        logo_path = os.path.join(img_dir, "subaru-logo.png")
-        if not os.path.exists(logo_path):
-            logo_path = os.path.join(img_dir, "car-logo.png")
-        if os.path.exists(logo_path):
+        # Subaru logo pre-scaled to fit within the splash with margin (assets: cached per resolution)
+        box_w = int(self.width * assets.SPLASH_LOGO_SCALE)
+        box_h = int(self.height * assets.SPLASH_LOGO_SCALE)
+        pix = assets.scaled_pixmap("subaru-logo.png", box_w, box_h)
+        if pix is None:
+            pix = assets.scaled_pixmap("car-logo.png", box_w, box_h)
+        if pix is not None:
             logo = QLabel()
             logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            pix = QPixmap(logo_path)
-            if not pix.isNull():
-                # Scale to fit within splash with margin (0.7 = 70% of fit size so logo doesn't touch edges)
-                rw = self.width / pix.width()
-                rh = self.height / pix.height()
-                r = min(rw, rh) * 0.7
-                w = max(1, int(pix.width() * r))
-                h = max(1, int(pix.height() * r))
-                pix = pix.scaled(w, h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
             logo.setPixmap(pix)
             logo.setStyleSheet("background: transparent;")
             layout.addWidget(logo, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -75,14 +69,38 @@ class BootSplash(QWidget):
             title.setStyleSheet("color: #fff; font-size: 72px; font-weight: 600; background: transparent;")
             layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignCenter)
 
-    def show_and_finish(self, callback):
-        """Show splash, play boot sound, call callback after duration (e.g. 3s)."""
+    @boot_trace.traced("BootSplash.show_and_finish")
+    def show_and_finish(self, callback, play_sound=True):
+        """Show splash, play boot sound (unless the caller plays it), call callback after duration (e.g. 3s)
+        or, with max_duration_ms, once ready and the minimum has passed. callback may be None and
+        on_finished set later, as long as that happens before the event loop runs."""
         self.on_finished = callback
         self.showFullScreen()
-        _play_boot_sound()
-        QTimer.singleShot(self.duration_ms, self._finish)
+        if play_sound:
+            from boot_sound import play_boot_sound_in_background
+            play_boot_sound_in_background()
+        if self.max_duration_ms is None:
+            QTimer.singleShot(self.duration_ms, self._finish)
+            return
+        QTimer.singleShot(self.duration_ms, self._on_min_elapsed)
+        QTimer.singleShot(self.max_duration_ms, self._finish)
+
+    def set_ready(self):
+        """Boot has reached a usable state; close as soon as the minimum duration allows."""
+        self._ready = True
+        if self._min_elapsed:
+            self._finish()
+
+    def _on_min_elapsed(self):
+        self._min_elapsed = True
+        if self._ready:
+            self._finish()
 
     def _finish(self):
+        if self._finished:
+            return
+        self._finished = True
+        boot_trace.mark("splash_finished", ready=self._ready)
         if self.on_finished:
             self.on_finished()
         self.close()
@@ -0,0 +1,174 @@
+"""
+Boot timeline tracing for Sambar HUD.
+span(name) / mark(name) record where boot time goes (process start, QApplication, HUD page load,
+Xephyr frame, LIVI window, embed, ...). finish() writes them as a Chrome trace-event JSON file
+(open in chrome://tracing or ui.perfetto.dev), one per boot, into a directory that keeps only
+the newest few. Times are relative to process start, so Python and PyQt import time shows up.
+Tracing is off unless enable() is called (boot.trace in config.yaml or SAMBAR_TRACE=1); while
+off, span() returns a shared no-op and mark() returns immediately.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_TRACE_DIR = os.path.expanduser("~/.cache/sambar_hud/traces")
+
+_enabled = False
+_lock = threading.Lock()
+_events: list[dict] = []
+_marked_once: set[str] = set()
+_thread_names: dict[int, str] = {}
+_directory = DEFAULT_TRACE_DIR
+_keep = 20
+
+
+def _process_start() -> float:
+    """time.monotonic() value at which this process was started (falls back to now)."""
+    try:
+        with open("/proc/self/stat") as f:
+            # starttime is field 22; fields after the parenthesised command name start at 3
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        started_ago = time.clock_gettime(time.CLOCK_BOOTTIME) - start_ticks / os.sysconf("SC_CLK_TCK")
+        return time.monotonic() - started_ago
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.monotonic()
+
+
+_T0 = _process_start()
+
+
+def _us(t: float) -> int:
+    return int((t - _T0) * 1_000_000)
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def enable(directory: str | None = None, keep: int = 20) -> None:
+    """Start recording; finish() writes the trace into directory, keeping the newest keep files."""
+    global _enabled, _directory, _keep
+    _directory = os.path.expanduser(directory) if directory else DEFAULT_TRACE_DIR
+    _keep = max(1, keep)
+    _enabled = True
+    mark("process_start", at=_T0)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def span(name: str, **args):
+    """Context manager timing a block: with span("init_ui"): ..."""
+    if not _enabled:
+        return _NO_SPAN
+    return _span(name, args)
+
+
+@contextmanager
+def _span(name: str, args: dict):
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        record(name, start, time.monotonic(), **args)
+
+
+def traced(name: str):
+    """Decorator: span(name) around every call of the function."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _span(name, {}):
+                return fn(*args, **kwargs)
+        return call
+    return wrap
+
+
+def record(name: str, start: float, end: float, **args) -> None:
+    """Add an already-timed interval (time.monotonic() values), e.g. a boot stage."""
+    if not _enabled:
+        return
+    _add({"name": name, "ph": "X", "ts": _us(start), "dur": max(0, _us(end) - _us(start)), "args": args})
+
+
+def mark(name: str, at: float | None = None, **args) -> None:
+    """Instant event (e.g. "livi_window_mapped"), now or at a time.monotonic() value."""
+    if not _enabled:
+        return
+    _add({"name": name, "ph": "i", "s": "p", "ts": _us(time.monotonic() if at is None else at), "args": args})
+
+
+def mark_once(name: str, **args) -> None:
+    """mark() only the first time (e.g. first overlay switch)."""
+    if not _enabled or name in _marked_once:
+        return
+    _marked_once.add(name)
+    mark(name, **args)
+
+
+def _add(event: dict) -> None:
+    thread = threading.current_thread()
+    event["pid"] = os.getpid()
+    event["tid"] = thread.ident
+    with _lock:
+        _thread_names.setdefault(thread.ident, thread.name)
+        _events.append(event)
+
+
+def finish() -> str | None:
+    """Write the trace and stop recording. Returns the file path (None if tracing was off or writing failed)."""
+    global _enabled
+    if not _enabled:
+        return None
+    _enabled = False
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        meta = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in _thread_names.items()
+        ]
+        _events.clear()
+    path = os.path.join(_directory, time.strftime("boot-%Y%m%d-%H%M%S") + f"-{pid}.json")
+    try:
+        os.makedirs(_directory, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms"}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Could not write boot trace: {e}")
+        return None
+    _prune()
+    print(f"Boot trace written to {path}")
+    return path
+
+
+def _prune() -> None:
+    try:
+        traces = sorted(
+            (os.path.join(_directory, name) for name in os.listdir(_directory)
+             if name.startswith("boot-") and name.endswith(".json")),
+            key=os.path.getmtime,
+        )
+    except OSError:
+        return
+    for path in traces[:-_keep]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -7,12 +7,25 @@ video feed to the right half (1280x720) of the app.
 """
 
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton
-from PyQt6.QtCore import Qt, QUrl, QTimer, QProcess
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtGui import QFont, QPixmap
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QFont
 import subprocess
 import os
 
+import assets
+from process_supervisor import get_supervisor
+
+try:
+    from x11_windows import get_index
+    from ewmh import get_ewmh
+    from window_embed import EmbedSlot
+except ImportError:
+    def get_index(display=None):
+        return None
+    def get_ewmh(display=None):
+        return None
+    EmbedSlot = None
+
 try:
     from carplay_feed import get_video_device, is_video_device_available
 except ImportError:
@@ -30,8 +43,12 @@ class CarPlayPanel(QWidget):
         super().__init__(parent)
         self.width = width
         self.height = height
-        self.feed_process = None
+        self.feed_child = 'capture-feed'  # process supervisor child name
         self.init_ui()
+        # The feed's window is embedded over the panel where X11 allows it, else placed on the right half
+        self.feed_slot = EmbedSlot(self) if EmbedSlot is not None else None
+        if self.feed_slot is not None:
+            self.feed_slot.setGeometry(0, 0, self.width, self.height)
 
     def init_ui(self):
         """Initialize the CarPlay UI — super basic: car logo, Show/Hide CarPlay."""
@@ -43,14 +60,11 @@ class CarPlayPanel(QWidget):
         layout.setSpacing(20)
 
         # Car logo
-        img_dir = os.path.join(os.path.dirname(__file__), 'img')
-        logo_path = os.path.join(img_dir, 'car-logo.png')
         self.logo_label = QLabel()
         self.logo_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.logo_label.setStyleSheet("background: transparent;")
-        if os.path.exists(logo_path):
-            pix = QPixmap(logo_path)
-            pix = pix.scaled(320, 320, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        pix = assets.scaled_pixmap('car-logo.png', *assets.CARPLAY_LOGO_BOX)
+        if pix is not None:
             self.logo_label.setPixmap(pix)
         else:
             self.logo_label.setText("Car")
@@ -59,12 +73,11 @@ class CarPlayPanel(QWidget):
 
         layout.addStretch()
 
-        # Content area when feed is off (minimal; feed runs in its own window)
-        self.carplay_view = QWebEngineView()
-        self.carplay_view.setUrl(QUrl("about:blank"))
-        self.carplay_view.setFixedHeight(0)
-        self.carplay_view.hide()
-        layout.addWidget(self.carplay_view)
+        # Content area when feed is off (minimal; feed runs in its own window).
+        # Created by _get_carplay_view() the first time there is something to show in it.
+        self.carplay_view = None
+        self._layout = layout
+        self._carplay_view_index = layout.count()
 
         # Status
         self.status_label = QLabel("Ready — Connect iPhone to Carlinkit")
@@ -115,6 +128,16 @@ class CarPlayPanel(QWidget):
 
         self.show_idle_message()
 
+    def _get_carplay_view(self):
+        """The content web view, created on first use: QtWebEngine is slow to import and start."""
+        if self.carplay_view is None:
+            from PyQt6.QtWebEngineWidgets import QWebEngineView
+            self.carplay_view = QWebEngineView()
+            self.carplay_view.setFixedHeight(0)
+            self.carplay_view.hide()
+            self._layout.insertWidget(self._carplay_view_index, self.carplay_view)
+        return self.carplay_view
+
     def show_idle_message(self):
         """Idle state: status text only (logo and buttons stay visible)."""
         self.status_label.setText("Ready — Connect iPhone to Carlinkit")
@@ -151,7 +174,7 @@ class CarPlayPanel(QWidget):
                     padding: 5px;
                 }
             """)
-            self.carplay_view.setHtml(f"""
+            self._get_carplay_view().setHtml(f"""
                 <html>
                 <body style="background:#000;color:#fff;font-family:sans-serif;padding:40px;text-align:center;">
                     <h1>No video feed</h1>
@@ -182,7 +205,8 @@ class CarPlayPanel(QWidget):
                 """)
                 return
 
-            self.carplay_view.hide()
+            if self.carplay_view is not None:
+                self.carplay_view.hide()
             self.status_label.setText("CarPlay feed on right half — Connect iPhone to Carlinkit")
             self.status_label.setStyleSheet("""
                 QLabel {
@@ -220,12 +244,7 @@ class CarPlayPanel(QWidget):
                 'videoconvert', '!',
                 'xvimagesink', 'sync=false'
             ]
-            self.feed_process = subprocess.Popen(
-                ' '.join(cmd),
-                shell=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
+            get_supervisor().start(self.feed_child, cmd, restart=True)
             return True
         except FileNotFoundError:
             return False
@@ -239,17 +258,23 @@ class CarPlayPanel(QWidget):
                 '-noborder',
                 device
             ]
-            self.feed_process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
+            get_supervisor().start(self.feed_child, cmd, restart=True)
             return True
         except FileNotFoundError:
             return False
 
     def _position_feed_window(self):
         """Position the video window on the right half (1280, 0, 1280x720)."""
+        index = get_index()
+        if index is not None:
+            info = index.by_role('capture_feed')
+            if info is not None and self.feed_slot is not None and self.feed_slot.embed(info.hex_id):
+                return
+            client = get_ewmh()
+            if info is not None and client is not None:
+                client.move_resize(info.hex_id, 1280, 0, 1280, 720)
+                client.flush()
+            return
         try:
             for name in ['CarPlay', 'ffplay', 'GStreamer', 'xvimagesink']:
                 try:
@@ -283,21 +308,9 @@ class CarPlayPanel(QWidget):
 
     def hide_carplay_feed(self):
         """Stop and hide the CarPlay feed."""
-        if self.feed_process and self.feed_process.poll() is None:
-            self.feed_process.terminate()
-            try:
-                self.feed_process.wait(timeout=3)
-            except subprocess.TimeoutExpired:
-                self.feed_process.kill()
-            self.feed_process = None
-
-        try:
-            subprocess.Popen(['pkill', '-f', 'ffplay'],
-                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            subprocess.Popen(['pkill', '-f', 'gst-launch-1.0'],
-                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        except Exception:
-            pass
+        if self.feed_slot is not None:
+            self.feed_slot.release(hide_window=True)
+        get_supervisor().stop(self.feed_child)
 
         self.status_label.setText("Ready — Connect iPhone to Carlinkit")
         self.status_label.setStyleSheet("""
@@ -9,6 +9,8 @@ import os
 import sys
 from pathlib import Path
 
+from process_supervisor import get_supervisor
+
 class CarPlayReceiver:
     """Manages CarPlay receiver connection and display"""
     
@@ -26,7 +28,7 @@ class CarPlayReceiver:
         self.height = height
         self.x_offset = x_offset
         self.y_offset = y_offset
-        self.process = None
+        self.child_name = 'carplay-receiver'
         self.receiver_path = None
         self.find_receiver()
     
@@ -64,6 +66,11 @@ class CarPlayReceiver:
                 "CarPlay receiver not found. See CARPLAY_SETUP.md for installation."
             )
         
+        # The receiver runs as root. Without passwordless sudo it could only fail (there is no one to type
+        # a password), and the supervisor would restart it over and over
+        if not self._can_sudo():
+            return False
+
         # Set up environment for window positioning
         env = os.environ.copy()
         env['CARPLAY_WIDTH'] = str(self.width)
@@ -75,52 +82,48 @@ class CarPlayReceiver:
         script_path = os.path.join(os.path.dirname(__file__), 'scripts', 'start_carplay_right.sh')
         if os.path.exists(script_path):
             try:
-                self.process = subprocess.Popen(
-                    ['/bin/bash', script_path],
-                    env=env,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
+                get_supervisor().start(self.child_name, ['/bin/bash', script_path], env=env, restart=True)
                 return True
             except Exception as e:
                 print(f"Error starting CarPlay receiver script: {e}")
         
         # Fallback: Start directly
         try:
-            self.process = subprocess.Popen(
-                ['sudo', 'python3', self.receiver_path],
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
+            get_supervisor().start(self.child_name, ['sudo', '-n', 'python3', self.receiver_path], env=env, restart=True)
             return True
         except Exception as e:
             print(f"Error starting CarPlay receiver: {e}")
             return False
     
+    def _can_sudo(self):
+        """Whether sudo runs without a password here; prints why not."""
+        try:
+            result = subprocess.run(['sudo', '-n', 'true'], capture_output=True, text=True, timeout=5)
+        except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+            print(f"Cannot start CarPlay receiver: sudo unavailable ({e})")
+            return False
+        if result.returncode != 0:
+            reason = result.stderr.strip() or f"sudo exited with {result.returncode}"
+            print(f"Cannot start CarPlay receiver: it needs passwordless sudo ({reason})")
+            return False
+        return True
+
     def stop(self):
-        """Stop CarPlay receiver"""
-        if self.process:
-            try:
-                self.process.terminate()
-                self.process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.process.kill()
-            except Exception as e:
-                print(f"Error stopping CarPlay receiver: {e}")
-            finally:
-                self.process = None
-        
-        # Also kill by process name as backup
+        """Stop CarPlay receiver (its whole process group, including the sudo'd receiver)"""
+        try:
+            get_supervisor().stop(self.child_name, timeout=5)
+        except Exception as e:
+            print(f"Error stopping CarPlay receiver: {e}")
+
+        # The receiver runs as root, so our signals may not reach it (and sudo may have put it in a
+        # session of its own): also kill it by name, as root
         try:
-            subprocess.Popen(['sudo', 'pkill', '-f', 'carplay.py'],
-                           stdout=subprocess.DEVNULL, 
-                           stderr=subprocess.DEVNULL)
-        except:
-            pass
+            subprocess.Popen(['sudo', '-n', 'pkill', '-f', 'carplay.py'],
+                             stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL)
+        except OSError as e:
+            print(f"Error stopping CarPlay receiver as root: {e}")
     
     def is_running(self):
         """Check if CarPlay receiver is running"""
-        if self.process:
-            return self.process.poll() is None
-        return False
+        return get_supervisor().is_running(self.child_name)
@@ -0,0 +1,108 @@
+"""
+Chromium (QtWebEngine) command-line switches for Sambar HUD, by hardware profile.
+The profile is picked from the CPU architecture, the board model (/proc/cpuinfo, device tree) and
+the memory size, or set with performance.chromium_profile (SAMBAR_CHROMIUM_PROFILE overrides both,
+for scripts/bench_chromium_flags.py). performance.chromium_flags adds or replaces switches;
+performance.chromium_drop_flags removes them. Imported before the boot splash: keep it light.
+"""
+
+import os
+
+# Switches every profile gets: no network chatter or first-run work from the HUD's browser
+_COMMON = (
+    "--disable-background-networking",
+    "--disable-sync",
+    "--no-first-run",
+)
+
+PROFILES = {
+    # Pi 4: few cores and a slow GPU; leave the CPU to LIVI and its audio
+    "pi4": _COMMON + (
+        "--renderer-process-limit=1",
+        "--disable-smooth-scrolling",
+        "--disable-threaded-scrolling",
+    ),
+    # Pi 5: enough GPU to rasterize there, still one renderer
+    "pi5": _COMMON + (
+        "--renderer-process-limit=1",
+        "--disable-smooth-scrolling",
+        "--enable-gpu-rasterization",
+    ),
+    # x86 boxes and the Steam Deck: Chromium's defaults plus GPU rasterization
+    "x86": _COMMON + (
+        "--enable-gpu-rasterization",
+    ),
+    # Little memory (or an unknown ARM board): smallest renderer, V8 without its optimizing tiers
+    "low-power": _COMMON + (
+        "--renderer-process-limit=1",
+        "--disable-smooth-scrolling",
+        "--disable-threaded-scrolling",
+        "--num-raster-threads=1",
+        "--js-flags=--lite-mode",
+    ),
+}
+
+# Below this much RAM the low-power profile is used whatever the board
+_LOW_MEMORY_BYTES = 2 * 1024 ** 3
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path, "r", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def _board_model() -> str:
+    model = _read("/proc/device-tree/model").rstrip("\0")
+    if model:
+        return model
+    for line in _read("/proc/cpuinfo").splitlines():
+        if line.startswith("Model"):
+            return line.split(":", 1)[1].strip()
+    return ""
+
+
+def _memory_bytes() -> int | None:
+    for line in _read("/proc/meminfo").splitlines():
+        if line.startswith("MemTotal:"):
+            return int(line.split()[1]) * 1024
+    return None
+
+
+def detect_profile() -> str:
+    """Profile name for this machine."""
+    memory = _memory_bytes()
+    if memory is not None and memory < _LOW_MEMORY_BYTES:
+        return "low-power"
+    machine = os.uname().machine
+    if machine in ("x86_64", "i686", "i386", "AMD64"):
+        return "x86"
+    model = _board_model()
+    if "Raspberry Pi 5" in model:
+        return "pi5"
+    if "Raspberry Pi 4" in model or "Raspberry Pi 400" in model:
+        return "pi4"
+    return "low-power"
+
+
+def _switch_name(flag: str) -> str:
+    return flag.split("=", 1)[0]
+
+
+def chromium_flags(config) -> tuple[str, list]:
+    """(profile name, switches) for config (a config.Config)."""
+    name = os.environ.get("SAMBAR_CHROMIUM_PROFILE") or config.get("performance.chromium_profile", "auto")
+    if name == "auto":
+        name = detect_profile()
+    elif name not in PROFILES:
+        detected = detect_profile()
+        print(f"Unknown Chromium profile {name!r}; using {detected}")
+        name = detected
+    flags = {_switch_name(flag): flag for flag in PROFILES[name]}
+    for flag in config.get("performance.chromium_flags", []):
+        flags[_switch_name(flag)] = flag
+    for flag in config.get("performance.chromium_drop_flags", []):
+        flags.pop(_switch_name(flag), None)
+    return name, list(flags.values())
@@ -0,0 +1,116 @@
+"""
+Wall clock for Sambar HUD.
+The HUD and the sleep screen only show hours and minutes, so instead of each polling the time
+every few seconds, one ClockService wakes up exactly on each minute boundary and pushes the
+formatted time and date to everyone subscribed. The time zone (clock.timezone) is resolved once.
+"""
+
+import time
+from datetime import datetime, tzinfo
+
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+DEFAULT_TIMEZONE = "America/New_York"
+
+# Fire this long after the boundary, so a timer that is a millisecond early still reads the new minute
+_LATE_MS = 5
+
+
+def _load_timezone(name: str) -> tzinfo | None:
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception:
+        pass
+    try:
+        import pytz
+        return pytz.timezone(name)
+    except Exception:
+        print(f"Unknown time zone {name!r}; using local time")
+        return None
+
+
+def _minute(now: datetime) -> datetime:
+    return now.replace(second=0, microsecond=0)
+
+
+class ClockReading:
+    """The time as displayed: time_text "2:30 PM" (12-hour, no leading zero), date_text "Monday, March 04"."""
+
+    __slots__ = ("now", "time_text", "date_text")
+
+    def __init__(self, now: datetime):
+        self.now = now
+        self.time_text = f"{int(now.strftime('%I'))}:{now.strftime('%M %p')}"
+        self.date_text = now.strftime("%A, %B %d")
+
+    def __repr__(self):
+        return f"ClockReading({self.time_text!r}, {self.date_text!r})"
+
+
+class ClockService(QObject):
+    """Emits ticked(ClockReading) at the start of every minute, on the GUI thread."""
+
+    ticked = pyqtSignal(object)
+
+    def __init__(self, timezone: str = DEFAULT_TIMEZONE, parent=None):
+        super().__init__(parent)
+        self._tz = _load_timezone(timezone)
+        self._current = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        # A coarse timer may fire up to 5% (3 s) off, which would show the old minute for seconds
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+    def current(self) -> ClockReading:
+        now = self._now()
+        # The whole minute, not just its number: the same minute of another hour (suspend, a missed tick)
+        if self._current is None or _minute(self._current.now) != _minute(now):
+            self._current = ClockReading(now)
+        return self._current
+
+    def subscribe(self, callback) -> None:
+        """callback(ClockReading) now and then on every minute."""
+        self.ticked.connect(callback)
+        callback(self.current())
+        if not self._timer.isActive():
+            self._schedule()
+
+    def unsubscribe(self, callback) -> None:
+        try:
+            self.ticked.disconnect(callback)
+        except TypeError:
+            pass
+        if self.receivers(self.ticked) == 0:
+            self._timer.stop()
+
+    def set_timezone(self, timezone: str) -> None:
+        self._tz = _load_timezone(timezone)
+        self._current = ClockReading(self._now())
+        self.ticked.emit(self._current)
+
+    def _now(self) -> datetime:
+        return datetime.now(self._tz)
+
+    def _tick(self) -> None:
+        self._current = ClockReading(self._now())
+        self.ticked.emit(self._current)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        # Re-aligned every minute, so a wall-clock step (NTP sync after boot) is caught up a minute later
+        ms_into_minute = int(time.time() * 1000) % 60000
+        self._timer.start(60000 - ms_into_minute + _LATE_MS)
+
+
+_clock: ClockService | None = None
+
+
+def get_clock() -> ClockService:
+    """The app-wide clock (GUI thread only; created on first use, clock.timezone from the config)."""
+    global _clock
+    if _clock is None:
+        from config import get_config
+        _clock = ClockService(get_config().get("clock.timezone", DEFAULT_TIMEZONE))
+    return _clock
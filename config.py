@@ -1,73 +1,216 @@
 """
 Configuration management for Sambar HUD
+config.yaml is deep-merged over the defaults below and checked against their types. The merged
+result is cached (pickle, in ~/.cache/sambar_hud) keyed by the YAML file's mtime and size, so a boot
+with an unchanged config.yaml neither imports nor runs PyYAML. Dotted keys are resolved once into
+a flat dict; use get_config() for the process-wide instance. reload() re-reads the file and
+reports what changed (config_watch calls it when config.yaml is edited).
 """
 
 import os
-import yaml
+import pickle
+import threading
+import zlib
 from pathlib import Path
 
+CACHE_DIR = os.path.expanduser("~/.cache/sambar_hud")
+
+# Bump when the cache layout changes
+_CACHE_VERSION = 1
+
+
+def _default_config():
+    return {
+        'screen_width': 2560,
+        'screen_height': 720,
+        'fit_to_screen': False,
+        'carplay': {
+            'enabled': True,
+            'port': 8080,
+            'auto_connect': True,
+            'livi_auto_launch': True,  # Auto-open LIVI on startup and position on right half (Pi)
+            'livi_use_xephyr': True,   # Run LIVI in a Xephyr frame when its window can't be embedded directly
+            'livi_appimage_path': None,  # None = look in ~/LIVI/
+        },
+        'entertainment': {
+            'steam_link_enabled': True,
+            'youtube_enabled': True,
+            'netflix_enabled': True,
+            'airplay_enabled': True,
+            'default_mode': 'steam_link'  # steam_link, youtube, netflix, airplay
+        },
+        'clock': {
+            'timezone': 'America/New_York',  # HUD and sleep screen clock (IANA name)
+        },
+        'kiosk_mode': {
+            'enabled': True,
+            'auto_start': True
+        },
+        'boot': {
+            'splash_min_ms': 1500,  # splash shows at least this long (boot sound, logo)
+            'splash_max_ms': 8000,  # and at most this long, even if LIVI / the HUD aren't ready yet
+            'trace': False,  # write a Chrome trace of each boot (also SAMBAR_TRACE=1)
+            'trace_keep': 20,  # newest boot traces kept in ~/.cache/sambar_hud/traces
+            'import_budget_ms': 250,  # imports before the splash paints (scripts/check_import_budget.py)
+        },
+        'performance': {
+            'low_power_mode': False,  # native HUD (native_hud) instead of QtWebEngine
+            'embed_windows': True,  # reparent LIVI / Steam Link windows into ours (window_embed), X11 only
+            'park_apps': True,  # Home / mode switch SIGSTOPs embedded apps instead of stopping them (parking)
+            'park_min_available_mb': 200,  # parked apps are stopped when available memory drops below this
+            'gpu_mem': 128,  # MB for Raspberry Pi GPU memory split
+            'chromium_profile': 'auto',  # pi4, pi5, x86, low-power or auto (chromium_flags.py)
+            'chromium_flags': [],  # extra switches; one with the same name replaces the profile's
+            'chromium_drop_flags': [],  # switches to remove from the profile
+        }
+    }
+
+
+def _type_name(value):
+    return type(value).__name__
+
+
+def _compatible(default, value):
+    """Whether a user value may replace a default (None on either side means anything goes)."""
+    if default is None or value is None:
+        return True
+    if isinstance(default, bool):
+        return isinstance(value, bool)
+    if isinstance(default, (int, float)):
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, type(default))
+
+
+def _merge(defaults, user, prefix=''):
+    """Deep-merge user over defaults (in place). Values of the wrong type are reported and skipped;
+    keys the defaults don't know are kept as they are."""
+    for key, value in user.items():
+        name = f"{prefix}{key}"
+        if key not in defaults:
+            defaults[key] = value
+        elif isinstance(defaults[key], dict):
+            if isinstance(value, dict):
+                _merge(defaults[key], value, name + '.')
+            elif value is not None:
+                print(f"Warning: config {name} should be a mapping, got {_type_name(value)}; using defaults")
+        elif _compatible(defaults[key], value):
+            defaults[key] = value
+        else:
+            print(f"Warning: config {name} should be {_type_name(defaults[key])}, got {value!r}; "
+                  f"using default {defaults[key]!r}")
+    return defaults
+
+
+def _flatten(tree, prefix='', flat=None):
+    """{"a": {"b": 1}} -> {"a": {"b": 1}, "a.b": 1}"""
+    if flat is None:
+        flat = {}
+    for key, value in tree.items():
+        name = f"{prefix}{key}"
+        flat[name] = value
+        if isinstance(value, dict):
+            _flatten(value, name + '.', flat)
+    return flat
+
+
+class ConfigChange:
+    """One setting that changed on reload (old or new is None when the key was added or removed)."""
+
+    __slots__ = ("key", "old", "new")
+
+    def __init__(self, key, old, new):
+        self.key = key
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        return f"ConfigChange({self.key!r}, {self.old!r} -> {self.new!r})"
+
+
 class Config:
     """Configuration manager"""
-    
+
     def __init__(self, config_file=None):
         if config_file is None:
             config_file = Path(__file__).parent / "config.yaml"
-        
+
         self.config_file = Path(config_file)
         self.config = self.load_config()
-        
-    def load_config(self):
-        """Load configuration from YAML file or use defaults"""
-        default_config = {
-            'screen_width': 2560,
-            'screen_height': 720,
-            'carplay': {
-                'enabled': True,
-                'port': 8080,
-                'auto_connect': True,
-                'livi_auto_launch': True,  # Auto-open LIVI on startup and position on right half (Pi)
-                'livi_use_xephyr': True,   # Run LIVI in a Xephyr frame (right-half size); no floating window
-            },
-            'entertainment': {
-                'steam_link_enabled': True,
-                'youtube_enabled': True,
-                'netflix_enabled': True,
-                'airplay_enabled': True,
-                'default_mode': 'steam_link'  # steam_link, youtube, netflix, airplay
-            },
-            'kiosk_mode': {
-                'enabled': True,
-                'auto_start': True
-            },
-            'performance': {
-                'low_power_mode': False,
-                'gpu_mem': 128  # MB for Raspberry Pi GPU memory split
-            }
-        }
-        
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r') as f:
-                    user_config = yaml.safe_load(f) or {}
-                # Merge with defaults
-                default_config.update(user_config)
-            except Exception as e:
-                print(f"Warning: Could not load config file: {e}")
-                print("Using default configuration")
-        
-        return default_config
-    
+        self._flat = _flatten(self.config)
+
+    def load_config(self, fallback=None):
+        """Load configuration from the cache, or from the YAML file merged over the defaults.
+        If the file can't be parsed, returns fallback (the defaults when None)."""
+        default_config = _default_config()
+        try:
+            st = self.config_file.stat()
+        except OSError:
+            return default_config if fallback is None else fallback
+        # The defaults are part of the key, so changing them in code invalidates the cache too
+        key = (_CACHE_VERSION, str(self.config_file.resolve()), st.st_mtime_ns, st.st_size,
+               zlib.crc32(repr(default_config).encode()))
+        cached = self._read_cache(key)
+        if cached is not None:
+            return cached
+
+        try:
+            import yaml
+            with open(self.config_file, 'r') as f:
+                user_config = yaml.safe_load(f) or {}
+            if not isinstance(user_config, dict):
+                raise ValueError(f"expected a mapping at the top level, got {_type_name(user_config)}")
+            config = _merge(default_config, user_config)
+        except Exception as e:
+            print(f"Warning: Could not load config file: {e}")
+            if fallback is not None:
+                print("Keeping the current configuration")
+                return fallback
+            print("Using default configuration")
+            return _default_config()
+
+        self._write_cache(key, config)
+        return config
+
+    def reload(self):
+        """Re-read the config file. Returns the changed settings (leaves only, sorted by key);
+        a file that doesn't parse (e.g. saved half-way through an edit) changes nothing."""
+        old = self._flat
+        self.config = self.load_config(fallback=self.config)
+        self._flat = new = _flatten(self.config)
+        return [
+            ConfigChange(key, old.get(key), new.get(key))
+            for key in sorted(old.keys() | new.keys())
+            if not isinstance(old.get(key), dict) and not isinstance(new.get(key), dict) and old.get(key) != new.get(key)
+        ]
+
+    def _cache_path(self):
+        name = f"config-{zlib.crc32(str(self.config_file.resolve()).encode()):08x}.pickle"
+        return os.path.join(CACHE_DIR, name)
+
+    def _read_cache(self, key):
+        try:
+            with open(self._cache_path(), 'rb') as f:
+                cached_key, config = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError):
+            return None
+        return config if cached_key == key else None
+
+    def _write_cache(self, key, config):
+        path = self._cache_path()
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                pickle.dump((key, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"Warning: Could not cache config: {e}")
+
     def get(self, key, default=None):
         """Get configuration value using dot notation"""
-        keys = key.split('.')
-        value = self.config
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k, default)
-            else:
-                return default
+        value = self._flat.get(key)
         return value if value is not None else default
-    
+
     def set(self, key, value):
         """Set configuration value using dot notation"""
         keys = key.split('.')
@@ -77,11 +220,26 @@ class Config:
                 config[k] = {}
             config = config[k]
         config[keys[-1]] = value
-    
+        self._flat = _flatten(self.config)
+
     def save(self):
         """Save configuration to file"""
         try:
+            import yaml
             with open(self.config_file, 'w') as f:
                 yaml.dump(self.config, f, default_flow_style=False)
         except Exception as e:
             print(f"Error saving config: {e}")
+
+
+_config = None
+_config_lock = threading.Lock()
+
+
+def get_config():
+    """The process-wide configuration (config.yaml next to this file), loaded on first use."""
+    global _config
+    with _config_lock:
+        if _config is None:
+            _config = Config()
+        return _config
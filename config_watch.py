@@ -0,0 +1,142 @@
+"""
+config.yaml hot reload for Sambar HUD.
+ConfigWatcher watches the config file's directory with inotify (through ctypes, no extra
+package), so editors that save by writing a new file and renaming it over the old one are
+seen too. Bursts of events are debounced into one Config.reload(), and subscribers get the list
+of ConfigChange objects, on the watcher's thread. Where inotify is unavailable the file's mtime
+and size are polled instead.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+
+# inotify(7) event masks
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len (name follows, NUL padded)
+
+# Fallback poll interval (s) without inotify
+_POLL_INTERVAL = 2.0
+
+
+def _inotify_fd(directory: str) -> int | None:
+    """inotify fd watching directory for files written or moved in, or None if unsupported."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+    if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _event_names(data: bytes):
+    offset = 0
+    while offset + _EVENT_HEADER.size <= len(data):
+        _wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+        offset += _EVENT_HEADER.size
+        yield data[offset:offset + length].rstrip(b"\0")
+        offset += length
+
+
+class ConfigWatcher:
+    """Reloads config (a config.Config) when its file changes and passes the changes to subscribers."""
+
+    def __init__(self, config, debounce: float = 0.3):
+        self._config = config
+        self._path = os.path.abspath(config.config_file)
+        self._name = os.fsencode(os.path.basename(self._path))
+        self._debounce = debounce
+        self._lock = threading.Lock()
+        self._subscribers = []
+        self._timer = None
+        self._stopped = False
+        self._wake_r, self._wake_w = os.pipe()
+        self._fd = _inotify_fd(os.path.dirname(self._path))
+        target = self._run_inotify if self._fd is not None else self._run_poll
+        self._thread = threading.Thread(target=target, name="config-watch", daemon=True)
+        self._thread.start()
+
+    def subscribe(self, callback) -> None:
+        """callback(changes: list[ConfigChange]), called on the watcher thread after each reload that changed something."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped = True
+            if self._timer is not None:
+                self._timer.cancel()
+        os.write(self._wake_w, b"x")
+
+    def _run_inotify(self) -> None:
+        try:
+            while True:
+                ready, _, _ = select.select([self._fd, self._wake_r], [], [])
+                if self._wake_r in ready:
+                    return
+                try:
+                    data = os.read(self._fd, 4096)
+                except BlockingIOError:
+                    continue
+                if any(name == self._name for name in _event_names(data)):
+                    self._schedule()
+        finally:
+            os.close(self._fd)
+
+    def _run_poll(self) -> None:
+        last = self._stat()
+        while True:
+            ready, _, _ = select.select([self._wake_r], [], [], _POLL_INTERVAL)
+            if ready:
+                return
+            current = self._stat()
+            if current != last:
+                last = current
+                self._schedule()
+
+    def _stat(self):
+        try:
+            st = os.stat(self._path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def _schedule(self) -> None:
+        """(Re)start the debounce timer: an editor's save is several events in a row."""
+        with self._lock:
+            if self._stopped:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self._debounce, self._reload)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _reload(self) -> None:
+        with self._lock:
+            self._timer = None
+            if self._stopped:
+                return
+            subscribers = list(self._subscribers)
+        changes = self._config.reload()
+        if not changes:
+            return
+        for callback in subscribers:
+            try:
+                callback(changes)
+            except Exception as e:
+                print(f"Config change handler failed: {e!r}")
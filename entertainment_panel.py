@@ -7,12 +7,28 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QStackedWidget, QButtonGroup
 )
-from PyQt6.QtCore import Qt, QUrl, QTimer, QProcess, QPoint
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtGui import QFont, QPixmap
+from PyQt6.QtCore import Qt, QUrl, QTimer, QPoint
+from PyQt6.QtGui import QFont
 import subprocess
 import os
 
+import assets
+from process_supervisor import get_supervisor
+from clock_service import get_clock
+from config import get_config
+from parking import get_parking
+
+try:
+    from x11_windows import get_index
+    from ewmh import get_ewmh
+    from window_embed import EmbedSlot
+except ImportError:
+    def get_index(display=None):
+        return None
+    def get_ewmh(display=None):
+        return None
+    EmbedSlot = None
+
 class EntertainmentPanel(QWidget):
     """Entertainment interface panel"""
 
@@ -21,12 +37,17 @@ class EntertainmentPanel(QWidget):
         self.width = width
         self.height = height
         self.current_mode = None
-        self.processes = {}
+        self.processes = {}  # mode -> process supervisor child name
+        self.parked = {}  # mode -> window id of its parked app (see _park_current_mode)
         self.overlay_visible = True
         self.start_in_sleep = start_in_sleep
         self.sleep_mode_active = False
         self.create_overlay()  # before init_ui so switch_mode() can call hide_overlay()
         self.init_ui()
+        # External apps' windows are embedded here (above the overlay bar) where X11 allows it
+        self.app_slot = EmbedSlot(self) if EmbedSlot is not None else None
+        if self.app_slot is not None:
+            self.app_slot.setGeometry(0, 0, self.width, self.height - 60)
         self.create_sleep_mode()
         if self.start_in_sleep:
             self.enter_sleep_mode()
@@ -177,11 +198,8 @@ class EntertainmentPanel(QWidget):
         van_label = QLabel()
         van_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         van_label.setStyleSheet("background: transparent;")
-        img_dir = os.path.join(os.path.dirname(__file__), 'img')
-        van_path = os.path.join(img_dir, 'van-3d.png')
-        if os.path.exists(van_path):
-            pix = QPixmap(van_path)
-            pix = pix.scaled(500, 350, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        pix = assets.scaled_pixmap('van-3d.png', *assets.SLEEP_VAN_BOX)
+        if pix is not None:
             van_label.setPixmap(pix)
         else:
             van_label.setText("(van image)")
@@ -190,37 +208,19 @@ class EntertainmentPanel(QWidget):
         sleep_layout.addStretch()
 
         self.sleep_container.hide()
-        self.sleep_clock_timer = QTimer(self)
-        self.sleep_clock_timer.timeout.connect(self._update_sleep_clock)
 
-    def _update_sleep_clock(self):
-        """Update sleep clock to Eastern time (EST/EDT), 12-hour format."""
-        from datetime import datetime
-        try:
-            from zoneinfo import ZoneInfo
-            eastern = ZoneInfo("America/New_York")
-        except ImportError:
-            try:
-                import pytz
-                eastern = pytz.timezone("America/New_York")
-            except ImportError:
-                eastern = None
-        if eastern:
-            now = datetime.now(eastern)
-        else:
-            now = datetime.now()
-        # 12-hour, no seconds: e.g. 2:30 PM (no leading zero on hour)
-        hour_12 = int(now.strftime("%I"))
-        time_str = f"{hour_12}:{now.strftime('%M %p')}"
-        self.sleep_clock.setText(time_str)
-        self.sleep_date.setText(now.strftime("%A, %B %d") + "  ·  Eastern")
+    def _update_sleep_clock(self, reading):
+        """Update sleep clock (clock_service: on the minute, clock.timezone, 12-hour format)."""
+        self.sleep_clock.setText(reading.time_text)
+        zone = reading.now.strftime('%Z')  # empty for local time without a tzinfo
+        self.sleep_date.setText(f"{reading.date_text}  ·  {zone}" if zone else reading.date_text)
 
     def enter_sleep_mode(self):
         """Show sleep screen, hide entertainment content (with smooth transition)."""
-        self.sleep_mode_active = True
+        was_active, self.sleep_mode_active = self.sleep_mode_active, True
         self.sleep_container.raise_()
-        self._update_sleep_clock()
-        self.sleep_clock_timer.start(60000)
+        if not was_active:
+            get_clock().subscribe(self._update_sleep_clock)
         self.stop_current_mode()
         if hasattr(self, 'sleep_btn'):
             self.sleep_btn.hide()
@@ -244,7 +244,7 @@ class EntertainmentPanel(QWidget):
     def leave_sleep_mode(self):
         """Hide sleep screen, show entertainment content (with smooth transition)."""
         self.sleep_mode_active = False
-        self.sleep_clock_timer.stop()
+        get_clock().unsubscribe(self._update_sleep_clock)
         try:
             from PyQt6.QtCore import QPropertyAnimation
             from PyQt6.QtGui import QGraphicsOpacityEffect
@@ -382,7 +382,7 @@ class EntertainmentPanel(QWidget):
     
     def exit_current_app(self):
         """Exit the currently running app"""
-        self.stop_current_mode()
+        self.stop_current_mode(park=False)
         # Switch back to menu/selection screen
         self.back_to_menu()
     
@@ -446,12 +446,9 @@ class EntertainmentPanel(QWidget):
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(0, 0, 0, 0)
         
-        # YouTube web view
-        self.youtube_view = QWebEngineView()
-        # Use YouTube TV interface for better car experience
-        self.youtube_view.setUrl(QUrl("https://www.youtube.com/tv"))
-        
-        layout.addWidget(self.youtube_view)
+        # YouTube web view, created when YouTube is first selected (see _ensure_web_view)
+        self.youtube_view = None
+        self._youtube_layout = layout
         
         self.stacked_widget.addWidget(widget)
         
@@ -461,11 +458,9 @@ class EntertainmentPanel(QWidget):
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(0, 0, 0, 0)
         
-        # Netflix web view
-        self.netflix_view = QWebEngineView()
-        self.netflix_view.setUrl(QUrl("https://www.netflix.com"))
-        
-        layout.addWidget(self.netflix_view)
+        # Netflix web view, created when Netflix is first selected (see _ensure_web_view)
+        self.netflix_view = None
+        self._netflix_layout = layout
         
         self.stacked_widget.addWidget(widget)
         
@@ -508,6 +503,16 @@ class EntertainmentPanel(QWidget):
         # Start AirPlay receiver service
         self.start_airplay_receiver()
         
+    def _ensure_web_view(self, attr, layout, url):
+        """Create a streaming web view on first use: QtWebEngine is slow to import and start,
+        and the page would otherwise load in the background while nobody is watching."""
+        if getattr(self, attr) is None:
+            from PyQt6.QtWebEngineWidgets import QWebEngineView
+            view = QWebEngineView()
+            view.setUrl(QUrl(url))
+            layout.addWidget(view)
+            setattr(self, attr, view)
+
     def switch_mode(self, mode):
         """Switch between different entertainment modes"""
         if self.current_mode == mode:
@@ -522,19 +527,24 @@ class EntertainmentPanel(QWidget):
         if mode == 'steam_link':
             self.stacked_widget.setCurrentIndex(0)
             self.steam_btn.setChecked(True)
-            self.start_steam_link()
+            if not self._resume_mode(mode):
+                self.start_steam_link()
         elif mode == 'youtube':
+            # Use YouTube TV interface for better car experience
+            self._ensure_web_view('youtube_view', self._youtube_layout, "https://www.youtube.com/tv")
             self.stacked_widget.setCurrentIndex(1)
             self.youtube_btn.setChecked(True)
             self.show_overlay()
         elif mode == 'netflix':
+            self._ensure_web_view('netflix_view', self._netflix_layout, "https://www.netflix.com")
             self.stacked_widget.setCurrentIndex(2)
             self.netflix_btn.setChecked(True)
             self.show_overlay()
         elif mode == 'airplay':
             self.stacked_widget.setCurrentIndex(3)
             self.airplay_btn.setChecked(True)
-            self.start_airplay_receiver()
+            if not self._resume_mode(mode):
+                self.start_airplay_receiver()
             self.show_overlay()
             
     def start_steam_link(self):
@@ -562,20 +572,11 @@ class EntertainmentPanel(QWidget):
                 # Try using helper script first (if available)
                 script_path = os.path.join(os.path.dirname(__file__), 'scripts', 'start_steam_link_left.sh')
                 if os.path.exists(script_path):
-                    process = QProcess()
-                    process.start('/bin/bash', [script_path])
-                    self.processes['steam_link'] = process
+                    get_supervisor().start('steam_link', ['/bin/bash', script_path], restart=True)
                 else:
-                    # Launch Steam Link directly
-                    process = QProcess()
-                    
-                    # Set environment for window positioning
-                    env = os.environ.copy()
-                    process.setProcessEnvironment(env)
-                    
-                    # Start Steam Link (without fullscreen flag to allow positioning)
-                    process.start(steam_cmd)
-                    self.processes['steam_link'] = process
+                    # Start Steam Link directly (without fullscreen flag to allow positioning)
+                    get_supervisor().start('steam_link', [steam_cmd], restart=True)
+                self.processes['steam_link'] = 'steam_link'
                 
                 # Show overlay for exit control
                 self.show_overlay()
@@ -594,6 +595,18 @@ class EntertainmentPanel(QWidget):
     
     def position_steam_link_window(self):
         """Position Steam Link window on left side of screen (1280x720)"""
+        index = get_index()
+        if index is not None:
+            info = index.by_role('steamlink')
+            if info is not None and self._embed_app_window(info):
+                return
+            client = get_ewmh()
+            if info is not None and client is not None:
+                client.move_resize(info.hex_id, 0, 0, 1280, 720)
+                client.add_states(info.hex_id, ('fullscreen',))
+                client.flush()
+                print(f"Positioned Steam Link window: {info.title}")
+            return
         try:
             import subprocess
             
@@ -658,10 +671,9 @@ class EntertainmentPanel(QWidget):
             
             if airplay_cmd:
                 # Start AirPlay receiver
-                process = QProcess()
                 # Run with device name and window positioning
-                process.start(airplay_cmd, ['-n', 'Sambar HUD AirPlay', '-a', 'alsa'])
-                self.processes['airplay'] = process
+                get_supervisor().start('airplay', [airplay_cmd, '-n', 'Sambar HUD AirPlay', '-a', 'alsa'], restart=True)
+                self.processes['airplay'] = 'airplay'
                 
                 # Position window on left side after delay
                 QTimer.singleShot(3000, self.position_airplay_window)
@@ -672,6 +684,16 @@ class EntertainmentPanel(QWidget):
     
     def position_airplay_window(self):
         """Position AirPlay window on left side of screen (1280x720)"""
+        index = get_index()
+        if index is not None:
+            info = index.by_role('airplay')
+            if info is not None and self._embed_app_window(info):
+                return
+            client = get_ewmh()
+            if info is not None and client is not None:
+                client.move_resize(info.hex_id, 0, 0, 1280, 720)
+                client.flush()
+            return
         try:
             import subprocess
             # Try wmctrl first
@@ -692,29 +714,64 @@ class EntertainmentPanel(QWidget):
             except:
                 print("Window positioning tools (wmctrl/xdotool) not available. Install for automatic positioning.")
             
-    def stop_current_mode(self):
-        """Stop processes for current mode"""
-        if self.current_mode in self.processes:
-            process = self.processes[self.current_mode]
-            if process and process.state() == QProcess.ProcessState.Running:
-                process.terminate()
-                process.waitForFinished(3000)
-                if process.state() == QProcess.ProcessState.Running:
-                    process.kill()
-            del self.processes[self.current_mode]
-        
-        # Also kill by process name as backup
-        if self.current_mode == 'steam_link':
-            try:
-                subprocess.Popen(['pkill', '-f', 'steamlink'],
-                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            except:
-                pass
+    def _embed_app_window(self, info):
+        """Embed an app's window in the panel instead of placing it over the screen; False where that isn't possible."""
+        if self.app_slot is None or not self.app_slot.embed(info.hex_id):
+            return False
+        self.overlay.raise_()
+        return True
+
+    def stop_current_mode(self, park=True):
+        """Stop processes for current mode, or park them (park=True) when their window is embedded here"""
+        if not (park and self._park_current_mode()):
+            if self.app_slot is not None:
+                self.app_slot.release(hide_window=True)
+            if self.current_mode in self.processes:
+                # Stops the whole process group, so helpers started by the launcher script go too
+                name = self.processes.pop(self.current_mode)
+                get_parking().forget(name)
+                get_supervisor().stop(name)
         
         # Hide overlay when no app is running
         self.hide_overlay()
-            
+
+    def _park_current_mode(self):
+        """Hide the current app's window and SIGSTOP it, so switching back to the mode is instant.
+        False if there is nothing to park (no embedded window, or performance.park_apps is off)."""
+        mode = self.current_mode
+        name = self.processes.get(mode)
+        if (name is None or self.app_slot is None or not self.app_slot.is_embedded()
+                or not get_config().get('performance.park_apps', True)):
+            return False
+        wid = self.app_slot.window_id
+        if not get_parking().park(name, on_evict=lambda: self._evict_parked(mode)):
+            return False
+        self.app_slot.release(hide_window=True)  # the slot is free for the next app; the window stays unmapped
+        self.parked[mode] = wid
+        return True
+
+    def _resume_mode(self, mode):
+        """Continue a parked app and embed its window again. False if the mode's app isn't parked."""
+        wid = self.parked.pop(mode, None)
+        if wid is None or not get_parking().resume(self.processes.get(mode)):
+            return False
+        if self.app_slot is not None:
+            self.app_slot.embed(wid)
+        self.overlay.raise_()
+        self.show_overlay()
+        return True
+
+    def _evict_parked(self, mode):
+        """Memory is low: stop a parked app for good."""
+        self.parked.pop(mode, None)
+        name = self.processes.pop(mode, None)
+        if name is not None:
+            get_parking().forget(name)
+            get_supervisor().stop(name)
+
     def closeEvent(self, event):
         """Clean up on close"""
-        self.stop_current_mode()
+        self.stop_current_mode(park=False)
+        for mode in list(self.parked):
+            self._evict_parked(mode)
         super().closeEvent(event)
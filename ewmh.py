@@ -0,0 +1,206 @@
+"""
+In-process EWMH client for Sambar HUD.
+Sends the window-manager requests we used to fork wmctrl/xprop for (_NET_MOVERESIZE_WINDOW,
+_NET_WM_STATE, _NET_ACTIVE_WINDOW, _NET_CLOSE_WINDOW, _MOTIF_WM_HINTS, _NET_WM_WINDOW_TYPE)
+over one persistent X connection per display. Requests are queued and go out together on
+flush(), so a layout pass costs one write to the X server instead of one process per request.
+On displays without a window manager (bare Xephyr frames) geometry and stacking are applied
+directly with ConfigureWindow.
+"""
+
+import os
+import threading
+
+try:
+    from Xlib import X, Xatom
+    from Xlib import display as xdisplay
+    from Xlib.protocol import event as xevent
+    _XLIB_AVAILABLE = True
+except ImportError:
+    _XLIB_AVAILABLE = False
+
+
+# _NET_WM_STATE client message actions
+_STATE_REMOVE = 0
+_STATE_ADD = 1
+
+# Source indication 2 = pager/direct user action, so WMs don't apply focus-stealing prevention
+_SOURCE_PAGER = 2
+
+# _NET_MOVERESIZE_WINDOW flags: x, y, width, height present (bits 8-11), source in bits 12-15
+_MOVERESIZE_FLAGS = (1 << 8) | (1 << 9) | (1 << 10) | (1 << 11) | (_SOURCE_PAGER << 12)
+
+# _MOTIF_WM_HINTS: flags=MWM_HINTS_DECORATIONS, functions, decorations=0, input_mode, status
+_MOTIF_NO_DECORATIONS = [2, 0, 0, 0, 0]
+
+_ATOMS = (
+    "_NET_SUPPORTING_WM_CHECK",
+    "_NET_MOVERESIZE_WINDOW",
+    "_NET_WM_STATE",
+    "_NET_ACTIVE_WINDOW",
+    "_NET_CLOSE_WINDOW",
+    "_NET_WM_WINDOW_TYPE",
+    "_NET_WM_WINDOW_TYPE_SPLASH",
+    "_MOTIF_WM_HINTS",
+)
+
+
+def _window_id(wid) -> int:
+    """Accept wmctrl-style hex strings ("0x03a00007"), decimal strings (xdotool) or ints."""
+    if isinstance(wid, int):
+        return wid
+    return int(wid, 0)
+
+
+class EwmhClient:
+    """Queued EWMH requests for one X display. Safe to use from several threads."""
+
+    def __init__(self, display_name: str | None = None):
+        if not _XLIB_AVAILABLE:
+            raise RuntimeError("python-xlib is not installed")
+        self.display_name = display_name or os.environ.get("DISPLAY", "")
+        self._dpy = xdisplay.Display(self.display_name or None)
+        self._dpy.set_error_handler(self._on_x_error)
+        self._root = self._dpy.screen().root
+        self._atoms = {name: self._dpy.intern_atom(name) for name in _ATOMS}
+        self._state_atoms: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._pending = []
+        self.has_wm = self._root.get_full_property(
+            self._atoms["_NET_SUPPORTING_WM_CHECK"], Xatom.WINDOW
+        ) is not None
+
+    def _on_x_error(self, err, *args):
+        """Requests on windows that vanished meanwhile fail with BadWindow; nothing to do about it."""
+
+    # ---- queued requests ----
+
+    def move_resize(self, wid, x: int, y: int, width: int, height: int) -> None:
+        wid = _window_id(wid)
+        if self.has_wm:
+            self._queue(self._client_message, wid, "_NET_MOVERESIZE_WINDOW",
+                        [_MOVERESIZE_FLAGS, x, y, width, height])
+        else:
+            self._queue(self._configure, wid, x=x, y=y, width=width, height=height)
+
+    def add_states(self, wid, states) -> None:
+        self._change_states(_window_id(wid), _STATE_ADD, states)
+
+    def remove_states(self, wid, states) -> None:
+        self._change_states(_window_id(wid), _STATE_REMOVE, states)
+
+    def activate(self, wid) -> None:
+        """Raise and focus (what wmctrl -a does)."""
+        wid = _window_id(wid)
+        if self.has_wm:
+            self._queue(self._client_message, wid, "_NET_ACTIVE_WINDOW", [_SOURCE_PAGER, X.CurrentTime, 0, 0, 0])
+        else:
+            self._queue(self._configure, wid, stack_mode=X.Above)
+
+    def focus(self, wid) -> None:
+        """Give wid keyboard focus directly (SetInputFocus): for windows embedded in ours, which the WM doesn't manage."""
+        self._queue(self._set_input_focus, _window_id(wid))
+
+    def close(self, wid) -> None:
+        """Politely ask the window to close (what wmctrl -c does)."""
+        wid = _window_id(wid)
+        if self.has_wm:
+            self._queue(self._client_message, wid, "_NET_CLOSE_WINDOW", [X.CurrentTime, _SOURCE_PAGER, 0, 0, 0])
+        else:
+            self._queue(self._destroy, wid)
+
+    def undecorate(self, wid) -> None:
+        atom = self._atoms["_MOTIF_WM_HINTS"]
+        self._queue(self._set_property, _window_id(wid), atom, atom, _MOTIF_NO_DECORATIONS)
+
+    def set_window_type_splash(self, wid) -> None:
+        self._queue(self._set_property, _window_id(wid), self._atoms["_NET_WM_WINDOW_TYPE"],
+                    Xatom.ATOM, [self._atoms["_NET_WM_WINDOW_TYPE_SPLASH"]])
+
+    def flush(self) -> None:
+        """Send everything queued since the last flush in one write."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            for fn, args, kwargs in pending:
+                try:
+                    fn(*args, **kwargs)
+                except Exception as e:
+                    print(f"EWMH request failed: {e}")
+            try:
+                self._dpy.flush()
+            except Exception as e:
+                print(f"EWMH flush failed on {self.display_name or 'default display'}: {e}")
+
+    # ---- internals ----
+
+    def _queue(self, fn, *args, **kwargs) -> None:
+        with self._lock:
+            self._pending.append((fn, args, kwargs))
+
+    def _change_states(self, wid: int, action: int, states) -> None:
+        if not self.has_wm:
+            return  # nobody to honour _NET_WM_STATE on a bare Xephyr display
+        with self._lock:
+            atoms = [self._state_atom(s) for s in states]
+        # Two properties per message, like wmctrl -b
+        for i in range(0, len(atoms), 2):
+            pair = atoms[i:i + 2] + [0] * (2 - len(atoms[i:i + 2]))
+            self._queue(self._client_message, wid, "_NET_WM_STATE", [action, pair[0], pair[1], _SOURCE_PAGER, 0])
+
+    def _state_atom(self, state: str) -> int:
+        """Atom for a wmctrl-style state name, e.g. above -> _NET_WM_STATE_ABOVE (cached; interning is a round trip)."""
+        atom = self._state_atoms.get(state)
+        if atom is None:
+            atom = self._dpy.intern_atom("_NET_WM_STATE_" + state.upper())
+            self._state_atoms[state] = atom
+        return atom
+
+    def _client_message(self, wid: int, message: str, data) -> None:
+        window = self._dpy.create_resource_object("window", wid)
+        ev = xevent.ClientMessage(window=window, client_type=self._atoms[message], data=(32, data))
+        self._root.send_event(ev, event_mask=X.SubstructureRedirectMask | X.SubstructureNotifyMask)
+
+    def _configure(self, wid: int, **changes) -> None:
+        self._dpy.create_resource_object("window", wid).configure(**changes)
+
+    def _set_input_focus(self, wid: int) -> None:
+        self._dpy.create_resource_object("window", wid).set_input_focus(X.RevertToParent, X.CurrentTime)
+
+    def _destroy(self, wid: int) -> None:
+        self._dpy.create_resource_object("window", wid).destroy()
+
+    def _set_property(self, wid: int, prop: int, prop_type: int, values) -> None:
+        self._dpy.create_resource_object("window", wid).change_property(prop, prop_type, 32, values)
+
+
+_clients: dict[str, EwmhClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_ewmh(display: str | None = None) -> EwmhClient | None:
+    """Shared EWMH client for an X display (default: $DISPLAY). None if python-xlib is missing or the display can't be opened."""
+    if not _XLIB_AVAILABLE:
+        return None
+    name = display or os.environ.get("DISPLAY", "")
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is not None:
+            return client
+        try:
+            client = EwmhClient(name)
+        except Exception:
+            return None
+        _clients[name] = client
+        return client
+
+
+def forget_display(display: str | None) -> None:
+    """Drop the cached client for a display that went away (e.g. a stopped Xephyr frame)."""
+    name = display or os.environ.get("DISPLAY", "")
+    with _clients_lock:
+        client = _clients.pop(name, None)
+    if client is not None:
+        try:
+            client._dpy.close()
+        except Exception:
+            pass
@@ -0,0 +1,1579 @@
+"""
+Sambar HUD application: the full-screen HUD window (index.html), LIVI (CarPlay) and Steam Link
+sessions, and window layout. main.py imports this only once the boot splash is on screen, so
+QtWebEngine, asyncio, python-xlib and psutil load behind the splash instead of before its first frame.
+The HUD is drawn by Chromium (hud_web) or, with performance.low_power_mode, natively (native_hud);
+QtWebEngine is only imported for the former.
+"""
+
+import sys
+import os
+import glob
+import platform
+
+import asyncio
+import subprocess
+import threading
+
+try:
+    from PyQt6.QtWidgets import QApplication, QLabel, QMainWindow, QWidget
+    from PyQt6.QtCore import Qt, QTimer, QObject, QRect, pyqtSignal
+    from PyQt6.QtGui import QShortcut, QKeySequence, QColor, QPainter
+except ImportError as e:
+    print(f"Error importing PyQt6: {e}")
+    print("Please install PyQt6 and PyQtWebEngine")
+    sys.exit(1)
+
+try:
+    from config import Config, get_config
+    from config_watch import ConfigWatcher
+    from clock_service import get_clock
+    from hud_bridge import HudBridge
+    from native_hud import NativeHud
+    import hud_frame
+    import assets
+    from boot_splash import BootSplash, get_effective_screen_size
+    from boot import BootGraph
+    import boot_trace
+    import x_displays
+    from x11_windows import get_index, get_tracker
+    from layout_controller import LayoutController, LayoutOps, WindowSpec, apply_blind
+    from ewmh import forget_display, get_ewmh
+    from process_supervisor import get_supervisor
+    from async_qt import cancel, install_event_loop, is_running as is_flow_running, run_event_loop, spawn
+    from parking import get_parking
+    from window_embed import EmbedSlot, can_embed
+except ImportError as e:
+    print(f"Error importing application modules: {e}")
+    sys.exit(1)
+
+
+def get_app_dir():
+    """Directory containing main.py (and index.html, img/)."""
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+# Names of our children in the process supervisor (Home / quit stop them by name)
+_STEAMLINK_CHILD = "steamlink"
+_STEAMLINK_XEPHYR_CHILD = "steamlink-xephyr"
+_LIVI_CHILD = "livi"
+_LIVI_XEPHYR_CHILD = "livi-xephyr"
+
+
+# Restart delay for a crashed LIVI / Steam Link: their X server (ours, or a Xephyr frame that stays up)
+# is already there, so there is nothing to wait for but the app itself
+_CLIENT_BACKOFF = 0.1
+
+
+def _start_child(name: str, argv: list, env: dict | None = None, cwd: str | None = None, restart: bool = False,
+                 backoff: float | None = None, pass_fds=()) -> bool:
+    """Start a supervised child; False if the program is missing or not executable."""
+    try:
+        get_supervisor().start(name, argv, env=env, cwd=cwd, restart=restart, backoff=backoff, pass_fds=pass_fds)
+        return True
+    except (FileNotFoundError, PermissionError):
+        return False
+
+
+def stop_steam_link_session() -> None:
+    """Stop Steam Link so the left half shows the HUD again. Its Xephyr frame, when embedded, stays up
+    behind the HUD, so the next launch only starts Steam Link; otherwise the frame is stopped too."""
+    cancel(_STEAMLINK_FLOW)
+    _clear_layout("steamlink", "steamlink_frame")
+    get_parking().forget(_STEAMLINK_CHILD)
+    if not _STEAMLINK_FRAME.hide():
+        _release_region("left")
+        _STEAMLINK_FRAME.stop()
+    get_supervisor().stop(_STEAMLINK_CHILD)
+
+
+def park_steam_link_session() -> bool:
+    """
+    Home with Steam Link up: hide it and SIGSTOP it (parking) instead of stopping it, so launching it
+    again resumes the same session at once. Only for an embedded Steam Link that has finished launching,
+    with performance.park_apps on; False otherwise, and the caller stops it instead. When memory runs
+    low a parked Steam Link is stopped after all.
+    """
+    mw = _find_main_window()
+    slot = _region_slot("left")
+    if (mw is None or not mw.config.get("performance.park_apps", True) or is_flow_running(_STEAMLINK_FLOW)
+            or slot is None or not slot.is_embedded()):
+        return False
+    if not get_parking().park(_STEAMLINK_CHILD, on_evict=stop_steam_link_session):
+        return False
+    slot.hide()
+    return True
+
+
+def _resume_steam_link() -> bool:
+    """Launching Steam Link while it is parked: continue it and show it again. False if it isn't parked."""
+    slot = _region_slot("left")
+    if slot is None or not slot.is_embedded() or not get_parking().resume(_STEAMLINK_CHILD):
+        return False
+    slot.show()
+    slot.raise_()
+    slot.focus_app()
+    mw = _find_main_window()
+    if mw is not None:
+        mw.set_region_covered("left", True)
+    boot_trace.mark("steamlink_resumed")
+    return True
+
+
+def _get_steam_link_window_id() -> str | None:
+    """Return wmctrl window id for Steam Link (or Xephyr Steam Link) window, or None."""
+    index = get_index()
+    if index is not None:
+        info = index.by_role("steamlink")
+        return info.hex_id if info else None
+    try:
+        out = subprocess.run(
+            ["wmctrl", "-l"],
+            capture_output=True,
+            text=True,
+            timeout=2,
+        )
+        if out.returncode != 0:
+            return None
+        for line in out.stdout.splitlines():
+            # "0x... 0 desktop title" or "0x... 1 window title"
+            parts = line.split(None, 2)
+            if len(parts) < 3:
+                continue
+            wid, _desk, title = parts[0], parts[1], parts[2]
+            if "Steam Link" in title or "steamlink" in title.lower() or "SambarSteamLink" in title:
+                return wid
+        return None
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+
+
+# Left-half geometry: position (0,0), size 1280x720
+_LEFT_HALF_GEOM = (0, 0, 1280, 720)
+
+# Sidebar width (px) so LIVI doesn't cover the right-edge sidebar
+_LIVI_SIDEBAR_WIDTH = 88
+
+# Names of the launch flows (async_qt tasks), so Home / quit can cancel them mid-launch
+_STEAMLINK_FLOW = "steamlink-launch"
+_LIVI_FLOW = "livi-launch"
+_BOOT_FLOW = "boot"
+
+
+async def _wait_for_window(match, timeout: float, display: str | None = None, poll=None) -> str | None:
+    """Wait until a window with the given role (e.g. "livi", see x11_windows.ROLES) or accepted by a
+    WindowMatch is mapped; return its wmctrl-style id or None on timeout.
+    Uses the X11 window tracker (no forks); without python-xlib falls back to running poll() off the
+    GUI thread every 0.4s."""
+    tracker = get_tracker(display)
+    if tracker is not None:
+        info = await tracker.wait_for_async(match, timeout)
+        return info.hex_id if info else None
+    if poll is None:
+        return None
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        await asyncio.sleep(0.4)
+        wid = await loop.run_in_executor(None, poll)
+        if wid:
+            return wid
+    return None
+
+
+def _find_main_window() -> "MainWindow | None":
+    """Our MainWindow among the top-level widgets (GUI thread only)."""
+    for w in QApplication.topLevelWidgets():
+        if type(w).__name__ == "MainWindow":
+            return w
+    return None
+
+
+async def _hand_left_half_to(role: str, wid: str) -> None:
+    """Steam Link (or its frame) is up: embed it in the left half, or else declare its left-half layout,
+    let it over the HUD and take focus back."""
+    mw = _find_main_window()
+    if mw is not None and (role.endswith("_frame") or _embed_apps(mw.config)):
+        if _embed_in_main_window(mw, "left", role, wid):
+            mw.set_region_covered("left", True)
+            _follow(mw, "left", role)  # a restarted Steam Link (or frame) comes back in the same place
+            return
+    _apply_layout(role, _left_half_spec(), wid)
+    if mw is None:
+        return
+    _set_overlay_mode(mw, True)
+    mw.set_region_covered("left", True)
+    # Return focus to our app so Pi taskbar doesn't stay visible
+    await asyncio.sleep(0.2)
+    mw.raise_()
+    mw.activateWindow()
+
+
+def _get_livi_window_id() -> str | None:
+    """Return wmctrl window id for LIVI (CarPlay) window, or None. Tries title and WM_CLASS."""
+    index = get_index()
+    if index is not None:
+        info = index.by_role("livi")
+        return info.hex_id if info else None
+    # No window index (python-xlib missing): try wmctrl -l (title only)
+    try:
+        out = subprocess.run(
+            ["wmctrl", "-l"],
+            capture_output=True,
+            text=True,
+            timeout=2,
+        )
+        if out.returncode == 0:
+            for line in out.stdout.splitlines():
+                parts = line.split(None, 2)
+                if len(parts) < 3:
+                    continue
+                wid, _desk, title = parts[0], parts[1], parts[2]
+                if "LIVI" in title or "livi" in title.lower() or "CarPlay" in title:
+                    return wid
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+    # Try wmctrl -l -x (WM_CLASS) for Electron/LIVI
+    try:
+        out = subprocess.run(
+            ["wmctrl", "-l", "-x"],
+            capture_output=True,
+            text=True,
+            timeout=2,
+        )
+        if out.returncode == 0:
+            for line in out.stdout.splitlines():
+                parts = line.split(None, 3)
+                if len(parts) < 4:
+                    continue
+                wid = parts[0]
+                rest = line.lower()
+                if "livi" in rest or "carplay" in rest or "electron" in rest:
+                    return wid
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+    return None
+
+
+def _raise_livi_window(wmctrl_window_id: str) -> None:
+    """Raise/activate LIVI window so it appears in front (not behind our HUD)."""
+    _raise_window(wmctrl_window_id)
+
+
+def _ewmh_request(display: str | None, action: str, *args) -> bool:
+    """Send one request through the in-process EWMH client (see ewmh.EwmhClient) and flush it.
+    Returns False when there is no client (python-xlib missing), so callers can fall back to wmctrl/xprop."""
+    client = get_ewmh(display)
+    if client is None:
+        return False
+    getattr(client, action)(*args)
+    client.flush()
+    return True
+
+
+def _raise_window(wmctrl_window_id: str) -> None:
+    """Raise a window by wmctrl id so it appears in front."""
+    if _ewmh_request(None, "activate", wmctrl_window_id):
+        return
+    try:
+        subprocess.run(
+            ["wmctrl", "-i", "-a", wmctrl_window_id],
+            capture_output=True,
+            timeout=2,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+
+
+def _remove_window_decorations(wmctrl_window_id: str) -> None:
+    """Remove window title bar/decorations (borderless) via _MOTIF_WM_HINTS. Call early so geometry uses full height."""
+    if _ewmh_request(None, "undecorate", wmctrl_window_id):
+        return
+    try:
+        try:
+            dec_id = str(int(wmctrl_window_id, 16))
+        except ValueError:
+            dec_id = wmctrl_window_id
+        subprocess.run(
+            ["xprop", "-id", dec_id, "-f", "_MOTIF_WM_HINTS", "32c", "-set", "_MOTIF_WM_HINTS", "2", "0", "0", "0", "0", "0", "0", "0", "0"],
+            capture_output=True,
+            timeout=2,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+
+
+def _set_window_type_splash(wmctrl_window_id: str) -> None:
+    """Set _NET_WM_WINDOW_TYPE to SPLASH so compositors (e.g. KWin) may draw no title bar."""
+    if _ewmh_request(None, "set_window_type_splash", wmctrl_window_id):
+        return
+    try:
+        dec_id = str(int(wmctrl_window_id, 16))
+    except ValueError:
+        return
+    try:
+        subprocess.run(
+            ["xprop", "-id", dec_id, "-f", "_NET_WM_WINDOW_TYPE", "32a", "-set", "_NET_WM_WINDOW_TYPE", "_NET_WM_WINDOW_TYPE_SPLASH"],
+            capture_output=True,
+            timeout=2,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+
+
+def _set_livi_stays_above(wmctrl_window_id: str) -> None:
+    """Keep LIVI window above our HUD; remove title bar so it looks borderless."""
+    client = get_ewmh()
+    if client is not None:
+        client.add_states(wmctrl_window_id, ("above",))
+        client.undecorate(wmctrl_window_id)
+        client.flush()
+        return
+    try:
+        subprocess.run(
+            ["wmctrl", "-i", "-r", wmctrl_window_id, "-b", "add,above"],
+            capture_output=True,
+            timeout=2,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+    _remove_window_decorations(wmctrl_window_id)
+
+
+def _close_window(wmctrl_window_id: str) -> None:
+    """Ask a window to close gracefully (_NET_CLOSE_WINDOW, like wmctrl -c)."""
+    if _ewmh_request(None, "close", wmctrl_window_id):
+        return
+    try:
+        subprocess.run(["wmctrl", "-i", "-c", wmctrl_window_id], capture_output=True, timeout=2)
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+
+
+def _embed_apps(config: "Config") -> bool:
+    """Whether apps' own windows are embedded in ours (window_embed) rather than run in a Xephyr frame
+    or placed over ours by the window manager. Xephyr frames themselves are embedded either way."""
+    return config.get("performance.embed_windows", True) and can_embed()
+
+
+def _embed_in_main_window(main_window: "MainWindow", region: str, role: str, wmctrl_window_id: str) -> bool:
+    """
+    Reparent a window (an app's, or its Xephyr frame) into the "left" or "right" region of our main window.
+    Only works when Qt platform is xcb (X11). Returns True if embedding was done, False if skipped or failed.
+    """
+    slot = main_window.slots.get(region)
+    if slot is None or not slot.embed(wmctrl_window_id):
+        return False
+    boot_trace.mark(f"{role}_embedded")
+    return True
+
+
+def _window_owner(role: str):
+    """Predicate for the windows of role that are really ours: a frame's by its own title, an app's by
+    its process group, so an unrelated Electron or "CarPlay" window is never taken into a region."""
+    for frame in _FRAMES:
+        if frame.role == role:
+            return lambda info, title=frame.title: info.title.startswith(title)
+    child = {"livi": _LIVI_CHILD, "steamlink": _STEAMLINK_CHILD}[role]
+
+    def owner(info) -> bool:
+        supervisor = get_supervisor()
+        if supervisor.owns(child, info.pid):
+            return True
+        # A Flatpak app reports pids from its sandbox's namespace: the role match is all there is
+        running = supervisor.get(child)
+        return running is not None and running.running and running.argv[0] == "flatpak"
+
+    return owner
+
+
+def _follow(main_window: "MainWindow", region: str, role: str) -> None:
+    """Keep region embedding our window of role when it is replaced (app or frame restarted)."""
+    main_window.slots[region].follow(role, _window_owner(role))
+
+
+def _region_slot(region: str) -> "EmbedSlot | None":
+    mw = _find_main_window()
+    return mw.slots.get(region) if mw is not None else None
+
+
+def _release_region(region: str, wid: str | None = None) -> None:
+    """Take whatever is embedded in region (only if it is wid, when given) out of our window before its app
+    is stopped."""
+    slot = _region_slot(region)
+    if slot is not None and (wid is None or slot.window_id == wid):
+        slot.release(hide_window=True)
+
+
+def _set_livi_vertical_maximize(wmctrl_window_id: str) -> None:
+    """Ask WM to maximize LIVI vertically only so it fills top-to-bottom (full height)."""
+    if _ewmh_request(None, "add_states", wmctrl_window_id, ("maximized_vert",)):
+        return
+    try:
+        subprocess.run(
+            ["wmctrl", "-i", "-r", wmctrl_window_id, "-b", "add,maximized_vert"],
+            capture_output=True,
+            timeout=2,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+
+
+def _change_window_states(wmctrl_window_id: str, action: str, states) -> None:
+    """Add or remove _NET_WM_STATE names ("above", "skip_taskbar", ...); action is "add" or "remove"."""
+    if _ewmh_request(None, action + "_states", wmctrl_window_id, states):
+        return
+    # wmctrl accepts two states per call
+    states = list(states)
+    for i in range(0, len(states), 2):
+        try:
+            subprocess.run(
+                ["wmctrl", "-i", "-r", wmctrl_window_id, "-b", ",".join([action] + states[i:i + 2])],
+                capture_output=True,
+                timeout=2,
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return
+
+
+def _move_resize_window(wmctrl_window_id: str, x: int, y: int, w: int, h: int) -> None:
+    """Move and resize a window (_NET_MOVERESIZE_WINDOW, or wmctrl -e with gravity 0)."""
+    if _ewmh_request(None, "move_resize", wmctrl_window_id, x, y, w, h):
+        return
+    try:
+        subprocess.run(
+            ["wmctrl", "-i", "-r", wmctrl_window_id, "-e", f"0,{x},{y},{w},{h}"],
+            capture_output=True,
+            timeout=2,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+
+
+class _WindowLayoutOps(LayoutOps):
+    """
+    Layout requests for one X display. Queued on the in-process EWMH client and sent with a single
+    flush per layout pass; falls back to wmctrl/xprop (one process per request) without python-xlib.
+    display: nested X display (e.g. ':98') or None for ours.
+    """
+
+    def __init__(self, display: str | None = None):
+        self.display = display
+        self._client = get_ewmh(display)
+
+    def undecorate(self, wid: str) -> None:
+        if self._client is not None:
+            self._client.undecorate(wid)
+        else:
+            _remove_window_decorations(wid)
+
+    def remove_states(self, wid: str, states) -> None:
+        if self._client is not None:
+            self._client.remove_states(wid, states)
+        else:
+            _change_window_states(wid, "remove", states)
+
+    def move_resize(self, wid: str, x: int, y: int, width: int, height: int) -> None:
+        if self._client is not None:
+            self._client.move_resize(wid, x, y, width, height)
+        elif self.display:
+            _set_window_geometry_on_display(wid, x, y, width, height, self.display)
+        else:
+            _move_resize_window(wid, x, y, width, height)
+
+    def add_states(self, wid: str, states) -> None:
+        if self._client is not None:
+            self._client.add_states(wid, states)
+        else:
+            _change_window_states(wid, "add", states)
+
+    def raise_window(self, wid: str) -> None:
+        if self._client is not None:
+            self._client.activate(wid)
+        else:
+            _raise_window(wid)
+
+    def flush(self) -> None:
+        if self._client is not None:
+            self._client.flush()
+
+
+# One layout controller per X display ("" = ours, ":98" = LIVI's Xephyr frame, ...)
+_layout_controllers: dict = {}
+_layout_lock = threading.Lock()
+
+
+def _get_layout(display: str | None = None) -> "LayoutController | None":
+    """Shared layout controller for an X display, or None when window tracking is unavailable."""
+    key = display or ""
+    with _layout_lock:
+        controller = _layout_controllers.get(key)
+        tracker = get_tracker(display)
+        if tracker is None:
+            return None
+        if controller is None or controller.tracker is not tracker:
+            # New display, or the old tracker died with its (Xephyr) server
+            controller = LayoutController(tracker, _WindowLayoutOps(display))
+            _layout_controllers[key] = controller
+        return controller
+
+
+def _apply_layout(role: str, spec: WindowSpec, wid: str | None = None, display: str | None = None) -> None:
+    """Declare where windows of role belong. The controller corrects them only when they drift;
+    without window tracking the spec is applied once to wid."""
+    layout = _get_layout(display)
+    if layout is not None:
+        layout.set_spec(role, spec)
+    elif wid:
+        apply_blind(_WindowLayoutOps(display), wid, spec)
+
+
+def _clear_layout(*roles: str) -> None:
+    layout = _get_layout()
+    if layout is not None:
+        for role in roles:
+            layout.clear(role)
+
+
+def _track_hud_window(main_window: "MainWindow") -> None:
+    """Tell the layout controller which native window is ours (it changes when Qt recreates it)."""
+    layout = _get_layout()
+    if layout is not None and main_window is not None:
+        layout.set_hud_window(int(main_window.winId()))
+
+
+def _livi_right_spec(effective_width: int, effective_height: int) -> WindowSpec:
+    """LIVI: from screen center to the sidebar's left edge, full height, borderless, kept above the HUD."""
+    center_x = effective_width // 2
+    return WindowSpec(
+        center_x, 0, center_x - _LIVI_SIDEBAR_WIDTH, effective_height,
+        above=True, undecorated=True, skip_taskbar=True, raised=True,
+    )
+
+
+def _left_half_spec() -> WindowSpec:
+    """Steam Link (or its Xephyr frame): left half, in front of the HUD, hidden from the Pi taskbar."""
+    return WindowSpec(*_LEFT_HALF_GEOM, skip_taskbar=True, raised=True)
+
+
+def launch_steam_link_left(app_dir: str) -> None:
+    """Run Steam Link on the left half only (1280x720).
+    Tries: (1) --windowed + wmctrl position, (2) Xephyr with 1280x720, (3) direct launch.
+    A parked Steam Link (Home) is resumed instead."""
+    if _resume_steam_link():
+        return
+    stop_steam_link_session()
+
+    # ---- 1) Prefer windowed Steam Link: launch with --windowed then position to left half ----
+    windowed_launchers = [
+        # Flatpak (common on Steam Deck / modern distros)
+        ["flatpak", "run", "--command=steamlink", "com.valvesoftware.SteamLink", "--windowed"],
+        ["flatpak", "run", "com.valvesoftware.SteamLink", "--windowed"],
+        # Apt/deb
+        ["steamlink", "--windowed"],
+        ["steam-link", "--windowed"],
+    ]
+
+    for cmd in windowed_launchers:
+        if _start_child(_STEAMLINK_CHILD, cmd, restart=True):
+            break
+    else:
+        # No windowed launcher found; try Xephyr
+        _launch_steam_link_via_xephyr()
+        return
+
+    async def flow():
+        wid = await _wait_for_window("steamlink", 10.0, poll=_get_steam_link_window_id)
+        if wid:
+            await _hand_left_half_to("steamlink", wid)
+    spawn(_STEAMLINK_FLOW, flow())
+
+
+def _launch_steam_link_via_xephyr() -> None:
+    """Run Steam Link inside a 1280x720 Xephyr frame on the left half (fallback). A frame kept from an
+    earlier launch is reused, so then only Steam Link starts."""
+    if not _STEAMLINK_FRAME.launch(*_LEFT_HALF_GEOM[2:]):
+        # No Xephyr; last resort: launch fullscreen
+        for c in ["steamlink", "steam-link"]:
+            if _start_child(_STEAMLINK_CHILD, [c], restart=True):
+                break
+        return
+
+    async def flow():
+        # The frame window is mapped once Xephyr accepts connections, so Steam Link can start right after
+        wid = await _STEAMLINK_FRAME.wait_mapped()
+        if wid:
+            await _hand_left_half_to("steamlink_frame", wid)
+        env = os.environ.copy()
+        env["DISPLAY"] = _STEAMLINK_FRAME.display
+        for c in ["steamlink", "steam-link"]:
+            if _start_child(_STEAMLINK_CHILD, [c], env=env, restart=True, backoff=_CLIENT_BACKOFF):
+                break
+
+    spawn(_STEAMLINK_FLOW, flow())
+
+
+def stop_livi_session(keep_frame: bool = False) -> None:
+    """Stop LIVI and its Xephyr frame (if used) when quitting or powering off. keep_frame: leave the frame
+    running and embedded, for restarting LIVI in it."""
+    cancel(_LIVI_FLOW)  # only LIVI's stages: the rest of boot (HUD page, splash) carries on
+    if _livi_graph is not None:
+        _livi_graph.abort()
+    _clear_layout("livi", "livi_frame")
+    if keep_frame and _LIVI_FRAME.is_running():
+        get_supervisor().stop(_LIVI_CHILD)
+        return
+    _release_region("right")
+    get_supervisor().stop(_LIVI_CHILD)
+    _LIVI_FRAME.stop()
+    mw = _find_main_window()
+    if mw is not None:
+        mw.set_region_covered("right", False)
+
+
+async def _kill_other_livi_processes() -> None:
+    """Stop any already-running LIVI/carplay processes (e.g. from autostart) so we can run 4.1.2 only."""
+    # Match LIVI AppImages and pi-carplay; avoid killing our own process
+    for pattern in ("LIVI.AppImage", "pi-carplay.*AppImage"):
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "pkill", "-f", pattern,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            await asyncio.wait_for(proc.wait(), 2)
+        except (FileNotFoundError, asyncio.TimeoutError):
+            return
+    await asyncio.sleep(0.5)  # Let processes exit
+
+
+def _find_livi_appimage(config: "Config") -> str | None:
+    """Resolve LIVI AppImage path: config carplay.livi_appimage_path, or ~/LIVI/ by arch (x86_64 vs arm64)."""
+    path_cfg = config.get("carplay.livi_appimage_path") if config else None
+    if path_cfg:
+        exe = os.path.expanduser(path_cfg)
+        if os.path.isfile(exe):
+            return exe
+    livi_dir = os.path.expanduser("~/LIVI")
+    if not os.path.isdir(livi_dir):
+        return None
+    machine = platform.machine().lower()
+    if machine in ("x86_64", "amd64"):
+        pattern = os.path.join(livi_dir, "*x86_64*.AppImage")
+    elif machine in ("aarch64", "arm64"):
+        pattern = os.path.join(livi_dir, "*arm64*.AppImage")
+    else:
+        pattern = os.path.join(livi_dir, "*.AppImage")
+    candidates = sorted(glob.glob(pattern), reverse=True)  # prefer newer by name
+    for exe in candidates:
+        if os.path.isfile(exe):
+            return exe
+    return None
+
+
+def _livi_command(exe: str, display: str | None = None) -> tuple[list, dict]:
+    """LIVI's argv and environment. display: nested X server (Xephyr frame) to run it on, None for ours."""
+    env = os.environ.copy()
+    # So LIVI's spawned pw-play (audio) is findable: our wrapper first, then /usr/bin, /bin
+    scripts_dir = os.path.join(get_app_dir(), "scripts")
+    path_parts = []
+    if os.path.isdir(scripts_dir):
+        path_parts.append(scripts_dir)
+    for d in ("/usr/local/bin", "/usr/bin", "/bin"):
+        if os.path.isdir(d):
+            path_parts.append(d)
+    path_parts.append(env.get("PATH", ""))
+    env["PATH"] = os.pathsep.join(path_parts)
+    livi_args = [exe, "--no-sandbox"]
+    if display:
+        env["DISPLAY"] = display
+        env.pop("WAYLAND_DISPLAY", None)
+        env.pop("XDG_SESSION_TYPE", None)
+        livi_args.append("--ozone-platform=x11")
+    elif os.environ.get("XDG_SESSION_TYPE", "").lower() == "wayland":
+        # On Wayland, run LIVI under X11 (XWayland) so we can see and position its window
+        livi_args.append("--ozone-platform=x11")
+    return livi_args, env
+
+
+def _get_window_id_by_title(title_substring: str, display: str | None = None) -> str | None:
+    """Return wmctrl window id (hex string) for the first window whose title contains the given string, or None.
+    If display is set (e.g. ':98'), look on that X display."""
+    index = get_index(display)
+    if index is not None:
+        info = index.find_title(title_substring)
+        return info.hex_id if info else None
+    env = os.environ.copy() if display else None
+    if display:
+        env = os.environ.copy()
+        env["DISPLAY"] = display
+    try:
+        out = subprocess.run(
+            ["wmctrl", "-l"],
+            capture_output=True,
+            text=True,
+            timeout=2,
+            env=env,
+        )
+        if out.returncode != 0:
+            return None
+        for line in out.stdout.splitlines():
+            parts = line.split(None, 2)
+            if len(parts) < 3:
+                continue
+            wid, _desk, title = parts[0], parts[1], parts[2]
+            if title_substring in title:
+                return wid
+        return None
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+
+
+def _set_window_geometry_on_display(wmctrl_window_id: str, x: int, y: int, w: int, h: int, display: str) -> None:
+    """Move and resize a window on the given X display (e.g. :98). Without a WM there the window is configured directly."""
+    if _ewmh_request(display, "move_resize", wmctrl_window_id, x, y, w, h):
+        return
+    try:
+        geom = f"0,{x},{y},{w},{h}"
+        env = os.environ.copy()
+        env["DISPLAY"] = display
+        subprocess.run(
+            ["wmctrl", "-i", "-r", wmctrl_window_id, "-e", geom],
+            capture_output=True,
+            timeout=2,
+            env=env,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+
+
+def _find_livi_window_on_display(display: str) -> str | None:
+    """Return wmctrl window id of LIVI's window on the given (Xephyr) display, or None."""
+    index = get_index(display)
+    if index is not None:
+        info = index.by_role("livi")
+        return info.hex_id if info else None
+    for name in ["LIVI", "CarPlay", "livi", "pi-carplay"]:
+        wid = _get_window_id_by_title(name, display)
+        if wid:
+            return wid
+    return None
+
+
+class _XephyrFrame:
+    """
+    A nested X server ('frame') an app runs full-size in; we only place the frame's one window.
+    Long-lived and supervised: stopping or restarting the app inside (a crash, Home, a settings change)
+    reuses the running, mapped and embedded frame, and only a new size starts a new server. If the
+    server itself crashes the supervisor restarts it on the same display, its region re-embeds the new
+    frame (EmbedSlot.follow) and the windows inside are placed again.
+    The display number is the first free one from base on (x_displays), and the server says when it
+    accepts connections through -displayfd.
+    """
+
+    def __init__(self, child: str, base: int, title: str, role: str, region: str):
+        self.child = child  # process supervisor name
+        self.base = base  # preferred display number
+        self.title = title
+        self.role = role  # x11_windows role of the frame window on our display
+        self.region = region  # MainWindow slot it is embedded in
+        self.number: int | None = None
+        self.size: tuple[int, int] | None = None  # Xephyr can't change its screen size
+        self.wid: str | None = None
+        self._pid = None  # server pid self.wid belongs to
+        self._specs: dict[str, WindowSpec] = {}  # layout of the windows inside, by role
+        self._displayfd = None  # (read end, write end); the write end is passed to every run of the server
+        self._ready = False
+
+    @property
+    def display(self) -> str | None:
+        return None if self.number is None else f":{self.number}"
+
+    def is_running(self) -> bool:
+        return get_supervisor().is_running(self.child)
+
+    def launch(self, width: int, height: int, start: int | None = None) -> bool:
+        """Start the server unless one of this size is already running. False if Xephyr is missing or no
+        display number is free. start: first display number to try (default base)."""
+        if self.is_running() and self.size == (width, height):
+            return True
+        self.stop()
+        x_displays.clean_stale_locks()
+        taken = {f.number for f in _FRAMES if f is not self and f.number is not None}
+        number = x_displays.free_display(self.base if start is None else start, taken)
+        if number is None:
+            print(f"No free X display for {self.title} (:{self.base} and up are all taken)")
+            return False
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        args = [
+            "Xephyr", f":{number}", "-displayfd", str(write_fd),
+            "-screen", f"{width}x{height}", "-title", self.title, "-br", "-ac",
+        ]
+        if not _start_child(self.child, args, restart=True, pass_fds=(write_fd,)):
+            os.close(read_fd)
+            os.close(write_fd)
+            return False
+        self.number, self.size, self._displayfd, self._ready = number, (width, height), (read_fd, write_fd), False
+        self._pid = get_supervisor().pid(self.child)
+        boot_trace.mark("xephyr_started", display=self.display)
+        return True
+
+    async def wait_ready(self, timeout: float = 10.0) -> bool:
+        """Wait until the server accepts connections. A server that exits first (its display number was
+        taken meanwhile) is started again on the next free number."""
+        if self._ready:
+            return True
+        for _attempt in range(3):
+            if self._displayfd is None:
+                return False
+            number = await x_displays.wait_displayfd(self._displayfd[0], self.is_running, timeout)
+            if number is not None:
+                self._ready = True
+                boot_trace.mark("xephyr_ready", display=self.display)
+                return True
+            if self.is_running() or self.size is None:
+                return False  # up but silent, or stopped meanwhile
+            if not self.launch(*self.size, start=self.number + 1):
+                return False
+        return False
+
+    async def wait_mapped(self, timeout: float = 10.0) -> str | None:
+        """The frame's window id once the server is ready and the window mapped; at once for a running frame."""
+        if self.wid is not None and not self._restarted():
+            return self.wid
+        if not await self.wait_ready(timeout):
+            return None
+        self.wid = await _wait_for_window(self.role, timeout, poll=lambda: _get_window_id_by_title(self.title))
+        if self.wid and self._restarted():
+            self._renew()
+        return self.wid
+
+    def place(self, role: str, spec: WindowSpec, wid: str | None = None) -> None:
+        """Declare where windows of role go inside the frame; kept for a restarted server."""
+        self._specs[role] = spec
+        _apply_layout(role, spec, wid, display=self.display)
+
+    def hide(self) -> bool:
+        """Idle the frame behind the HUD, still embedded and sized. False if it isn't embedded."""
+        slot = _region_slot(self.region)
+        if self.wid is None or slot is None or slot.window_id != self.wid or not self.is_running():
+            return False
+        slot.hide()
+        return True
+
+    def stop(self) -> None:
+        if self.wid is not None:
+            _release_region(self.region, self.wid)
+        if get_supervisor().stop(self.child):
+            forget_display(self.display)
+        if self._displayfd is not None:
+            for fd in self._displayfd:
+                os.close(fd)
+        self.number = self.size = self.wid = self._pid = self._displayfd = None
+        self._ready = False
+        self._specs.clear()
+
+    def on_embedded(self, wid: str) -> None:
+        """Its region embedded wid: after a server restart, that is the new frame window."""
+        if self._restarted():
+            self.wid = wid
+            self._renew()
+
+    def _restarted(self) -> bool:
+        return self.is_running() and get_supervisor().pid(self.child) != self._pid
+
+    def _renew(self) -> None:
+        """New server: drop the old connection and place the windows inside again as they (re)appear."""
+        self._pid = get_supervisor().pid(self.child)
+        forget_display(self.display)
+        for role, spec in self._specs.items():
+            _apply_layout(role, spec, display=self.display)
+
+
+# LIVI's frame is sized to the right half minus the sidebar; Steam Link's to the left half
+_LIVI_FRAME = _XephyrFrame(_LIVI_XEPHYR_CHILD, 98, "SambarLIVI", "livi_frame", "right")
+_STEAMLINK_FRAME = _XephyrFrame(_STEAMLINK_XEPHYR_CHILD, 99, "SambarSteamLink", "steamlink_frame", "left")
+_FRAMES = (_LIVI_FRAME, _STEAMLINK_FRAME)
+
+
+def _livi_frame_size(eff_w: int, eff_h: int) -> tuple[int, int]:
+    return (eff_w // 2) - _LIVI_SIDEBAR_WIDTH, eff_h
+
+
+async def _start_livi_frame(eff_w: int, eff_h: int) -> str | None:
+    """
+    Start LIVI's Xephyr frame, or reuse the running one. Returns the frame's window id once mapped,
+    None if Xephyr is missing, no display is free or the frame never showed up.
+    """
+    if not _LIVI_FRAME.launch(*_livi_frame_size(eff_w, eff_h)):
+        return None
+    wid = await _LIVI_FRAME.wait_mapped()
+    if wid:
+        boot_trace.mark("xephyr_frame_mapped")
+    return wid
+
+
+async def _start_livi(exe: str, eff_w: int, eff_h: int) -> str | None:
+    """Start LIVI inside its Xephyr frame when that is running, else as a normal window.
+    Returns LIVI's window id (on the frame's display for Xephyr) once it is mapped."""
+    if _LIVI_FRAME.is_running():
+        display = _LIVI_FRAME.display
+        livi_args, env = _livi_command(exe, display)
+        # A crashed LIVI comes straight back in the frame, which stays up
+        _start_child(_LIVI_CHILD, livi_args, env=env, cwd=os.path.dirname(exe), restart=True, backoff=_CLIENT_BACKOFF)
+        # Make LIVI's window inside the Xephyr fill the frame as soon as it maps, and again whenever it resizes itself
+        inner = await _wait_for_window(
+            "livi", 20.0, display=display, poll=lambda: _find_livi_window_on_display(display),
+        )
+        if inner:
+            boot_trace.mark("livi_window_mapped", display=display)
+            _LIVI_FRAME.place("livi", WindowSpec(0, 0, *_livi_frame_size(eff_w, eff_h)), inner)
+        return inner
+    livi_args, env = _livi_command(exe)
+    if not _start_child(_LIVI_CHILD, livi_args, env=env, cwd=os.path.dirname(exe), restart=True, backoff=_CLIENT_BACKOFF):
+        return None
+    wid = await _wait_for_window("livi", 20.0, poll=_get_livi_window_id)
+    if wid:
+        boot_trace.mark("livi_window_mapped")
+    return wid
+
+
+def _set_overlay_mode(main_window: "MainWindow", on: bool) -> None:
+    """
+    When on: drop _NET_WM_STATE_ABOVE so Steam Link / CarPlay windows can display over our app. When off:
+    put it back and raise the HUD. Done on the existing native window: setWindowFlags() would destroy and
+    re-create it, making Chromium rebuild its surface and detaching an embedded LIVI frame. Qt keeps
+    WindowStaysOnTopHint in its flags, so a window (re-)mapped by Qt starts out above as before.
+    """
+    if main_window is None or not main_window.isVisible() or main_window._overlay == on:
+        return
+    main_window._overlay = on
+    if on:
+        boot_trace.mark_once("first_overlay_mode")
+    _change_window_states(hex(int(main_window.winId())), "remove" if on else "add", ("above",))
+    if not on:
+        main_window.raise_()
+
+
+def _screen_size(main_window: "MainWindow") -> tuple[int, int]:
+    app = QApplication.instance()
+    if app and app.primaryScreen():
+        r = app.primaryScreen().geometry()
+        return r.width(), r.height()
+    return getattr(main_window, "_effective_width", 2560), getattr(main_window, "_effective_height", 720)
+
+
+async def _attach_livi(graph: BootGraph, main_window: "MainWindow", eff_w: int, eff_h: int) -> None:
+    """Our window is up: put LIVI in it on the right half (not covering the sidebar), full height, no title bar,
+    or else let it over our window there."""
+    main_window.set_region_covered("right", True)  # stop rendering what CarPlay covers, so its audio doesn't skip
+    frame = graph.result("livi_frame")
+    if frame:
+        # Embed the Xephyr frame into our fullscreen window so it reaches full height (not limited by OS panel)
+        if _embed_in_main_window(main_window, "right", "livi_frame", frame):
+            _follow(main_window, "right", "livi_frame")
+        else:
+            await asyncio.sleep(0.4)
+            if _embed_in_main_window(main_window, "right", "livi_frame", frame):
+                _follow(main_window, "right", "livi_frame")
+            else:
+                # Embed failed (e.g. Wayland can't embed X11); position Xephyr on host and try to remove title bar
+                _set_overlay_mode(main_window, True)
+                _set_window_type_splash(frame)  # KWin often drops title bar for SPLASH
+                _apply_layout("livi_frame", _livi_right_spec(eff_w, eff_h), frame)
+        return
+    if _LIVI_FRAME.is_running():
+        return  # Frame never mapped; nothing on our display to place
+    wid = await graph.wait("livi")
+    if not wid:
+        return
+    if _embed_apps(main_window.config) and _embed_in_main_window(main_window, "right", "livi", wid):
+        # LIVI draws straight into our window: no WM positioning, full control of size and no title bar.
+        # If it crashes, the supervisor restarts it and its new window is embedded again
+        _follow(main_window, "right", "livi")
+        return
+    _set_overlay_mode(main_window, True)
+    # One declaration instead of repeated move/raise rounds: the controller re-applies only on drift
+    _apply_layout("livi", _livi_right_spec(eff_w, eff_h), wid)
+
+
+def _livi_settings(main_window: "MainWindow") -> dict:
+    """What a LIVI launch needs from the config and the screen, read once per launch."""
+    config = main_window.config
+    return {
+        "size": _screen_size(main_window),
+        # LIVI's own window is embedded directly where possible; the Xephyr frame is the fallback
+        "use_xephyr": config.get("carplay.livi_use_xephyr", True) and not _embed_apps(config),
+    }
+
+
+def add_livi_stages(graph: BootGraph, main_window: "MainWindow") -> None:
+    """
+    LIVI (CarPlay) as graph stages: reading its settings and finding the AppImage (off the GUI thread),
+    then clearing stray instances and starting the Xephyr frame in parallel, then LIVI itself
+    (critical). Attaching it to our window waits for the graph's "shown" stage. Without an AppImage
+    the later stages do nothing.
+    """
+    loop = asyncio.get_event_loop()
+    graph.add("livi_config", lambda: _livi_settings(main_window))
+    graph.add("livi_find", lambda: loop.run_in_executor(None, _find_livi_appimage, main_window.config))
+
+    async def cleanup():
+        if graph.result("livi_find"):
+            await _kill_other_livi_processes()
+
+    async def frame():
+        settings = graph.result("livi_config")
+        if not graph.result("livi_find") or not settings["use_xephyr"]:
+            _LIVI_FRAME.stop()  # not used, or kept from before the mode changed
+            return None
+        return await _start_livi_frame(*settings["size"])
+
+    async def start():
+        exe = graph.result("livi_find")
+        return await _start_livi(exe, *graph.result("livi_config")["size"]) if exe else None
+
+    async def attach():
+        if graph.result("livi_find"):
+            await _attach_livi(graph, main_window, *graph.result("livi_config")["size"])
+
+    graph.add("livi_cleanup", cleanup, deps=("livi_find",))
+    graph.add("livi_frame", frame, deps=("livi_config", "livi_find"))
+    graph.add("livi", start, deps=("livi_cleanup", "livi_frame"), critical=True)
+    graph.add("livi_attach", attach, deps=("livi_config", "livi_find", "livi_frame", "shown"))
+
+
+# Stages of the current LIVI launch, so stopping LIVI can abort them (and "shown" be set once our window is up)
+_livi_graph: BootGraph | None = None
+
+
+def launch_livi_and_apply_layout(main_window: "MainWindow") -> BootGraph:
+    """
+    Launch LIVI (CarPlay) as its own flow (_LIVI_FLOW), at boot and from the HUD, so stopping LIVI
+    cancels only LIVI. Its window is attached once ours is shown: at once after boot, else when
+    start() sets "shown". Returns the stages, for boot to wait on "livi".
+    """
+    global _livi_graph
+    graph = BootGraph()
+    graph.add("shown")
+    add_livi_stages(graph, main_window)
+    if main_window.isVisible():
+        graph.set_done("shown")
+    _livi_graph = graph
+    spawn(_LIVI_FLOW, graph.run())
+    return graph
+
+
+def restart_livi_session(main_window: "MainWindow") -> None:
+    """Stop LIVI and start it again with the current settings, in the same frame if that still fits."""
+    stop_livi_session(keep_frame=True)
+    launch_livi_and_apply_layout(main_window)
+
+
+# Settings hot reload applies to a running HUD (MainWindow.apply_config_changes); the rest apply on next start
+_SCREEN_KEYS = {"screen_width", "screen_height", "fit_to_screen"}
+_LIVI_RESTART_KEYS = {"carplay.livi_use_xephyr", "carplay.livi_appimage_path", "performance.embed_windows"}
+# Fixed when the process starts: the renderer (Chromium or native) and Chromium's switches
+_RESTART_KEYS = {
+    "performance.low_power_mode",
+    "performance.chromium_profile",
+    "performance.chromium_flags",
+    "performance.chromium_drop_flags",
+}
+
+
+class _ConfigRelay(QObject):
+    """Carries config changes from the watcher thread to the GUI thread (queued signal)."""
+
+    changed = pyqtSignal(object)
+
+
+def _hud_actions(main_window: "MainWindow") -> dict:
+    """What the HUD's buttons do, by name (sambar://<name>, sambarCall("<name>") in index.html)."""
+    app_dir = get_app_dir()
+
+    def home():
+        # Steam Link is parked for a quick return; a launch still waiting for its window is cancelled
+        # and the session torn down
+        if not park_steam_link_session():
+            wid = _get_steam_link_window_id()
+            if wid and wid != _STEAMLINK_FRAME.wid:  # the frame stays up for the next launch
+                _close_window(wid)
+            stop_steam_link_session()
+        QTimer.singleShot(0, main_window._do_home)
+
+    def quit_app():
+        app = QApplication.instance()
+        if app:
+            app.quit()
+
+    def light():
+        pass  # Placeholder for wired/wifi RGB LED control
+
+    return {
+        "launch-steamlink": lambda: launch_steam_link_left(app_dir),
+        "home": home,
+        "quit": quit_app,
+        "light": light,
+    }
+
+
+def _hud_telemetry() -> dict:
+    """Per-child pid, running, paused, restarts, CPU and RSS (pushed to the page on request)."""
+    return get_supervisor().stats()
+
+
+# Cached HUD frame (hud_frame): dropped this long after the window is shown even without a paint report,
+# and a new one is grabbed this long after the page has loaded / painted
+_COVER_TIMEOUT_MS = 3000
+_FRAME_SETTLE_MS = 1500
+_HUD_BACKGROUND = "#222222"  # index.html body background
+
+
+class _FrozenPageSnapshot(QLabel):
+    """
+    Last frame of the HUD page, shown over the view while the page is frozen (a frozen page handles
+    no input). Taps on the sidebar buttons in the picture run their sambar:// action directly.
+    """
+
+    def __init__(self, parent, pixmap, links, on_action):
+        super().__init__(parent)
+        self.setPixmap(pixmap)
+        self._links = links  # [(QRect, host)]
+        self._on_action = on_action
+
+    def mousePressEvent(self, event):
+        pos = event.position().toPoint()
+        for rect, host in self._links:
+            if rect.contains(pos):
+                self._on_action(host)
+                return
+        super().mousePressEvent(event)
+
+
+class MainWindow(QMainWindow):
+    """Full-screen window showing the HUD: index.html in a web view, or NativeHud in low-power mode."""
+
+    def __init__(self):
+        super().__init__()
+        self.config = get_config()
+        self.hud_url = None
+        self.view = None
+        self.native_hud = None
+        self.slots: dict[str, EmbedSlot] = {}  # "left" / "right" regions other apps' windows are embedded in
+        self._overlay = False  # other apps' windows may go over ours (_set_overlay_mode)
+        self._covered: set[str] = set()  # HUD halves ("left", "right") other apps' windows are over
+        self._snapshot = None  # _FrozenPageSnapshot while the page is frozen
+        self._cover = None  # QLabel with the cached HUD frame until Chromium has painted
+        self._frame_due = False  # page (re)loaded: save a new cached frame once it has settled
+        self.init_ui()
+        if self.view is not None or self.native_hud is not None:
+            get_clock().subscribe(self._on_clock)
+
+    @boot_trace.traced("MainWindow.init_ui")
+    def init_ui(self):
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint
+            | Qt.WindowType.WindowStaysOnTopHint
+        )
+
+        desired_width = self.config.get("screen_width", 2560)
+        desired_height = self.config.get("screen_height", 720)
+        fit_to_screen = self.config.get("fit_to_screen", False)
+        self._effective_width, self._effective_height = get_effective_screen_size(
+            desired_width, desired_height, fit_to_screen
+        )
+        self.setFixedSize(self._effective_width, self._effective_height)
+        self.setGeometry(0, 0, self._effective_width, self._effective_height)
+
+        app_dir = get_app_dir()
+        index_path = os.path.join(app_dir, "index.html")
+        low_power = self.config.get("performance.low_power_mode", False)
+
+        if not low_power and not os.path.isfile(index_path):
+            err = QLabel(
+                f"index.html not found at:\n{index_path}\n\n"
+                "Run from the sambar_hud directory."
+            )
+            err.setStyleSheet("font-size: 18px; padding: 40px;")
+            self.setCentralWidget(err)
+            self.setWindowTitle("Sambar HUD - Error")
+            return
+
+        # Central container: full-size HUD view + left / right regions for embedded apps (X11 only)
+        central = QWidget(self)
+        central.setFixedSize(self._effective_width, self._effective_height)
+        ew, eh = self._effective_width, self._effective_height
+
+        actions = _hud_actions(self)
+        if low_power:
+            # Same sidebar, clock and background without a browser: Chromium is never started
+            self.native_hud = NativeHud(actions, central)
+            self.native_hud.setGeometry(0, 0, ew, eh)
+        else:
+            import hud_web
+            # index.html and its files come from memory: reloading the page (Home) doesn't touch the SD card
+            self._asset_store = hud_web.create_asset_store(app_dir, self)
+            self.hud_url = hud_web.hud_page_url(self._asset_store, self._hud_zoom())
+            self.bridge = HudBridge(actions, telemetry_source=_hud_telemetry, parent=self)
+            self.view = hud_web.create_hud_view(central, actions, self.bridge, self._asset_store)
+            self.view.setGeometry(0, 0, ew, eh)
+            self.view.setUrl(self.hud_url)
+            self.bridge.painted.connect(self._on_page_painted)
+
+        self.slots = {"left": EmbedSlot(central), "right": EmbedSlot(central)}
+        for frame in _FRAMES:
+            self.slots[frame.region].embedded.connect(frame.on_embedded)
+        self._update_slot_geometry(ew, eh)
+
+        self.setCentralWidget(central)
+        self.setWindowTitle("Sambar HUD")
+        self._apply_hud_zoom()
+        if self.view is not None:
+            self.view.loadFinished.connect(self._apply_hud_zoom)
+            self.view.loadFinished.connect(lambda ok: boot_trace.mark("hud_load_finished", ok=ok))
+            self.view.loadFinished.connect(lambda ok: self._apply_page_state())  # a reload starts uncovered
+            self.view.loadFinished.connect(self._on_page_loaded)
+            self._show_cover()  # Chromium paints nothing until the page has loaded and the window is shown
+        self._install_quit_shortcuts()
+
+    def _update_slot_geometry(self, w: int | None = None, h: int | None = None) -> None:
+        """Left slot: left half; right slot: right half up to the sidebar; full height. Uses actual window
+        size when None. Embedded windows follow their slot's size."""
+        if w is None or h is None:
+            r = self.geometry()
+            w, h = r.width(), r.height()
+        self.slots["left"].setGeometry(0, 0, w // 2, h)
+        self.slots["right"].setGeometry(w // 2, 0, w // 2 - _LIVI_SIDEBAR_WIDTH, h)
+
+    def _raise_slots(self) -> None:
+        """Embedded apps stay visible over the cached frame and the frozen-page snapshot."""
+        for slot in self.slots.values():
+            if slot.is_embedded():
+                slot.raise_()
+
+    def resizeEvent(self, event):
+        """When window is resized (e.g. fullscreen), update layout so embed holder uses actual full height."""
+        super().resizeEvent(event)
+        sz = event.size()
+        w, h = sz.width(), sz.height()
+        central = self.centralWidget()
+        if central and hasattr(central, "setFixedSize"):
+            central.setFixedSize(w, h)
+        if self.view is not None:
+            self.view.setGeometry(0, 0, w, h)
+        if self.native_hud is not None:
+            self.native_hud.setGeometry(0, 0, w, h)
+        if self.slots:
+            self._update_slot_geometry(w, h)
+        if self._snapshot is not None:
+            self._snapshot.setGeometry(0, 0, w, h)
+        if self._cover is not None:
+            self._cover.setGeometry(0, 0, w, h)
+
+    def _hud_zoom(self) -> float:
+        return assets.hud_zoom(self._effective_width, self._effective_height, self.config.get("fit_to_screen", False))
+
+    def _apply_hud_zoom(self) -> None:
+        """Scale the 2560x720 HUD to fit the window when fit_to_screen is True; else use 1:1 (no zoom)."""
+        if self.view is None and self.native_hud is None:
+            return
+        zoom = self._hud_zoom()
+        if self.view is not None:
+            self.view.setZoomFactor(zoom)
+        else:
+            self.native_hud.set_zoom(zoom)
+
+    def _install_quit_shortcuts(self) -> None:
+        """Ctrl+Q and Escape quit the application."""
+        app = QApplication.instance()
+        if app is None:
+            return
+        quit_fn = app.quit
+        QShortcut(QKeySequence.StandardKey.Quit, self).activated.connect(quit_fn)
+        QShortcut(QKeySequence(Qt.Key.Key_Escape), self).activated.connect(quit_fn)
+
+    def _keep_livi_on_top_if_shown(self) -> None:
+        """When our window gets focus (e.g. user tapped left), keep LIVI on top on the right so it doesn't disappear."""
+        if self.slots and self.slots["right"].is_embedded():
+            return  # LIVI is embedded; no separate window to raise
+        layout = _get_layout()
+        if layout is not None:
+            layout.request_pass()  # raises LIVI only if it actually ended up below us
+            return
+        wid = _get_livi_window_id()
+        if wid is None:
+            return
+        _set_livi_stays_above(wid)
+        _raise_livi_window(wid)
+
+    def focusInEvent(self, event):
+        """Re-raise LIVI when our window gets focus so CarPlay stays visible on the right."""
+        super().focusInEvent(event)
+        QTimer.singleShot(50, self._keep_livi_on_top_if_shown)
+
+    def restoreFullScreen(self) -> None:
+        """Restore fullscreen when Steam/LIVI layout is closed, on the same native window, and keep the HUD above."""
+        _set_overlay_mode(self, False)
+        self.setFixedSize(self._effective_width, self._effective_height)
+        self.setGeometry(0, 0, self._effective_width, self._effective_height)
+        if not (self.isVisible() and self.isFullScreen()):
+            self.showFullScreen()
+
+    def _do_home(self) -> None:
+        """Called after Home click (deferred): back above other apps' windows, reload only if needed, raise."""
+        # Steam Link is stopped or parked: render the left half again. LIVI stays on the right, so that
+        # half stays covered until stop_livi_session
+        self.set_region_covered("left", False)
+        self.restoreFullScreen()
+        # Only reload if we're not already showing the HUD (avoids transparent flash / layout glitch)
+        if self.hud_url is not None and self.view is not None:
+            try:
+                if self.view.url() != self.hud_url:
+                    self.view.setUrl(self.hud_url)
+            except Exception:
+                self.view.setUrl(self.hud_url)
+        self.raise_()
+        self.activateWindow()
+
+    def _apply_screen_size(self) -> None:
+        """Re-size the window from screen_width / screen_height / fit_to_screen; resizeEvent re-lays out the
+        view and the LIVI embed holder."""
+        self._effective_width, self._effective_height = get_effective_screen_size(
+            self.config.get("screen_width", 2560),
+            self.config.get("screen_height", 720),
+            self.config.get("fit_to_screen", False),
+        )
+        self.setFixedSize(self._effective_width, self._effective_height)
+        self.setGeometry(0, 0, self._effective_width, self._effective_height)
+        self._apply_hud_zoom()
+        self._drop_cover()  # cached for the old size
+        if self.view is not None:
+            self._frame_due = True
+            QTimer.singleShot(_FRAME_SETTLE_MS, self._save_frame_if_due)
+
+    def apply_config_changes(self, changes) -> None:
+        """config.yaml was edited (see config_watch): re-apply only what changed. LIVI is restarted only when
+        its mode or AppImage changed, or its Xephyr frame needs a different size. Settings read only at
+        start (_RESTART_KEYS) are reported as needing a restart."""
+        print("Config reloaded: " + ", ".join(f"{c.key}={c.new!r}" for c in changes))
+        keys = {c.key for c in changes}
+        pending = sorted(keys & _RESTART_KEYS)
+        if pending:
+            print("Restart required for " + ", ".join(pending))
+        supervisor = get_supervisor()
+        livi_running = supervisor.is_running(_LIVI_CHILD) or _LIVI_FRAME.is_running()
+        restart_livi = livi_running and bool(keys & _LIVI_RESTART_KEYS)
+        if keys & _SCREEN_KEYS:
+            self._apply_screen_size()
+            if _LIVI_FRAME.is_running():
+                restart_livi = restart_livi or _livi_frame_size(*_screen_size(self)) != _LIVI_FRAME.size
+            elif livi_running and not (self.slots and self.slots["right"].is_embedded()):
+                _apply_layout("livi", _livi_right_spec(*_screen_size(self)))
+        if "clock.timezone" in keys:
+            get_clock().set_timezone(self.config.get("clock.timezone"))
+        if restart_livi:
+            restart_livi_session(self)
+
+    def go_home(self):
+        if self.hud_url is not None and self.view is not None:
+            self.view.setUrl(self.hud_url)
+
+    def show_main(self):
+        self.showFullScreen()
+        self.raise_()
+        self.activateWindow()
+        _track_hud_window(self)
+        self._await_first_paint()
+
+    # ---- cached frame (hud_frame): shown until Chromium has painted ----
+
+    def _show_cover(self) -> None:
+        if self.view is None or self._cover is not None:
+            return
+        pixmap = hud_frame.load_frame(self._effective_width, self._effective_height)
+        if pixmap is None:
+            return
+        self._cover = QLabel(self.view.parentWidget())
+        self._cover.setPixmap(pixmap)
+        self._cover.setGeometry(self.view.geometry())
+        self._cover.show()
+        self._cover.raise_()
+        self._raise_slots()
+
+    def _await_first_paint(self) -> None:
+        """Window shown: drop the cover once the page reports a painted frame (or after a while regardless)."""
+        if self._cover is None:
+            return
+        cover = self._cover
+        self.bridge.request_paint_report()
+        QTimer.singleShot(_COVER_TIMEOUT_MS, lambda: self._drop_cover() if self._cover is cover else None)
+
+    def _on_page_painted(self) -> None:
+        if self.isVisible():
+            self._drop_cover()
+        QTimer.singleShot(_FRAME_SETTLE_MS, self._save_frame_if_due)
+
+    def _drop_cover(self) -> None:
+        if self._cover is not None:
+            self._cover.deleteLater()
+            self._cover = None
+
+    def _on_page_loaded(self, ok: bool) -> None:
+        if ok:
+            self._frame_due = True
+            QTimer.singleShot(_FRAME_SETTLE_MS, self._save_frame_if_due)
+
+    def _save_frame_if_due(self) -> None:
+        """Grab the page for the cache once it is on screen, uncovered and settled (fonts, van image)."""
+        if (not self._frame_due or self.view is None or not self.isVisible() or self._covered
+                or self._cover is not None or self._snapshot is not None):
+            return
+        import hud_web
+        self.view.page().runJavaScript(hud_web.CLOCK_RECT_JS, self._save_frame)
+
+    def _save_frame(self, clock_rect) -> None:
+        if not self._frame_due or self._covered or self._cover is not None or self._snapshot is not None:
+            return
+        self._frame_due = False
+        image = self.view.grab().toImage()
+        if clock_rect:
+            # Blank the clock: the cached frame is shown at a later time
+            zoom = self.view.zoomFactor() * image.devicePixelRatio()
+            x, y, w, h = (int(v * zoom) for v in clock_rect)
+            painter = QPainter(image)
+            painter.fillRect(x, y, w + 1, h + 1, QColor(_HUD_BACKGROUND))
+            painter.end()
+        hud_frame.save_frame(image, self._effective_width, self._effective_height)
+
+    def set_region_covered(self, region: str, covered: bool) -> None:
+        """Another app's window now covers (or no longer covers) the "left" or "right" half of the HUD."""
+        if covered:
+            self._covered.add(region)
+        else:
+            self._covered.discard(region)
+        self._apply_page_state()
+
+    def uncover_all(self) -> None:
+        self._covered.clear()
+        self._apply_page_state()
+
+    def _apply_page_state(self) -> None:
+        """
+        Covered halves get content-visibility: hidden in the page, so Chromium skips their style,
+        layout and paint (and the clock isn't pushed while its half is covered). With both halves covered
+        only the static sidebar is left: the page is then hidden and frozen (no rendering at all) behind
+        a snapshot of its last frame. The native HUD only needs the clock kept current.
+        """
+        left, right = "left" in self._covered, "right" in self._covered
+        if self.native_hud is not None:
+            if not left:
+                self._push_clock(get_clock().current())
+            return
+        if self.view is None:
+            return
+        if left and right:
+            self._freeze_page()
+            return
+        self._thaw_page()
+        self.bridge.set_mode("steamlink" if left else "home")
+        self.bridge.set_carplay_visible(right)
+        if not left:
+            self._push_clock(get_clock().current())
+
+    def _on_clock(self, reading) -> None:
+        if "left" not in self._covered:
+            self._push_clock(reading)
+
+    def _push_clock(self, reading) -> None:
+        if self.native_hud is not None:
+            self.native_hud.set_clock(reading.time_text, reading.date_text)
+        else:
+            self.bridge.set_clock(reading.time_text, reading.date_text)
+
+    def _freeze_page(self) -> None:
+        if self._snapshot is not None:
+            return
+        import hud_web  # loaded with the view already; not imported at all in low-power mode
+        # The snapshot needs to know where the sidebar buttons are; ask before freezing
+        self.view.page().runJavaScript(hud_web.SAMBAR_LINKS_JS, self._freeze_with_links)
+
+    def _freeze_with_links(self, links) -> None:
+        if self._snapshot is not None or not {"left", "right"} <= self._covered:
+            return  # uncovered again meanwhile
+        import hud_web
+        page = self.view.page()
+        zoom = self.view.zoomFactor()
+        hosts = []
+        for x, y, w, h, href in links or []:
+            rect = QRect(int(x * zoom), int(y * zoom), max(1, int(w * zoom)), max(1, int(h * zoom)))
+            hosts.append((rect, href.split("://", 1)[1].strip("/").lower()))
+        self._snapshot = _FrozenPageSnapshot(self.view.parentWidget(), self.view.grab(), hosts, page.handle_action)
+        self._snapshot.setGeometry(self.view.geometry())
+        self._snapshot.show()
+        self._snapshot.raise_()
+        self._raise_slots()
+        hud_web.set_page_frozen(page, True)
+
+    def _thaw_page(self) -> None:
+        if self._snapshot is None:
+            return
+        import hud_web
+        hud_web.set_page_frozen(self.view.page(), False)
+        # Keep the snapshot up until the page has had a moment to paint again
+        QTimer.singleShot(150, self._snapshot.deleteLater)
+        self._snapshot = None
+
+
+def start(app: QApplication, config: Config, splash: BootSplash) -> int:
+    """
+    Rest of boot, called by main() with the splash already painted: build the HUD window, run
+    the boot stages behind the splash and the event loop. Returns the application's exit code.
+    """
+    install_event_loop(app)
+    app.aboutToQuit.connect(stop_livi_session)
+    app.aboutToQuit.connect(get_supervisor().stop_all)
+
+    # MainWindow starts QtWebEngine and loads index.html while the splash is up
+    with boot_trace.span("MainWindow"):
+        main_window = MainWindow()
+    main_window.hide()
+
+    # Edits to config.yaml apply to the running HUD
+    relay = _ConfigRelay(main_window)
+    relay.changed.connect(main_window.apply_config_changes)
+    watcher = ConfigWatcher(config)
+    watcher.subscribe(relay.changed.emit)
+    app.aboutToQuit.connect(watcher.stop)
+
+    # Boot stages run in parallel behind the splash; it closes once the critical ones are done
+    boot = BootGraph(on_ready=splash.set_ready)
+    loop = asyncio.get_event_loop()
+    hud_loaded = loop.create_future()
+    if main_window.view is not None:
+        main_window.view.loadFinished.connect(lambda ok: hud_loaded.done() or hud_loaded.set_result(ok))
+        boot.add("hud", lambda: hud_loaded, critical=True)
+    boot.add("shown")
+    # Auto-open LIVI (CarPlay) and position it on the right half, leaving 88px for sidebar
+    # LIVI runs as a flow of its own (stopping it mustn't cancel boot); the splash waits for it to start
+    if config.get("carplay.livi_auto_launch", True):
+        livi = launch_livi_and_apply_layout(main_window)
+        boot.add("livi", lambda: livi.wait("livi"), critical=True)
+
+    def on_splash_finished():
+        splash.close()
+        main_window.show_main()
+        boot.set_done("shown")
+        if _livi_graph is not None:
+            _livi_graph.set_done("shown")  # the current launch: a restart during boot replaced livi
+
+    splash.on_finished = on_splash_finished  # its timers only fire once the event loop runs
+
+    async def run_boot():
+        await boot.run()
+        boot_trace.finish()
+
+    spawn(_BOOT_FLOW, run_boot())
+
+    return run_event_loop(app)
@@ -0,0 +1,127 @@
+"""
+QWebChannel bridge between the HUD page (index.html) and Sambar HUD.
+The page calls actions with sambarCall("home"), a Promise resolved when the action has run,
+instead of navigating to sambar://home. Actions run from the event loop, not inside a navigation
+callback. The app pushes state to the page as signals: which app has the left half (mode), whether
+CarPlay is visible, the clock and, on request, telemetry (child processes and sidebar latency). The
+page reports each action's tap-to-done time back, kept in latency_stats(), and reports when it has
+painted a frame (MainWindow keeps its cached frame up until then).
+"""
+
+import time
+from collections import deque
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+import boot_trace
+
+
+class HudBridge(QObject):
+    """Registered on the page's QWebChannel as "sambar". actions: {name: callable()}, shared with SambarWebPage."""
+
+    actionDone = pyqtSignal(int, "QVariantMap")  # request id, {"ok", "error", "handler_ms"}
+    modeChanged = pyqtSignal(str)  # "home" or the app on the left half, e.g. "steamlink"
+    carplayVisibleChanged = pyqtSignal(bool)
+    clockChanged = pyqtSignal(str, str)  # time, date
+    telemetry = pyqtSignal("QVariantMap")  # {"children": telemetry_source(), "latency": latency_stats()}
+    paintCheck = pyqtSignal()  # asks the page to call framePainted() once it has painted
+    painted = pyqtSignal()  # Python side: the page painted a frame
+
+    def __init__(self, actions: dict, telemetry_source=None, parent=None):
+        super().__init__(parent)
+        self._actions = actions
+        self._telemetry_source = telemetry_source
+        self._mode = "home"
+        self._carplay_visible = False
+        self._clock = None
+        self._telemetry_timer = QTimer(self)
+        self._telemetry_timer.timeout.connect(self._emit_telemetry)
+        self.latencies: dict[str, deque] = {}  # action -> recent tap-to-done times (ms)
+
+    # ---- state pushed to the page ----
+
+    def set_mode(self, mode: str) -> None:
+        if mode != self._mode:
+            self._mode = mode
+            self.modeChanged.emit(mode)
+
+    def set_carplay_visible(self, visible: bool) -> None:
+        if visible != self._carplay_visible:
+            self._carplay_visible = visible
+            self.carplayVisibleChanged.emit(visible)
+
+    def set_clock(self, time_text: str, date_text: str) -> None:
+        self._clock = (time_text, date_text)
+        self.clockChanged.emit(time_text, date_text)
+
+    def request_paint_report(self) -> None:
+        self.paintCheck.emit()
+
+    # ---- called from the page ----
+
+    @pyqtSlot()
+    def ready(self) -> None:
+        """The page has connected its handlers: send it the current state (it may have been reloaded)."""
+        self.modeChanged.emit(self._mode)
+        self.carplayVisibleChanged.emit(self._carplay_visible)
+        if self._clock is not None:
+            self.clockChanged.emit(*self._clock)
+
+    @pyqtSlot(int, str)
+    def invoke(self, request_id: int, name: str) -> None:
+        # Return to the page straight away; the action runs on the next loop iteration
+        QTimer.singleShot(0, lambda: self._run(request_id, name))
+
+    @pyqtSlot()
+    def framePainted(self) -> None:
+        self.painted.emit()
+
+    @pyqtSlot(str, float)
+    def reportLatency(self, name: str, ms: float) -> None:
+        samples = self.latencies.setdefault(name, deque(maxlen=50))
+        samples.append(ms)
+        if boot_trace.is_enabled():
+            print(f"HUD action {name}: {ms:.1f} ms tap to done (median {_median(samples):.1f} ms)")
+
+    def latency_stats(self) -> dict[str, dict]:
+        """{action: {"count", "median_ms", "max_ms"}} over the recent taps of each action."""
+        return {
+            name: {"count": len(samples), "median_ms": _median(samples), "max_ms": max(samples)}
+            for name, samples in self.latencies.items() if samples
+        }
+
+    @pyqtSlot(int)
+    def setTelemetryInterval(self, ms: int) -> None:
+        """Push telemetry every ms (0 stops it)."""
+        if ms > 0 and self._telemetry_source is not None:
+            self._telemetry_timer.start(ms)
+            self._emit_telemetry()
+        else:
+            self._telemetry_timer.stop()
+
+    # ---- internals ----
+
+    def _run(self, request_id: int, name: str) -> None:
+        start = time.monotonic()
+        result = {"ok": True, "error": ""}
+        action = self._actions.get(name)
+        if action is None:
+            result = {"ok": False, "error": f"unknown action {name!r}"}
+        else:
+            try:
+                action()
+            except Exception as e:
+                print(f"HUD action {name} failed: {e!r}")
+                result = {"ok": False, "error": repr(e)}
+        result["handler_ms"] = (time.monotonic() - start) * 1000.0
+        self.actionDone.emit(request_id, result)
+
+    def _emit_telemetry(self) -> None:
+        try:
+            self.telemetry.emit({"children": self._telemetry_source(), "latency": self.latency_stats()})
+        except Exception as e:
+            print(f"HUD telemetry failed: {e!r}")
+
+
+def _median(samples) -> float:
+    return sorted(samples)[len(samples) // 2]
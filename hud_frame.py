@@ -0,0 +1,43 @@
+"""
+Last rendered frame of the HUD page, cached per window size in ~/.cache/sambar_hud.
+MainWindow shows it natively while Chromium hasn't painted its first frame yet (at boot) instead
+of a black or transparent frame, and saves a new one after each settled page load. The clock is
+blanked out of the saved frame, so an old time is never shown.
+"""
+
+import os
+import threading
+
+from PyQt6.QtGui import QImage, QPixmap
+
+from config import CACHE_DIR
+
+
+def frame_path(width: int, height: int) -> str:
+    return os.path.join(CACHE_DIR, f"hud-frame-{width}x{height}.png")
+
+
+def load_frame(width: int, height: int) -> QPixmap | None:
+    """The cached frame for this window size, or None."""
+    path = frame_path(width, height)
+    if not os.path.isfile(path):
+        return None
+    pixmap = QPixmap(path)
+    return None if pixmap.isNull() else pixmap
+
+
+def save_frame(image: QImage, width: int, height: int) -> None:
+    """Write image as the frame for this size, on a background thread (PNG encoding is slow on a Pi)."""
+    path = frame_path(width, height)
+
+    def write():
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            if not image.save(tmp, "PNG"):
+                raise OSError("QImage.save failed")
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Could not cache HUD frame: {e}")
+
+    threading.Thread(target=write, name="hud-frame", daemon=True).start()
@@ -0,0 +1,118 @@
+"""
+Chromium HUD renderer: index.html in a QWebEngineView, talking to the app over hud_bridge.
+The page and its files are served from memory (asset_scheme). hud_app imports this only when
+the HUD is rendered by QtWebEngine; in low-power mode (native_hud) neither QtWebEngine nor
+Chromium is ever loaded.
+"""
+
+import os
+
+from PyQt6.QtCore import QUrl, QUrlQuery
+from PyQt6.QtGui import QImageReader
+from PyQt6.QtWebChannel import QWebChannel
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile, QWebEngineSettings
+from PyQt6.QtWebEngineWidgets import QWebEngineView
+
+import assets
+from asset_scheme import SCHEME, AssetStore, asset_url
+
+# Where the page's sambar:// links are, in CSS pixels: [[x, y, w, h, href], ...]
+SAMBAR_LINKS_JS = """
+Array.prototype.map.call(document.querySelectorAll('a[href^="sambar://"]'), function (a) {
+    var r = a.getBoundingClientRect();
+    return [r.left, r.top, r.width, r.height, a.getAttribute('href')];
+});
+"""
+
+# Where the clock is, in CSS pixels: [x, y, w, h] (blanked out of the cached frame)
+CLOCK_RECT_JS = """
+(function () {
+    var r = document.getElementById('sleep-clock').getBoundingClientRect();
+    return [r.left, r.top, r.width, r.height];
+})();
+"""
+
+
+class SambarWebPage(QWebEnginePage):
+    """Intercepts sambar:// URLs (fallback for when the page's web channel isn't up)."""
+
+    def __init__(self, profile, actions: dict, parent=None):
+        super().__init__(profile, parent)
+        self._actions = actions
+
+    def acceptNavigationRequest(self, url, nav_type, is_main_frame):
+        if not is_main_frame:
+            return True
+        if url.scheme() == "sambar":
+            self.handle_action(url.host().lower())
+            return False
+        return True
+
+    def handle_action(self, host: str) -> None:
+        """Run a sambar://<host> action (also used by the frozen page's snapshot, which has no live links)."""
+        action = self._actions.get(host)
+        if action is not None:
+            action()
+
+
+def create_asset_store(app_dir: str, parent=None) -> AssetStore:
+    """The app's HUD files, read into memory now."""
+    store = AssetStore(parent)
+    store.add_app_files(app_dir)
+    return store
+
+
+def hud_page_url(store: AssetStore, zoom: float) -> QUrl:
+    """index.html, told where the van image pre-scaled for this zoom is (assets) and its CSS size, so
+    Chromium neither decodes the full-size image nor scales it."""
+    url = QUrl(asset_url("index.html"))
+    box_w, box_h = assets.HUD_VAN_BOX
+    van = assets.scaled_path("van-3d.png", round(box_w * zoom), round(box_h * zoom), upscale=False)
+    name = f"assets/{os.path.basename(van)}" if van else None
+    if name is None or not store.add_file(name, van):
+        return url
+    size = QImageReader(van).size()
+    query = QUrlQuery()
+    query.addQueryItem("van", asset_url(name))
+    query.addQueryItem("vw", f"{size.width() / zoom:.2f}")
+    query.addQueryItem("vh", f"{size.height() / zoom:.2f}")
+    url.setQuery(query)
+    return url
+
+
+def create_hud_view(parent, actions: dict, bridge, store: AssetStore) -> QWebEngineView:
+    """The HUD view: a SambarWebPage running actions, with bridge registered on its web channel as "sambar",
+    and sambar-asset:// served from store (the scheme is registered at startup, in main.py)."""
+    profile = QWebEngineProfile.defaultProfile()
+    if profile.urlSchemeHandler(SCHEME) is None:
+        profile.installUrlSchemeHandler(SCHEME, store)
+    page = SambarWebPage(profile, actions, parent)
+    # index.html talks to us over a web channel (hud_bridge); sambar:// links remain the fallback
+    channel = QWebChannel(page)
+    channel.registerObject("sambar", bridge)
+    page.setWebChannel(channel)
+    view = QWebEngineView(parent)
+    view.setPage(page)
+    try:
+        s = view.settings()
+        s.setAttribute(QWebEngineSettings.WebAttribute.LocalStorageEnabled, False)
+        s.setAttribute(QWebEngineSettings.WebAttribute.PluginsEnabled, False)
+        s.setAttribute(QWebEngineSettings.WebAttribute.JavascriptCanOpenWindows, False)
+        # Reduce CPU/memory so CarPlay (LIVI) runs smoother on Pi
+        s.setAttribute(QWebEngineSettings.WebAttribute.DnsPrefetchEnabled, False)
+        s.setAttribute(QWebEngineSettings.WebAttribute.AutoLoadIconsForPage, False)
+        if hasattr(QWebEngineSettings.WebAttribute, "ScrollAnimatorEnabled"):
+            s.setAttribute(QWebEngineSettings.WebAttribute.ScrollAnimatorEnabled, False)
+    except Exception:
+        pass
+    return view
+
+
+def set_page_frozen(page: QWebEnginePage, frozen: bool) -> None:
+    """Freeze (no rendering, no timers) or resume the page. Chromium only freezes hidden pages."""
+    if frozen:
+        page.setVisible(False)
+        page.setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
+    else:
+        page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+        page.setVisible(True)
@@ -0,0 +1,245 @@
+"""
+Declarative window layout for Sambar HUD.
+Callers say where each window role should be (LIVI on the right half minus the sidebar,
+Steam Link on the left half, ...), whether it stays above the HUD and whether it is decorated.
+The controller compares that with what the X11 window tracker reports and sends only the
+requests needed to close the gap. Passes are debounced, so a burst of X events (e.g. LIVI
+resizing itself while it starts) produces one correction instead of a raise/move storm.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+
+# States that stop a window from being moved/resized to an explicit geometry
+_MAXIMIZED_STATES = frozenset(("maximized_vert", "maximized_horz", "fullscreen"))
+
+
+class WindowSpec:
+    """Desired state of one role. None (or False for raised) means "don't care"."""
+
+    __slots__ = ("x", "y", "width", "height", "above", "undecorated", "skip_taskbar", "raised")
+
+    def __init__(self, x=None, y=None, width=None, height=None, above=None, undecorated=None,
+                 skip_taskbar=None, raised=False):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.above = above
+        self.undecorated = undecorated
+        self.skip_taskbar = skip_taskbar
+        self.raised = raised
+
+    @property
+    def geometry(self) -> tuple | None:
+        if None in (self.x, self.y, self.width, self.height):
+            return None
+        return (self.x, self.y, self.width, self.height)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"WindowSpec({fields})"
+
+
+class LayoutOps(ABC):
+    """
+    Backend that performs window requests. Window ids are wmctrl-style hex strings.
+    flush() is called once at the end of each pass so backends can batch.
+    """
+
+    @abstractmethod
+    def undecorate(self, wid: str) -> None: ...
+
+    @abstractmethod
+    def remove_states(self, wid: str, states) -> None: ...
+
+    @abstractmethod
+    def move_resize(self, wid: str, x: int, y: int, width: int, height: int) -> None: ...
+
+    @abstractmethod
+    def add_states(self, wid: str, states) -> None: ...
+
+    @abstractmethod
+    def raise_window(self, wid: str) -> None: ...
+
+    def flush(self) -> None:
+        pass
+
+
+def plan(info, spec: WindowSpec, raised_ok: bool | None = True) -> list[tuple]:
+    """
+    Requests needed to bring the window described by info (x11_windows.WindowInfo) to spec.
+    Order matters: decorations go first so the geometry that follows is the full client area,
+    and maximized/fullscreen has to be dropped before the WM accepts an explicit geometry.
+    raised_ok: whether the window is already above the HUD (None = unknown, treated as ok).
+    """
+    steps = []
+    if spec.undecorated and info.decorated:
+        steps.append(("undecorate",))
+    geometry = spec.geometry
+    if geometry is not None:
+        blocking = sorted(info.states & _MAXIMIZED_STATES)
+        if blocking:
+            steps.append(("remove_states", tuple(blocking)))
+        if (info.x, info.y, info.width, info.height) != geometry:
+            steps.append(("move_resize",) + geometry)
+    missing = []
+    if spec.above and "above" not in info.states:
+        missing.append("above")
+    if spec.skip_taskbar:
+        missing.extend(s for s in ("skip_taskbar", "skip_pager") if s not in info.states)
+    if missing:
+        steps.append(("add_states", tuple(missing)))
+    if spec.raised and raised_ok is False:
+        steps.append(("raise",))
+    return steps
+
+
+def apply_steps(ops: LayoutOps, wid: str, steps) -> None:
+    for step in steps:
+        name, args = step[0], step[1:]
+        if name == "undecorate":
+            ops.undecorate(wid)
+        elif name == "remove_states":
+            ops.remove_states(wid, args[0])
+        elif name == "move_resize":
+            ops.move_resize(wid, *args)
+        elif name == "add_states":
+            ops.add_states(wid, args[0])
+        elif name == "raise":
+            ops.raise_window(wid)
+
+
+def apply_blind(ops: LayoutOps, wid: str, spec: WindowSpec) -> None:
+    """Apply every part of spec once without knowing the current state (no window tracker available)."""
+    steps = []
+    if spec.undecorated:
+        steps.append(("undecorate",))
+    if spec.geometry is not None:
+        steps.append(("remove_states", tuple(sorted(_MAXIMIZED_STATES))))
+        steps.append(("move_resize",) + spec.geometry)
+    states = (("above",) if spec.above else ()) + (("skip_taskbar", "skip_pager") if spec.skip_taskbar else ())
+    if states:
+        steps.append(("add_states", states))
+    if spec.raised:
+        steps.append(("raise",))
+    apply_steps(ops, wid, steps)
+    ops.flush()
+
+
+class LayoutController:
+    """
+    Keeps windows with a spec'd role in their desired state.
+    A pass runs debounce seconds after the last relevant change (spec set, window of a managed
+    role changed, stacking changed). A window that keeps fighting back (app forcing its own size)
+    is corrected at most max_corrections times per correction_window seconds.
+    """
+
+    def __init__(self, tracker, ops: LayoutOps, debounce: float = 0.12,
+                 max_corrections: int = 4, correction_window: float = 5.0):
+        self.tracker = tracker
+        self._index = tracker.index
+        self._ops = ops
+        self._debounce = debounce
+        self._max_corrections = max_corrections
+        self._correction_window = correction_window
+        self._specs: dict[str, WindowSpec] = {}
+        self._corrections: dict[int, list[float]] = {}
+        self._cond = threading.Condition()
+        self._due: float | None = None
+        self._hud_wid: int | None = None
+        tracker.subscribe(self._is_managed, self._on_window_changed)
+        tracker.on_stacking_changed(self.request_pass)
+        self._thread = threading.Thread(target=self._run, name="layout-controller", daemon=True)
+        self._thread.start()
+
+    # ---- public API (any thread) ----
+
+    def set_spec(self, role: str, spec: WindowSpec) -> None:
+        with self._cond:
+            self._specs[role] = spec
+        self.request_pass()
+
+    def clear(self, role: str) -> None:
+        with self._cond:
+            self._specs.pop(role, None)
+
+    def spec(self, role: str) -> WindowSpec | None:
+        with self._cond:
+            return self._specs.get(role)
+
+    def set_hud_window(self, wid: int | None) -> None:
+        """Our own top-level window (QWidget.winId()); raised specs are checked against it."""
+        with self._cond:
+            self._hud_wid = wid
+        self.request_pass()
+
+    def request_pass(self, delay: float | None = None) -> None:
+        """Schedule a reconcile pass (coalesced with any pass already pending)."""
+        due = time.monotonic() + (self._debounce if delay is None else delay)
+        with self._cond:
+            if self._due is None or due < self._due:
+                self._due = due
+                self._cond.notify()
+
+    def reconcile_now(self) -> int:
+        """Run one pass synchronously; returns the number of requests sent."""
+        with self._cond:
+            specs = dict(self._specs)
+            hud_wid = self._hud_wid
+        sent = 0
+        retry = None
+        now = time.monotonic()
+        for role, spec in specs.items():
+            for info in self._index.all_by_role(role):
+                if not info.mapped:
+                    continue
+                raised_ok = True
+                if spec.raised and hud_wid is not None:
+                    raised_ok = self._index.is_stacked_above(info.wid, hud_wid)
+                steps = plan(info, spec, raised_ok)
+                if not steps:
+                    continue
+                recent = [t for t in self._corrections.get(info.wid, ()) if now - t < self._correction_window]
+                if len(recent) >= self._max_corrections:
+                    # The window keeps undoing our changes; try again once the window has passed
+                    retry = self._correction_window - (now - recent[0])
+                    continue
+                recent.append(now)
+                self._corrections[info.wid] = recent
+                apply_steps(self._ops, info.hex_id, steps)
+                sent += len(steps)
+        if sent:
+            self._ops.flush()
+        if retry is not None:
+            self.request_pass(max(retry, self._debounce))
+        return sent
+
+    # ---- internals ----
+
+    def _is_managed(self, info) -> bool:
+        roles = self._index.roles_of(info.wid)
+        with self._cond:
+            return info.wid == self._hud_wid or any(role in self._specs for role in roles)
+
+    def _on_window_changed(self, info) -> None:
+        if not info.mapped:
+            # Unmapped (X unmaps a window before destroying it): passes skip it, so its history can go
+            self._corrections.pop(info.wid, None)
+        self.request_pass()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._due is None:
+                    self._cond.wait()
+                wait = self._due - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                self._due = None
+            try:
+                self.reconcile_now()
+            except Exception as e:
+                print(f"Layout pass failed: {e}")
@@ -0,0 +1,265 @@
+"""
+Native HUD renderer for performance.low_power_mode.
+Draws what index.html shows (background, sleep clock and van on the left, the CarPlay placeholder
+on the right, the sidebar buttons) with QPainter, so no QtWebEngine / Chromium process is started.
+Everything but the clock is drawn once per size into a pixmap; a clock tick repaints only the
+clock. The buttons run the same actions as the page's sambar:// links (hud_app._hud_actions).
+Sizes are the page's CSS pixels, scaled like the web view's zoom.
+"""
+
+from PyQt6.QtCore import QByteArray, QRectF, Qt
+from PyQt6.QtGui import QColor, QFont, QFontMetricsF, QPainter, QPen, QPixmap
+from PyQt6.QtSvg import QSvgRenderer
+from PyQt6.QtWidgets import QWidget
+
+import assets
+
+# Layout of index.html, in CSS pixels
+PANEL_WIDTH = 1280
+SIDEBAR_WIDTH = 88
+
+_BACKGROUND = QColor("#222222")
+_SIDEBAR = QColor(0, 0, 0, 191)
+_SIDEBAR_BORDER = QColor(255, 255, 255, 38)
+_BUTTON = QColor(255, 255, 255, 31)
+_BUTTON_PRESSED = QColor(255, 255, 255, 46)  # over _BUTTON: rgba(255,255,255,0.3) like :active
+_BUTTON_BORDER = QColor(255, 255, 255, 64)
+_LABEL = QColor(255, 255, 255, 204)
+_PLACEHOLDER_TITLE = QColor(255, 255, 255, 230)
+_PLACEHOLDER_TEXT = QColor(255, 255, 255, 166)
+
+_SIDEBAR_PADDING = 24
+_BUTTON_SIZE = 56
+_ICON_SIZE = 28
+_LABEL_GAP = 2
+_CLOCK_GAP = 24
+
+_PLACEHOLDER = (
+    "CarPlay",
+    "Connect your Carlinkit dongle and run LIVI (or your CarPlay host) to use CarPlay on this side. "
+    "See CARPLAY_SETUP.md.",
+)
+
+# (action, label, SVG path in a 24x24 box, at the top / bottom of the sidebar); keep in sync with index.html
+_BUTTONS = (
+    ("launch-steamlink", "Steam", "top",
+     "M11.979 0C5.678 0 .511 4.86.022 11.037l4.432 2.164a3.2 3.2 0 0 1 1.9-.616 3.2 3.2 0 0 1 3.2 3.2 3.2 3.2 0 "
+     "0 1-3.2 3.2 3.2 3.2 0 0 1-1.9-.616L.436 15.27C1.862 20.307 6.486 24 11.979 24c6.627 0 11.999-5.373 "
+     "11.999-12S18.606 0 11.979 0zM7.54 18.21l-1.93-.92a3.2 3.2 0 0 0 1.15-2.45 3.2 3.2 0 0 0-3.2-3.2 3.2 3.2 "
+     "0 0 0-1.15 6.37l1.93.92a1.6 1.6 0 1 1 0 3.2 1.6 1.6 0 0 1 0-3.2zm2.44-6.4a1.6 1.6 0 1 1 0-3.2 1.6 1.6 0 "
+     "0 1 0 3.2z"),
+    ("quit", "Power off", "bottom",
+     "M13 3h-2v10h2V3zm4.83 2.17l-1.42 1.42C17.99 7.86 19 9.81 19 12c0 3.87-3.13 7-7 7s-7-3.13-7-7c0-2.19 "
+     "1.01-4.14 2.58-5.42L6.17 5.17C4.23 6.82 3 9.78 3 12c0 4.97 4.03 9 9 9s9-4.03 9-9c0-2.22-1.23-5.18-3.17-6.83z"),
+)
+
+
+def _font(pixel_size: int) -> QFont:
+    font = QFont("Lexend Deca")
+    font.setStyleHint(QFont.StyleHint.SansSerif)
+    font.setPixelSize(pixel_size)
+    font.setWeight(QFont.Weight.DemiBold)
+    return font
+
+
+def _icon(path: str) -> QSvgRenderer:
+    svg = f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24"><path fill="#ffffff" d="{path}"/></svg>'
+    return QSvgRenderer(QByteArray(svg.encode()))
+
+
+class NativeHud(QWidget):
+    """The HUD without a browser. actions: {name: callable()}, as for SambarWebPage."""
+
+    def __init__(self, actions: dict, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self._actions = actions
+        self._zoom = 1.0
+        self._clock_text = "--:--"
+        self._pressed = None  # action of the button held down
+        self._static = None  # QPixmap of everything but the clock, for the current size
+        self._clock_font = _font(72)
+        self._label_font = _font(10)
+        self._van = None  # van-3d.png pre-scaled for the current zoom (assets); None if missing
+        self._van_zoom = None
+        self._icons = {name: _icon(path) for name, _label, _end, path in _BUTTONS}
+
+    # ---- state ----
+
+    def set_zoom(self, zoom: float) -> None:
+        if zoom != self._zoom:
+            self._zoom = zoom
+            self._static = None
+            self.update()
+
+    def set_clock(self, time_text: str, date_text: str) -> None:
+        if time_text != self._clock_text:
+            self._clock_text = time_text
+            self.update(self._to_device(self._clock_rect()).toAlignedRect())
+
+    # ---- layout, in page pixels ----
+
+    def _page_size(self) -> tuple[float, float]:
+        return self.width() / self._zoom, self.height() / self._zoom
+
+    def _to_device(self, rect: QRectF) -> QRectF:
+        z = self._zoom
+        return QRectF(rect.x() * z, rect.y() * z, rect.width() * z, rect.height() * z)
+
+    def _van_pixmap(self) -> QPixmap | None:
+        """The van at the size it is drawn, so painting it scales nothing (index.html hides a missing image too)."""
+        if self._van_zoom != self._zoom:
+            self._van_zoom = self._zoom
+            box_w, box_h = assets.HUD_VAN_BOX
+            self._van = assets.scaled_pixmap("van-3d.png", round(box_w * self._zoom), round(box_h * self._zoom),
+                                             upscale=False)
+        return self._van
+
+    def _van_size(self) -> tuple[float, float]:
+        van = self._van_pixmap()
+        if van is None:
+            return 0.0, 0.0
+        return van.width() / self._zoom, van.height() / self._zoom
+
+    def _left_column(self) -> tuple[QRectF, QRectF | None]:
+        """Clock and van, centred together in the left panel."""
+        _w, page_h = self._page_size()
+        clock_h = QFontMetricsF(self._clock_font).height()
+        van_w, van_h = self._van_size()
+        total = clock_h + (_CLOCK_GAP + van_h if van_h else 0)
+        top = (page_h - total) / 2
+        clock = QRectF(0, top, PANEL_WIDTH, clock_h)
+        if not van_h:
+            return clock, None
+        return clock, QRectF((PANEL_WIDTH - van_w) / 2, top + clock_h + _CLOCK_GAP, van_w, van_h)
+
+    def _clock_rect(self) -> QRectF:
+        return self._left_column()[0]
+
+    def _button_rects(self) -> list[tuple[str, str, QRectF, QRectF]]:
+        """[(action, label, button rect, label rect)] down the sidebar."""
+        page_w, page_h = self._page_size()
+        label_h = QFontMetricsF(self._label_font).height()
+        item_h = _BUTTON_SIZE + _LABEL_GAP + label_h
+        center_x = page_w - SIDEBAR_WIDTH / 2
+        rects = []
+        for name, label, end, _path in _BUTTONS:
+            top = _SIDEBAR_PADDING if end == "top" else page_h - _SIDEBAR_PADDING - item_h
+            button = QRectF(center_x - _BUTTON_SIZE / 2, top, _BUTTON_SIZE, _BUTTON_SIZE)
+            text = QRectF(page_w - SIDEBAR_WIDTH, top + _BUTTON_SIZE + _LABEL_GAP, SIDEBAR_WIDTH, label_h)
+            rects.append((name, label, button, text))
+        return rects
+
+    # ---- painting ----
+
+    def _static_layer(self) -> QPixmap:
+        """Background, van, placeholder and sidebar, drawn once per size and zoom."""
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(max(1, round(self.width() * dpr)), max(1, round(self.height() * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(_BACKGROUND)
+        painter = QPainter(pixmap)
+        painter.setRenderHints(QPainter.RenderHint.Antialiasing
+                               | QPainter.RenderHint.TextAntialiasing
+                               | QPainter.RenderHint.SmoothPixmapTransform)
+        painter.scale(self._zoom, self._zoom)
+        page_w, page_h = self._page_size()
+
+        _clock, van = self._left_column()
+        if van is not None:
+            painter.drawPixmap(van, self._van, QRectF(self._van.rect()))
+
+        # Right panel: CarPlay placeholder, centred
+        title, text = _PLACEHOLDER
+        title_font, text_font = _font(24), _font(14)
+        flags = Qt.AlignmentFlag.AlignHCenter.value | Qt.TextFlag.TextWordWrap.value
+        painter.setFont(text_font)
+        text_rect = painter.boundingRect(QRectF(0, 0, 360, page_h), flags, text)
+        painter.setFont(title_font)
+        title_rect = painter.boundingRect(QRectF(0, 0, PANEL_WIDTH, page_h), flags, title)
+        top = (page_h - title_rect.height() - 12 - text_rect.height()) / 2
+        painter.setPen(_PLACEHOLDER_TITLE)
+        painter.drawText(QRectF(PANEL_WIDTH, top, PANEL_WIDTH, title_rect.height()), flags, title)
+        painter.setFont(text_font)
+        painter.setPen(_PLACEHOLDER_TEXT)
+        painter.drawText(QRectF(PANEL_WIDTH + (PANEL_WIDTH - 360) / 2, top + title_rect.height() + 12,
+                                360, text_rect.height()), flags, text)
+
+        # Sidebar, at the right edge
+        painter.fillRect(QRectF(page_w - SIDEBAR_WIDTH, 0, SIDEBAR_WIDTH, page_h), _SIDEBAR)
+        painter.fillRect(QRectF(page_w - SIDEBAR_WIDTH, 0, 1, page_h), _SIDEBAR_BORDER)
+        painter.setFont(self._label_font)
+        for name, label, button, label_rect in self._button_rects():
+            self._paint_button(painter, button, _BUTTON)
+            icon_rect = QRectF(button.center().x() - _ICON_SIZE / 2, button.center().y() - _ICON_SIZE / 2,
+                               _ICON_SIZE, _ICON_SIZE)
+            self._icons[name].render(painter, icon_rect)
+            painter.setPen(_LABEL)
+            painter.drawText(label_rect, Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, label)
+        painter.end()
+        return pixmap
+
+    @staticmethod
+    def _paint_button(painter: QPainter, rect: QRectF, fill: QColor) -> None:
+        painter.setPen(QPen(_BUTTON_BORDER, 1))
+        painter.setBrush(fill)
+        painter.drawEllipse(rect.adjusted(0.5, 0.5, -0.5, -0.5))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+
+    def paintEvent(self, event):
+        if self._static is None:
+            self._static = self._static_layer()
+        painter = QPainter(self)
+        dirty = QRectF(event.rect())
+        dpr = self._static.devicePixelRatio()
+        painter.drawPixmap(dirty, self._static,
+                           QRectF(dirty.x() * dpr, dirty.y() * dpr, dirty.width() * dpr, dirty.height() * dpr))
+        painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.TextAntialiasing)
+        painter.scale(self._zoom, self._zoom)
+        painter.setFont(self._clock_font)
+        painter.setPen(Qt.GlobalColor.white)
+        painter.drawText(self._clock_rect(), Qt.AlignmentFlag.AlignCenter, self._clock_text)
+        button = self._button_rect(self._pressed)
+        if button is not None:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(_BUTTON_PRESSED)
+            painter.drawEllipse(button)
+        painter.end()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._static = None
+
+    # ---- input ----
+
+    def _button_rect(self, name: str | None) -> QRectF | None:
+        for action, _label, button, _text in self._button_rects():
+            if action == name:
+                return button
+        return None
+
+    def _button_at(self, pos) -> str | None:
+        x, y = pos.x() / self._zoom, pos.y() / self._zoom
+        for name, _label, button, _text in self._button_rects():
+            if button.contains(x, y):
+                return name
+        return None
+
+    def _set_pressed(self, name: str | None) -> None:
+        if name != self._pressed:
+            for button in (self._button_rect(self._pressed), self._button_rect(name)):
+                if button is not None:
+                    self.update(self._to_device(button).toAlignedRect().adjusted(-1, -1, 1, 1))
+            self._pressed = name
+
+    def mousePressEvent(self, event):
+        self._set_pressed(self._button_at(event.position()))
+
+    def mouseReleaseEvent(self, event):
+        name = self._pressed
+        self._set_pressed(None)
+        # Like a link: the action runs when the tap ends on the button it started on
+        if name is not None and self._button_at(event.position()) == name:
+            action = self._actions.get(name)
+            if action is not None:
+                action()
@@ -0,0 +1,99 @@
+"""
+Parked apps for Sambar HUD. An app the user leaves (Home, another entertainment mode) is hidden by
+its caller and SIGSTOPped here instead of being stopped, then continued when they come back, so
+returning to Steam Link is instant instead of a cold start, a new handshake with the host PC and
+window placement again. Parked apps keep their memory: while any are parked, available memory is
+checked every few seconds, and when it drops below performance.park_min_available_mb the
+longest-parked app is evicted (stopped), one per check, until there is enough again.
+"""
+
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+
+from process_supervisor import get_supervisor
+
+_CHECK_INTERVAL_MS = 5000
+DEFAULT_MIN_AVAILABLE_MB = 200
+
+
+def available_memory_mb() -> int | None:
+    """MemAvailable from /proc/meminfo in MB, or None where there is no such file."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class Parking(QObject):
+    """Parked supervisor children by name. GUI thread only; eviction callbacks run there too."""
+
+    def __init__(self, min_available_mb: int = DEFAULT_MIN_AVAILABLE_MB, parent=None):
+        super().__init__(parent)
+        self.min_available_mb = min_available_mb
+        self._parked: dict[str, tuple] = {}  # name -> (parked at, on_evict)
+        self._timer = QTimer(self)
+        self._timer.setInterval(_CHECK_INTERVAL_MS)
+        self._timer.timeout.connect(self.check)
+
+    def park(self, name: str, on_evict=None) -> bool:
+        """SIGSTOP child name. on_evict() is called instead of stopping it when memory runs low (it should
+        stop the child and tidy up after it). False if the child isn't running."""
+        if not get_supervisor().pause(name):
+            return False
+        self._parked[name] = (time.monotonic(), on_evict)
+        self._timer.start()
+        self.check()  # parking with little memory left
+        return True
+
+    def resume(self, name: str | None) -> bool:
+        """Continue a parked child. False if it wasn't parked (never, or evicted meanwhile) or has exited."""
+        if self._parked.pop(name, None) is None:
+            return False
+        self._stop_if_idle()
+        return get_supervisor().resume(name)
+
+    def forget(self, name: str) -> None:
+        """The child is being stopped anyway (the supervisor continues it so it can exit)."""
+        self._parked.pop(name, None)
+        self._stop_if_idle()
+
+    def is_parked(self, name: str) -> bool:
+        return name in self._parked
+
+    def check(self) -> None:
+        """Evict the longest-parked app when available memory is below the minimum. One per check: the
+        stopped app frees its memory only once it has exited, so the next check sees whether that was enough."""
+        supervisor = get_supervisor()
+        for name in [n for n in self._parked if not supervisor.is_running(n)]:
+            del self._parked[name]  # exited or stopped elsewhere meanwhile
+        available = available_memory_mb()
+        if self._parked and available is not None and available < self.min_available_mb:
+            name = min(self._parked, key=lambda n: self._parked[n][0])
+            _since, on_evict = self._parked.pop(name)
+            print(f"Low memory ({available} MB available): stopping parked {name}")
+            if on_evict is not None:
+                on_evict()
+            else:
+                supervisor.stop(name)
+        self._stop_if_idle()
+
+    def _stop_if_idle(self) -> None:
+        if not self._parked:
+            self._timer.stop()
+
+
+_parking: Parking | None = None
+
+
+def get_parking() -> Parking:
+    """The app-wide parking (GUI thread only; created on first use, threshold from the config)."""
+    global _parking
+    if _parking is None:
+        from config import get_config
+        _parking = Parking(get_config().get("performance.park_min_available_mb", DEFAULT_MIN_AVAILABLE_MB))
+    return _parking
@@ -0,0 +1,364 @@
+"""
+Child process supervisor for Sambar HUD.
+Every external program we start (LIVI, the Xephyr frames, Steam Link, the AirPlay receiver,
+capture pipelines) is owned here. Each child runs in its own session, so its process group
+holds everything it spawns (Electron helpers, pw-play, sudo'd receivers) and stopping the
+child stops all of them. Exits are noticed through pidfds, with one thread blocking in select
+instead of polling, and reaped straight away. Children that crash can be restarted with
+exponential backoff. Per-child CPU and RSS come from psutil when it is installed.
+"""
+
+import os
+import select
+import signal
+import subprocess
+import threading
+import time
+
+_psutil = None  # imported by _get_psutil() on the first stats() call; False if it is not installed
+
+
+class Child:
+    """One supervised program. popen is the current process and is replaced on every restart."""
+
+    __slots__ = ("name", "argv", "env", "cwd", "restart", "backoff", "pass_fds", "popen", "started",
+                 "restarts", "failures", "stopping", "paused", "timer", "_ps")
+
+    def __init__(self, name: str, argv: list, env: dict | None, cwd: str | None, restart: bool,
+                 backoff: float | None = None, pass_fds=()):
+        self.name = name
+        self.argv = argv
+        self.env = env
+        self.cwd = cwd
+        self.restart = restart
+        self.backoff = backoff  # first restart delay; None = the supervisor's
+        self.pass_fds = tuple(pass_fds)  # inherited by every run, so must stay open while the child is supervised
+        self.popen = None
+        self.started = 0.0
+        self.restarts = 0
+        self.failures = 0  # consecutive crashes, drives the backoff
+        self.stopping = False
+        self.paused = False  # SIGSTOPped by pause()
+        self.timer = None
+        self._ps = {}  # pid -> psutil.Process, kept so cpu_percent() has a previous sample
+
+    @property
+    def pid(self) -> int | None:
+        return self.popen.pid if self.popen is not None else None
+
+    @property
+    def running(self) -> bool:
+        return self.popen is not None and self.popen.returncode is None
+
+    def __repr__(self):
+        return f"Child({self.name!r}, pid={self.pid}, running={self.running}, restarts={self.restarts})"
+
+
+def _signal_group(pgid: int, sig: int) -> None:
+    """Signal a child's whole process group; a group that is already gone is fine. A group we may not
+    signal (e.g. a child that became root through sudo) is logged: its owner has to stop it as root."""
+    try:
+        os.killpg(pgid, sig)
+    except ProcessLookupError:
+        pass
+    except PermissionError:
+        print(f"No permission to send {signal.Signals(sig).name} to process group {pgid}")
+
+
+class ProcessSupervisor:
+    """
+    Owns children by name. start() replaces any running child with the same name.
+    restart=True children that exit non-zero (or die from a signal) are started again after
+    backoff, 2*backoff, 4*backoff ... capped at max_backoff. The delay goes back to backoff once a run
+    has lasted stable_after seconds. A clean exit (code 0, e.g. the user quit Steam Link) is final.
+    """
+
+    def __init__(self, backoff: float = 1.0, max_backoff: float = 60.0, stable_after: float = 30.0):
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._stable_after = stable_after
+        self._lock = threading.RLock()
+        self._children: dict[str, Child] = {}
+        self._pidfds: dict[int, tuple] = {}  # pidfd -> (child, popen)
+        self._exiting: dict[int, object] = {}  # pid -> popen, stopped but not exited yet
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_w, False)
+        self._thread = threading.Thread(target=self._run, name="process-supervisor", daemon=True)
+        self._thread.start()
+
+    # ---- public API (any thread) ----
+
+    def start(self, name: str, argv, env: dict | None = None, cwd: str | None = None,
+              restart: bool = False, backoff: float | None = None, pass_fds=()) -> Child:
+        """Start argv as child name. backoff overrides the first restart delay for this child (e.g. an
+        app whose X server is already up can come back at once). pass_fds are kept open in the child
+        (e.g. an X server's -displayfd). Raises FileNotFoundError / PermissionError like Popen."""
+        self.stop(name)
+        child = Child(name, list(argv), env, cwd, restart, backoff, pass_fds)
+        self._spawn(child)
+        with self._lock:
+            self._children[name] = child
+        return child
+
+    def stop(self, name: str, timeout: float = 3.0, wait: bool = False) -> bool:
+        """
+        SIGTERM the child's process group, SIGKILL it if it is still there after timeout. Returns at once:
+        the exit is reaped by the pidfd thread and the SIGKILL sent from a timer, so a caller on the GUI
+        thread never waits for a child to shut down. wait=True blocks until it is gone (quitting).
+        Returns False if there was no such child.
+        """
+        with self._lock:
+            child = self._children.pop(name, None)
+            if child is None:
+                return False
+            child.stopping = True
+            if child.timer is not None:
+                child.timer.cancel()
+                child.timer = None
+            popen = child.popen
+        if popen is None:
+            return True
+        _signal_group(popen.pid, signal.SIGTERM)
+        if child.paused:
+            _signal_group(popen.pid, signal.SIGCONT)  # a stopped process only sees SIGTERM once continued
+        if wait:
+            self._reap(popen, timeout)
+            return True
+        with self._lock:
+            if popen.returncode is None:
+                self._exiting[popen.pid] = popen
+                child.timer = threading.Timer(timeout, self._kill_if_alive, (popen,))
+                child.timer.daemon = True
+                child.timer.start()
+        return True
+
+    def pause(self, name: str) -> bool:
+        """SIGSTOP the child's process group (an app parked out of sight keeps its state but uses no CPU).
+        False if it isn't running."""
+        with self._lock:
+            child = self._children.get(name)
+            if child is None or not child.running:
+                return False
+            child.paused = True
+            pid = child.popen.pid
+        _signal_group(pid, signal.SIGSTOP)
+        return True
+
+    def resume(self, name: str) -> bool:
+        """SIGCONT a paused child's process group. False if it isn't running."""
+        with self._lock:
+            child = self._children.get(name)
+            if child is None or not child.running:
+                return False
+            child.paused = False
+            pid = child.popen.pid
+        _signal_group(pid, signal.SIGCONT)
+        return True
+
+    def stop_all(self, timeout: float = 3.0) -> None:
+        """Stop every child and wait until they are gone, including those stop() is still shutting down."""
+        with self._lock:
+            names = list(self._children)
+        for name in reversed(names):  # children started later (e.g. LIVI) before their frames
+            self.stop(name, timeout, wait=True)
+        with self._lock:
+            exiting = list(self._exiting.values())
+        for popen in exiting:
+            self._reap(popen, timeout)
+
+    def get(self, name: str) -> Child | None:
+        with self._lock:
+            return self._children.get(name)
+
+    def pid(self, name: str) -> int | None:
+        child = self.get(name)
+        return child.pid if child is not None else None
+
+    def is_running(self, name: str) -> bool:
+        child = self.get(name)
+        return child is not None and child.running
+
+    def owns(self, name: str, pid: int | None) -> bool:
+        """Whether pid is running child name or something it spawned (a process in its group)."""
+        child = self.get(name)
+        if pid is None or child is None or not child.running:
+            return False
+        try:
+            return os.getpgid(pid) == child.pid
+        except ProcessLookupError:
+            return False
+
+    def stats(self) -> dict[str, dict]:
+        """
+        {name: {"pid", "running", "paused", "restarts", "cpu_percent", "rss"}} for every child.
+        cpu_percent (since the previous stats() call) and rss (bytes) cover the child's whole process
+        tree, and are None without psutil.
+        """
+        with self._lock:
+            children = list(self._children.values())
+        result = {}
+        for child in children:
+            cpu, rss = self._usage(child) if child.running and _get_psutil() else (None, None)
+            result[child.name] = {
+                "pid": child.pid,
+                "running": child.running,
+                "paused": child.paused,
+                "restarts": child.restarts,
+                "cpu_percent": cpu,
+                "rss": rss,
+            }
+        return result
+
+    # ---- internals ----
+
+    def _spawn(self, child: Child) -> None:
+        env = None if child.env is None else dict(child.env)
+        popen = subprocess.Popen(
+            child.argv,
+            env=env,
+            cwd=child.cwd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            pass_fds=child.pass_fds,
+        )
+        child.popen = popen
+        child.paused = False
+        child.started = time.monotonic()
+        child._ps = {}
+        try:
+            fd = os.pidfd_open(popen.pid)
+        except (AttributeError, OSError):
+            # No pidfd (Python < 3.9 or kernel < 5.3): block in wait() on a thread of its own
+            threading.Thread(target=self._wait_blocking, args=(child, popen), daemon=True).start()
+            return
+        with self._lock:
+            self._pidfds[fd] = (child, popen)
+        try:
+            os.write(self._wake_w, b"x")
+        except BlockingIOError:
+            pass
+
+    def _reap(self, popen, timeout: float) -> None:
+        """Wait for a SIGTERMed child, SIGKILL it after timeout."""
+        try:
+            popen.wait(timeout)
+        except subprocess.TimeoutExpired:
+            _signal_group(popen.pid, signal.SIGKILL)
+            popen.wait()
+        # Leader gone; take down anything it left behind in its group
+        _signal_group(popen.pid, signal.SIGKILL)
+
+    def _kill_if_alive(self, popen) -> None:
+        """stop() timed out: the child ignored SIGTERM."""
+        if popen.poll() is None:
+            print(f"pid {popen.pid} ignored SIGTERM; killing it")
+            _signal_group(popen.pid, signal.SIGKILL)
+
+    def _wait_blocking(self, child: Child, popen) -> None:
+        popen.wait()
+        self._on_exit(child, popen)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                fds = list(self._pidfds)
+            try:
+                ready, _, _ = select.select([self._wake_r] + fds, [], [])
+            except OSError:
+                continue
+            for fd in ready:
+                if fd == self._wake_r:
+                    os.read(self._wake_r, 512)
+                    continue
+                with self._lock:
+                    entry = self._pidfds.pop(fd, None)
+                os.close(fd)
+                if entry is not None:
+                    child, popen = entry
+                    popen.wait()  # readable pidfd: the process has exited, this only reaps it
+                    self._on_exit(child, popen)
+
+    def _on_exit(self, child: Child, popen) -> None:
+        # Orphans of the exited leader would otherwise live on in its group
+        _signal_group(popen.pid, signal.SIGKILL)
+        with self._lock:
+            if self._exiting.pop(popen.pid, None) is not None and child.timer is not None:
+                child.timer.cancel()  # stopped in time, no SIGKILL needed
+                child.timer = None
+            if child.popen is not popen or child.stopping:
+                return
+            code = popen.returncode
+            if not child.restart or code == 0:
+                print(f"{child.name} exited (code {code})")
+                if self._children.get(child.name) is child:
+                    del self._children[child.name]
+                return
+            if time.monotonic() - child.started >= self._stable_after:
+                child.failures = 0
+            backoff = self._backoff if child.backoff is None else child.backoff
+            delay = min(backoff * (2 ** child.failures), self._max_backoff)
+            child.failures += 1
+            print(f"{child.name} crashed (code {code}); restarting in {delay:.1f}s")
+            child.timer = threading.Timer(delay, self._restart, (child,))
+            child.timer.daemon = True
+            child.timer.start()
+
+    def _restart(self, child: Child) -> None:
+        with self._lock:
+            child.timer = None
+            if child.stopping or self._children.get(child.name) is not child:
+                return
+            try:
+                self._spawn(child)
+            except OSError as e:
+                print(f"Could not restart {child.name}: {e}")
+                return
+            child.restarts += 1
+
+    def _usage(self, child: Child) -> tuple:
+        psutil = _psutil
+        try:
+            root = child._ps.get(child.pid) or psutil.Process(child.pid)
+            procs = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None, None
+        cpu = 0.0
+        rss = 0
+        seen = {}
+        for proc in procs:
+            proc = child._ps.get(proc.pid, proc)
+            try:
+                cpu += proc.cpu_percent(None)
+                rss += proc.memory_info().rss
+            except psutil.Error:
+                continue
+            seen[proc.pid] = proc
+        child._ps = seen
+        return cpu, rss
+
+
+def _get_psutil():
+    """psutil, or None without it. Only stats() needs it, so it stays out of startup."""
+    global _psutil
+    if _psutil is None:
+        try:
+            import psutil
+            _psutil = psutil
+        except ImportError:
+            _psutil = False
+    return _psutil or None
+
+
+_supervisor: ProcessSupervisor | None = None
+_supervisor_lock = threading.Lock()
+
+
+def get_supervisor() -> ProcessSupervisor:
+    """The app-wide supervisor (created on first use)."""
+    global _supervisor
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = ProcessSupervisor()
+        return _supervisor
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Chromium flag profiles compared on this machine.
+For each profile in chromium_flags.PROFILES (or --profiles), starts the HUD window in a fresh
+process under Xvfb (xvfb-run, when no DISPLAY is set) with that profile's switches, and records
+the time from MainWindow() to the page's loadFinished, then, over --seconds of idle, the CPU time
+and the peak RSS of the QtWebEngine renderer processes. The median of --runs runs per profile is
+printed. Needs psutil, and xvfb-run on a headless box.
+
+Usage: python3 scripts/bench_chromium_flags.py [--profiles pi4,x86] [--runs N] [--seconds N] [--json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+import chromium_flags  # noqa: E402
+
+_RESULT_PREFIX = "BENCH_RESULT "
+
+
+def _renderers(psutil):
+    """QtWebEngineProcess children doing the rendering (--type=renderer)."""
+    procs = []
+    for proc in psutil.Process().children(recursive=True):
+        try:
+            if "--type=renderer" in " ".join(proc.cmdline()):
+                procs.append(proc)
+        except psutil.Error:
+            continue
+    return procs
+
+
+def _cpu_seconds(psutil, procs) -> float:
+    total = 0.0
+    for proc in procs:
+        try:
+            t = proc.cpu_times()
+            total += t.user + t.system
+        except psutil.Error:
+            continue
+    return total
+
+
+def _rss_bytes(psutil, procs) -> int:
+    total = 0
+    for proc in procs:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
+
+
+def run_child(seconds: float) -> int:
+    """One measurement in this process (SAMBAR_CHROMIUM_PROFILE set by the parent)."""
+    import psutil
+    from PyQt6.QtCore import QEventLoop, QTimer, Qt
+    from PyQt6.QtWidgets import QApplication
+    from config import get_config
+
+    config = get_config()
+    config.set("performance.low_power_mode", False)  # measure the Chromium HUD whatever config.yaml says
+    profile, flags = chromium_flags.chromium_flags(config)
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv + flags)
+    import hud_app
+
+    start = time.monotonic()
+    window = hud_app.MainWindow()
+    if window.view is None:
+        print("index.html not found")
+        return 1
+    loaded = QEventLoop()
+    window.view.loadFinished.connect(lambda ok: loaded.quit())
+    window.show_main()
+    loaded.exec()
+    load_ms = (time.monotonic() - start) * 1000.0
+
+    renderers = _renderers(psutil)
+    cpu0 = _cpu_seconds(psutil, renderers)
+    peak_rss = _rss_bytes(psutil, renderers)
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        wait = QEventLoop()
+        QTimer.singleShot(500, wait.quit)
+        wait.exec()
+        peak_rss = max(peak_rss, _rss_bytes(psutil, renderers))
+    result = {
+        "profile": profile,
+        "flags": flags,
+        "load_ms": load_ms,
+        "renderer_cpu_s": _cpu_seconds(psutil, renderers) - cpu0,
+        "renderer_rss_mb": peak_rss / 1024 / 1024,
+        "renderers": len(renderers),
+    }
+    print(_RESULT_PREFIX + json.dumps(result), flush=True)
+    app.quit()
+    return 0
+
+
+def _measure(profile: str, seconds: float) -> dict | None:
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", "--seconds", str(seconds)]
+    if not os.environ.get("DISPLAY"):
+        if shutil.which("xvfb-run") is None:
+            print("No DISPLAY and no xvfb-run: install xvfb or run under an X server")
+            return None
+        cmd = ["xvfb-run", "-a", "-s", "-screen 0 2560x720x24"] + cmd
+    env = dict(os.environ, SAMBAR_CHROMIUM_PROFILE=profile, QT_QPA_PLATFORM="xcb")
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True, timeout=seconds + 120)
+    for line in proc.stdout.splitlines():
+        if line.startswith(_RESULT_PREFIX):
+            return json.loads(line[len(_RESULT_PREFIX):])
+    print(f"{profile}: no result (exit {proc.returncode})\n{proc.stderr[-2000:]}")
+    return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profiles", default=",".join(chromium_flags.PROFILES), help="comma-separated profile names")
+    parser.add_argument("--runs", type=int, default=3, help="runs per profile (median is reported)")
+    parser.add_argument("--seconds", type=float, default=10.0, help="idle measurement window after load")
+    parser.add_argument("--json", action="store_true", help="print all runs as JSON instead of a table")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return run_child(args.seconds)
+
+    print(f"This machine detects as: {chromium_flags.detect_profile()}")
+    results = {}
+    for profile in args.profiles.split(","):
+        if profile not in chromium_flags.PROFILES:
+            print(f"Unknown profile {profile!r}")
+            return 1
+        runs = [r for r in (_measure(profile, args.seconds) for _ in range(args.runs)) if r is not None]
+        if runs:
+            results[profile] = runs
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'profile':<10} {'load ms':>8} {'CPU s':>7} {'CPU %':>6} {'RSS MB':>7}")
+    for profile, runs in results.items():
+        load = statistics.median(r["load_ms"] for r in runs)
+        cpu = statistics.median(r["renderer_cpu_s"] for r in runs)
+        rss = statistics.median(r["renderer_rss_mb"] for r in runs)
+        print(f"{profile:<10} {load:8.0f} {cpu:7.2f} {100.0 * cpu / args.seconds:6.2f} {rss:7.1f}")
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
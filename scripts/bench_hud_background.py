@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+CPU cost of the HUD page per background state.
+Opens the real MainWindow (index.html in QtWebEngine) and, once the page has loaded, measures the
+CPU time used by this process and its QtWebEngineProcess children over --seconds in each state:
+nothing covered, the right half covered (CarPlay), the left half covered (Steam Link) and both
+(page frozen behind its snapshot). Needs an X server (run under xvfb-run on a headless box) and psutil.
+
+Usage: python3 scripts/bench_hud_background.py [--seconds N] [--settle N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import psutil
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from PyQt6.QtCore import QEventLoop, QTimer, Qt  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+STATES = (
+    ("active", ()),
+    ("right covered", ("right",)),
+    ("left covered", ("left",)),
+    ("frozen", ("left", "right")),
+)
+
+
+def _wait(ms: int) -> None:
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def _cpu_seconds() -> float:
+    """User + system CPU time of this process and all its descendants (the Chromium processes)."""
+    me = psutil.Process()
+    total = 0.0
+    for proc in [me] + me.children(recursive=True):
+        try:
+            t = proc.cpu_times()
+            total += t.user + t.system
+        except psutil.Error:
+            continue
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=20.0, help="measurement window per state")
+    parser.add_argument("--settle", type=float, default=3.0, help="wait after switching state")
+    args = parser.parse_args()
+
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv)
+    import hud_app
+
+    window = hud_app.MainWindow()
+    if window.view is None:
+        print("index.html not found")
+        return 1
+    loaded = QEventLoop()
+    window.view.loadFinished.connect(lambda ok: loaded.quit())
+    window.show_main()
+    loaded.exec()
+
+    results = []
+    for name, covered in STATES:
+        window.uncover_all()
+        for region in covered:
+            window.set_region_covered(region, True)
+        _wait(int(args.settle * 1000))
+        cpu0, wall0 = _cpu_seconds(), time.monotonic()
+        _wait(int(args.seconds * 1000))
+        cpu = _cpu_seconds() - cpu0
+        results.append((name, 100.0 * cpu / (time.monotonic() - wall0)))
+    window.uncover_all()
+
+    baseline = results[0][1]
+    print(f"{'state':<15} {'CPU %':>7} {'vs active':>10}")
+    for name, percent in results:
+        print(f"{name:<15} {percent:7.2f} {percent - baseline:+9.2f}")
+    app.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
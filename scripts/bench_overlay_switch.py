@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Home-tap latency and dropped frames when the HUD switches between overlay and normal stacking.
+Opens the real MainWindow and runs --cycles of "app launched" (overlay on) then "Home tapped"
+(MainWindow._do_home), with each method:
+  flags  the old way: setWindowFlags() without / with WindowStaysOnTopHint, then show() and
+         showFullScreen(); Qt destroys and re-creates the native window each time
+  ewmh   the current way (hud_app._set_overlay_mode): _NET_WM_STATE_ABOVE on the existing window
+For each it reports the time from the tap until the window is exposed again, how often the
+native window was re-created, and (Chromium HUD) the frames the page dropped, from its
+requestAnimationFrame timestamps. Needs an X server with an EWMH window manager (make bench-overlay
+runs it under xvfb-run with openbox); it refuses to run without one, since neither method then does
+what it does on the Pi.
+
+Usage: python3 scripts/bench_overlay_switch.py [--cycles N] [--methods flags,ewmh] [--native]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from PyQt6.QtCore import QEventLoop, QTimer, Qt  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+# Records every animation frame the page produces
+_FRAMES_START_JS = """
+window.__benchFrames = [];
+(function tick(t) { window.__benchFrames.push(t); requestAnimationFrame(tick); })(performance.now());
+"""
+_FRAMES_READ_JS = "window.__benchFrames"
+
+
+def _wait(ms: int) -> None:
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def _wait_exposed(window, timeout: float = 2.0) -> None:
+    app = QApplication.instance()
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 5)
+        handle = window.windowHandle()
+        if handle is not None and handle.isExposed():
+            return
+
+
+def _flags_overlay(window, on: bool) -> None:
+    """The previous _set_overlay_mode."""
+    flags = Qt.WindowType.FramelessWindowHint
+    if not on:
+        flags |= Qt.WindowType.WindowStaysOnTopHint
+    window.setWindowFlags(flags)
+    window.show()
+
+
+def _flags_home(window) -> None:
+    """The previous _do_home / restoreFullScreen."""
+    _flags_overlay(window, False)
+    window.set_region_covered("left", False)  # as _do_home
+    window.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
+    window.setWindowState(Qt.WindowState.WindowNoState)
+    window.showFullScreen()
+    window.raise_()
+    window.activateWindow()
+
+
+def _dropped_frames(stamps: list) -> int:
+    """Frames missing between rAF timestamps, taking the median interval as one frame."""
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    if not gaps:
+        return 0
+    frame = statistics.median(gaps)
+    return sum(max(0, round(gap / frame) - 1) for gap in gaps)
+
+
+def _read_frames(window) -> list:
+    result = []
+    done = QEventLoop()
+
+    def got(stamps):
+        result.extend(stamps or [])
+        done.quit()
+
+    window.view.page().runJavaScript(_FRAMES_READ_JS, got)
+    QTimer.singleShot(2000, done.quit)
+    done.exec()
+    return result
+
+
+def run(window, method: str, cycles: int, settle_ms: int) -> dict:
+    import hud_app
+
+    if window.view is not None:
+        window.view.page().runJavaScript(_FRAMES_START_JS)
+    latencies, recreated = [], 0
+    for _ in range(cycles):
+        # An app took the left half
+        if method == "flags":
+            _flags_overlay(window, True)
+        else:
+            hud_app._set_overlay_mode(window, True)
+        window.set_region_covered("left", True)
+        _wait(settle_ms)
+        # Home tapped
+        wid = int(window.winId())
+        start = time.monotonic()
+        if method == "flags":
+            _flags_home(window)
+        else:
+            window._do_home()
+        _wait_exposed(window)
+        latencies.append((time.monotonic() - start) * 1000.0)
+        recreated += int(window.winId()) != wid
+        _wait(settle_ms)
+    dropped = _dropped_frames(_read_frames(window)) if window.view is not None else None
+    return {"latencies": latencies, "recreated": recreated, "dropped": dropped}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=20, help="overlay on / Home cycles per method")
+    parser.add_argument("--methods", default="flags,ewmh", help="comma-separated: flags, ewmh")
+    parser.add_argument("--settle", type=int, default=300, help="ms between switches")
+    parser.add_argument("--native", action="store_true", help="measure the low-power (native) HUD")
+    args = parser.parse_args()
+
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv)
+    from ewmh import get_ewmh
+    client = get_ewmh() if app.platformName() == "xcb" else None
+    if client is None or not client.has_wm:
+        print(f"Needs X11 with a window manager (platform {app.platformName()!r}): try make bench-overlay")
+        return 1
+    from config import get_config
+    get_config().set("performance.low_power_mode", args.native)
+    import hud_app
+
+    window = hud_app.MainWindow()
+    if window.view is None and window.native_hud is None:
+        print("index.html not found")
+        return 1
+    if window.view is not None:
+        loaded = QEventLoop()
+        window.view.loadFinished.connect(lambda ok: loaded.quit())
+        window.show_main()
+        loaded.exec()
+    else:
+        window.show_main()
+    _wait_exposed(window)
+    _wait(1000)
+
+    print(f"{'method':<7} {'median ms':>10} {'max ms':>8} {'re-created':>11} {'dropped frames':>15}")
+    for method in args.methods.split(","):
+        r = run(window, method, args.cycles, args.settle)
+        dropped = "-" if r["dropped"] is None else str(r["dropped"])
+        print(f"{method:<7} {statistics.median(r['latencies']):10.1f} {max(r['latencies']):8.1f} "
+              f"{r['recreated']:>5}/{args.cycles:<5} {dropped:>15}")
+    app.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
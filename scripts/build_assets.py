@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Pre-scaled image cache for Sambar HUD (assets.py).
+Builds every image in img/ at the size each screen shows it, for assets.RESOLUTIONS plus the
+configured screen size, at 1:1 and fit_to_screen zoom, so nothing is decoded at full size or scaled
+at runtime. Cached copies no longer needed (an image was replaced, or a size dropped) are removed
+unless --keep-stale is given. Run after changing img/ or the screen size; setup_kiosk.sh runs it.
+
+Usage: python3 scripts/build_assets.py [--resolution WxH ...] [--keep-stale]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from PyQt6.QtGui import QGuiApplication  # noqa: E402
+
+import assets  # noqa: E402
+from config import get_config  # noqa: E402
+
+
+def _resolution(text: str) -> tuple[int, int]:
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resolution", type=_resolution, action="append", default=[],
+                        help="extra window size WxH (repeatable)")
+    parser.add_argument("--keep-stale", action="store_true", help="don't remove cached copies no longer needed")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # QImage / QImageReader only; no display needed
+    app = QGuiApplication(sys.argv[:1])  # noqa: F841 (image plugins need an application)
+
+    config = get_config()
+    resolutions = list(assets.RESOLUTIONS) + args.resolution
+    configured = (config.get("screen_width", 2560), config.get("screen_height", 720))
+    if configured not in resolutions:
+        resolutions.append(configured)
+
+    wanted = set()
+    start = time.monotonic()
+    for width, height in resolutions:
+        for fit in (False, True):
+            zoom = assets.hud_zoom(width, height, fit)
+            for name, box_w, box_h, upscale in assets.asset_boxes(width, height, zoom):
+                key = (name, box_w, box_h, upscale)
+                if key in wanted:
+                    continue
+                wanted.add(key)
+                path = assets.scaled_path(name, box_w, box_h, upscale)
+                if path is not None:
+                    print(f"{name:<18} {box_w:>5}x{box_h:<5} -> {os.path.basename(path)}")
+
+    keep = {assets.scaled_path(*key) for key in wanted} - {None}
+    removed = 0 if args.keep_stale else assets.prune(keep)
+    print(f"{len(keep)} images in {assets.ASSET_DIR} ({removed} stale removed, "
+          f"{(time.monotonic() - start) * 1000:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
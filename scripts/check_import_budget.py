@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Import-time budget for Sambar HUD startup.
+Imports main.py, and what main() imports before the splash paints (asset_scheme, i.e. QtWebEngineCore,
+unless performance.low_power_mode), in a fresh interpreter with -X importtime, and exits 1 when that
+took longer than boot.import_budget_ms in config.yaml (or --budget-ms). The best of --runs runs counts, so one run slowed down by the disk cache doesn't
+fail the check. The slowest modules are listed either way.
+
+Usage: python3 scripts/check_import_budget.py [--budget-ms N] [--runs N] [--top N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_MODULE = "main"
+
+
+def _configured_budget_ms() -> float:
+    sys.path.insert(0, APP_DIR)
+    from config import get_config
+    return float(get_config().get("boot.import_budget_ms", 250))
+
+
+def _entry_modules() -> list[str]:
+    """main, then the modules main() imports before the splash is painted (in that order)."""
+    sys.path.insert(0, APP_DIR)
+    from config import get_config
+    modules = [ENTRY_MODULE]
+    if not get_config().get("performance.low_power_mode", False):
+        modules.append("asset_scheme")  # registers sambar-asset:// before the QApplication exists
+    return modules
+
+
+def measure() -> tuple[float, list]:
+    """One import of the entry modules: (total ms, [(self ms, cumulative ms, module), ...] they pulled in)."""
+    entries = _entry_modules()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(entries)],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        error = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))
+        raise RuntimeError(f"importing {', '.join(entries)} failed:\n{error.strip()}")
+    # Lines look like "import time:  <self us> | <cumulative us> | <indent><module>", children before their parent
+    total = 0.0
+    found = set()
+    modules = []
+    pending = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the column header
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 0:
+            if name.strip() in entries:
+                total += int(fields[1]) / 1000.0
+                found.add(name.strip())
+                modules.extend(pending)
+                modules.append((int(fields[0]) / 1000.0, int(fields[1]) / 1000.0, name.strip()))
+            pending = []  # otherwise a top-level import of the interpreter itself (site, encodings, ...)
+            continue
+        pending.append((int(fields[0]) / 1000.0, int(fields[1]) / 1000.0, name.strip()))
+    if found != set(entries):
+        raise RuntimeError(f"no import time reported for {', '.join(sorted(set(entries) - found))}")
+    return total, sorted(modules, reverse=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=None, help="default: boot.import_budget_ms")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    args = parser.parse_args()
+    budget = args.budget_ms if args.budget_ms is not None else _configured_budget_ms()
+
+    try:
+        total, modules = min(measure() for _ in range(max(1, args.runs)))
+    except RuntimeError as e:
+        print(e)
+        return 1
+
+    print(f"Pre-splash imports: {total:.1f} ms (budget {budget:.0f} ms, best of {args.runs})")
+    for self_ms, cumulative_ms, name in modules[:args.top]:
+        print(f"  {self_ms:8.1f} ms self {cumulative_ms:8.1f} ms total  {name}")
+    if total > budget:
+        print(f"Over budget by {total - budget:.1f} ms: defer the imports above until after the splash (see hud_app)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -46,6 +46,10 @@ export LC_ALL=C.UTF-8
 export PYTHONUTF8=1
 pip3 install --break-system-packages -r requirements-pi.txt
 
+# Pre-scale img/ for the screen sizes we run at (re-run after changing img/ or the screen size)
+echo "Building image cache..."
+python3 scripts/build_assets.py || echo "Image cache not built; images will be scaled on first use"
+
 # Create systemd service for auto-start (kiosk / fullscreen – single launcher)
 echo "Creating systemd service..."
 SAMBAR_DIR="$(pwd)"
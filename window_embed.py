@@ -0,0 +1,139 @@
+"""
+External apps' windows (LIVI, Steam Link, the AirPlay receiver, the capture feed) embedded in a region
+of one of our windows. The app's own top-level X window is reparented into an EmbedSlot
+(QWindow.fromWinId + createWindowContainer): the X server then draws it straight into our window and
+delivers pointer input to it directly, so there is no nested Xephyr server compositing every frame
+again in software, and nothing to forward. The slot keeps the window sized to its region, gives it
+keyboard focus, and can follow an app so its new window is embedded again after a restart.
+X11 (xcb) only; callers fall back to positioning the window, or to a Xephyr frame, when embed() fails.
+"""
+
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtGui import QGuiApplication, QWindow
+from PyQt6.QtWidgets import QWidget
+
+from ewmh import get_ewmh
+from x11_windows import format_window_id, get_tracker
+
+
+def can_embed() -> bool:
+    """Foreign X11 windows can only be reparented into ours on the xcb platform (not Wayland)."""
+    app = QGuiApplication.instance()
+    return app is not None and app.platformName() == "xcb"
+
+
+class EmbedSlot(QWidget):
+    """A region hosting at most one foreign window. Hidden while empty, so what is underneath shows."""
+
+    embedded = pyqtSignal(str)  # window id (wmctrl-style hex)
+    released = pyqtSignal()
+    _adopt = pyqtSignal(str)  # from the tracker thread (follow), queued to the GUI thread
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        self._window = None  # foreign QWindow
+        self._container = None
+        self._wid = None
+        self._follow = None  # (tracker, token)
+        self._adopt.connect(self._on_adopt)
+        self.hide()
+
+    @property
+    def window_id(self) -> str | None:
+        return self._wid
+
+    def is_embedded(self) -> bool:
+        return self._wid is not None
+
+    def embed(self, wid) -> bool:
+        """
+        Reparent window wid (hex string or int, on our display: for an app in a Xephyr frame, the frame)
+        into this slot and fill it. False if embedding isn't possible here; the window is left where it was.
+        """
+        if not can_embed():
+            return False
+        try:
+            wid_int = wid if isinstance(wid, int) else int(wid, 16)
+        except (ValueError, TypeError):
+            return False
+        hex_id = format_window_id(wid_int)
+        if hex_id == self._wid:
+            self.show()  # parked by hide() (e.g. an idle Xephyr frame)
+            self.raise_()
+            return True
+        self._drop()
+        window = QWindow.fromWinId(wid_int)
+        if window is None:
+            return False
+        container = QWidget.createWindowContainer(window, self)
+        if container is None:
+            return False
+        container.setGeometry(self.rect())
+        container.show()
+        self._window, self._container, self._wid = window, container, hex_id
+        self.show()
+        self.raise_()
+        self.focus_app()
+        self.embedded.emit(hex_id)
+        return True
+
+    def release(self, hide_window: bool = False) -> None:
+        """
+        Stop following, give the window back to the root window (the app keeps running) and hide the slot.
+        hide_window: unmap it first, so an app about to be stopped doesn't show up as a normal window
+        meanwhile. Call before stopping the app, so its window is still there to reparent.
+        """
+        self.unfollow()
+        self._drop(hide_window)
+
+    def _drop(self, hide_window: bool = False) -> None:
+        if self._container is None:
+            return
+        window, container = self._window, self._container
+        self._window = self._container = self._wid = None
+        try:
+            if hide_window:
+                window.hide()
+            window.setParent(None)  # reparent to the root; deleting the container would take the window down
+        except RuntimeError:
+            pass  # already gone with the app
+        container.deleteLater()
+        self.hide()
+        self.released.emit()
+
+    def focus_app(self) -> None:
+        """Send keyboard input to the embedded window (pointer input reaches it without help)."""
+        client = get_ewmh()
+        if client is not None and self._wid is not None:
+            client.focus(self._wid)
+            client.flush()
+
+    def follow(self, role: str, owner) -> None:
+        """Embed the window of role (see x11_windows.ROLES) whenever a new one maps, e.g. after the
+        supervisor restarted a crashed app. Roles are broad ("livi" matches any Electron window), so only
+        windows owner(info) accepts are taken: those of the app we started. No-op without window tracking."""
+        self.unfollow()
+        tracker = get_tracker()
+        if tracker is None:
+            return
+
+        def on_window(info):
+            if info.mapped and info.hex_id != self._wid and owner(info):
+                self._adopt.emit(info.hex_id)
+
+        self._follow = (tracker, tracker.subscribe(role, on_window))
+
+    def unfollow(self) -> None:
+        if self._follow is not None:
+            tracker, token = self._follow
+            tracker.unsubscribe(token)
+            self._follow = None
+
+    def _on_adopt(self, hex_id: str) -> None:
+        if self._follow is not None:
+            self.embed(hex_id)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._container is not None:
+            self._container.setGeometry(self.rect())
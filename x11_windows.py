@@ -0,0 +1,647 @@
+"""
+X11 window tracking for Sambar HUD.
+Keeps one persistent X connection per display (host, or a nested Xephyr frame such as :98)
+and watches the root window for new clients, title/class changes and geometry changes, so
+launch code can wait for a window to appear instead of polling wmctrl/xdotool.
+Each tracker feeds a WindowIndex (title, WM_CLASS, PID and role -> window) that every window
+lookup in the app queries instead of running wmctrl.
+"""
+
+import asyncio
+import os
+import select
+import threading
+
+try:
+    from Xlib import X, Xatom
+    from Xlib import display as xdisplay
+    from Xlib import error as xerror
+    _XLIB_AVAILABLE = True
+except ImportError:
+    _XLIB_AVAILABLE = False
+
+
+# Properties that change what a window "looks like" to a matcher or the layout controller
+_WATCHED_PROPERTIES = ("WM_NAME", "_NET_WM_NAME", "WM_CLASS", "_NET_WM_PID", "_NET_WM_STATE", "_MOTIF_WM_HINTS")
+
+# _NET_WM_STATE_ABOVE -> "above", matching the names wmctrl -b uses
+_STATE_PREFIX = "_NET_WM_STATE_"
+
+
+def format_window_id(wid: int) -> str:
+    """Window id in the hex form wmctrl prints (e.g. 0x03a00007)."""
+    return f"0x{wid:08x}"
+
+
+class WindowInfo:
+    """Snapshot of one top-level window. Replaced (never mutated) when the window changes."""
+
+    __slots__ = ("wid", "title", "wm_class", "pid", "x", "y", "width", "height", "mapped", "states", "decorated")
+
+    def __init__(self, wid, title="", wm_class=(), pid=None, x=0, y=0, width=0, height=0, mapped=False,
+                 states=frozenset(), decorated=True):
+        self.wid = wid
+        self.title = title
+        self.wm_class = tuple(wm_class)
+        self.pid = pid
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.mapped = mapped
+        # _NET_WM_STATE as wmctrl names ("above", "maximized_vert", "skip_taskbar", ...)
+        self.states = frozenset(states)
+        # False once _MOTIF_WM_HINTS asks for no decorations
+        self.decorated = decorated
+
+    @property
+    def hex_id(self) -> str:
+        return format_window_id(self.wid)
+
+    def replace(self, **changes) -> "WindowInfo":
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return WindowInfo(**values)
+
+    def __repr__(self):
+        return (
+            f"WindowInfo({self.hex_id}, title={self.title!r}, wm_class={self.wm_class!r}, "
+            f"pid={self.pid}, geom={self.x},{self.y} {self.width}x{self.height}, mapped={self.mapped})"
+        )
+
+
+class WindowMatch:
+    """Case-insensitive matcher on title and/or WM_CLASS substrings (either may match), or exact PID."""
+
+    def __init__(self, titles=(), classes=(), pid=None):
+        self.titles = tuple(t.lower() for t in titles)
+        self.classes = tuple(c.lower() for c in classes)
+        self.pid = pid
+
+    def __call__(self, info: WindowInfo) -> bool:
+        if self.pid is not None and info.pid == self.pid:
+            return True
+        if self.titles and info.title:
+            title = info.title.lower()
+            if any(t in title for t in self.titles):
+                return True
+        if self.classes and info.wm_class:
+            wm_class = " ".join(info.wm_class).lower()
+            if any(c in wm_class for c in self.classes):
+                return True
+        return False
+
+    def __repr__(self):
+        return f"WindowMatch(titles={self.titles!r}, classes={self.classes!r}, pid={self.pid})"
+
+
+# Roles the app cares about. A window can hold several roles (e.g. a "CarPlay" titled ffplay feed).
+ROLES = {
+    "livi": WindowMatch(titles=("LIVI", "CarPlay", "pi-carplay"), classes=("livi", "carplay", "electron")),
+    "livi_frame": WindowMatch(titles=("SambarLIVI",)),
+    "steamlink": WindowMatch(titles=("Steam Link", "steamlink", "SambarSteamLink"), classes=("steamlink",)),
+    "steamlink_frame": WindowMatch(titles=("SambarSteamLink",)),
+    "airplay": WindowMatch(titles=("Sambar HUD AirPlay", "UxPlay", "RPiPlay"), classes=("uxplay", "rpiplay")),
+    "capture_feed": WindowMatch(titles=("CarPlay", "ffplay", "GStreamer", "xvimagesink"), classes=("ffplay", "gst-launch")),
+}
+
+
+class WindowIndex:
+    """
+    Lookup tables for the windows of one display, updated incrementally by its WindowTracker.
+    Exact title, WM_CLASS (instance or class, lowercase), PID and role lookups are dict hits;
+    roles are evaluated once per window change, not per lookup. Thread-safe.
+    """
+
+    def __init__(self, roles: dict | None = None):
+        self._lock = threading.RLock()
+        self._roles = dict(ROLES if roles is None else roles)
+        self._by_id: dict[int, WindowInfo] = {}
+        # key -> {wid: None}; dicts keep insertion (creation) order like wmctrl -l
+        self._by_title: dict[str, dict] = {}
+        self._by_class: dict[str, dict] = {}
+        self._by_pid: dict[int, dict] = {}
+        self._by_role: dict[str, dict] = {}
+        self._roles_of: dict[int, frozenset] = {}
+        self._stacking: dict[int, int] = {}  # wid -> position in _NET_CLIENT_LIST_STACKING (0 = bottom)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._by_id)
+
+    def __contains__(self, wid):
+        with self._lock:
+            return wid in self._by_id
+
+    # ---- updates (tracker thread) ----
+
+    def put(self, info: WindowInfo) -> frozenset:
+        """Insert or replace a window; returns its roles."""
+        wid = info.wid
+        with self._lock:
+            old = self._by_id.get(wid)
+            old_roles = self._roles_of.get(wid, frozenset())
+            self._by_id[wid] = info
+            # Only touch buckets whose key changed, so a window keeps its creation-order slot
+            _rekey(self._by_title, _keys_title(old), _keys_title(info), wid)
+            _rekey(self._by_class, _keys_class(old), _keys_class(info), wid)
+            _rekey(self._by_pid, _keys_pid(old), _keys_pid(info), wid)
+            roles = frozenset(role for role, match in self._roles.items() if match(info))
+            self._roles_of[wid] = roles
+            _rekey(self._by_role, old_roles, roles, wid)
+            return roles
+
+    def remove(self, wid: int) -> WindowInfo | None:
+        with self._lock:
+            info = self._by_id.get(wid)
+            self._unlink(wid)
+            return info
+
+    def retain(self, wids) -> None:
+        """Drop every window not in wids."""
+        keep = set(wids)
+        with self._lock:
+            for wid in [w for w in self._by_id if w not in keep]:
+                self._unlink(wid)
+
+    def set_stacking(self, wids) -> None:
+        """Bottom-to-top stacking order of client windows (_NET_CLIENT_LIST_STACKING)."""
+        with self._lock:
+            self._stacking = {wid: pos for pos, wid in enumerate(wids)}
+
+    def define_role(self, role: str, match) -> None:
+        """Add or replace a role and re-classify known windows."""
+        with self._lock:
+            self._roles[role] = match
+            for info in list(self._by_id.values()):
+                self.put(info)
+
+    def _unlink(self, wid: int) -> None:
+        info = self._by_id.pop(wid, None)
+        if info is None:
+            return
+        _rekey(self._by_title, _keys_title(info), (), wid)
+        _rekey(self._by_class, _keys_class(info), (), wid)
+        _rekey(self._by_pid, _keys_pid(info), (), wid)
+        _rekey(self._by_role, self._roles_of.pop(wid, ()), (), wid)
+
+    # ---- lookups (any thread) ----
+
+    def get(self, wid: int) -> WindowInfo | None:
+        with self._lock:
+            return self._by_id.get(wid)
+
+    def windows(self) -> list[WindowInfo]:
+        with self._lock:
+            return list(self._by_id.values())
+
+    def roles_of(self, wid: int) -> frozenset:
+        with self._lock:
+            return self._roles_of.get(wid, frozenset())
+
+    def by_role(self, role: str, mapped: bool = False) -> WindowInfo | None:
+        return self._first(self._by_role, role, mapped)
+
+    def is_stacked_above(self, wid: int, other: int) -> bool | None:
+        """True if wid is above other in the WM stacking order; None if unknown (no WM or not listed)."""
+        with self._lock:
+            a = self._stacking.get(wid)
+            b = self._stacking.get(other)
+        if a is None or b is None:
+            return None
+        return a > b
+
+    def all_by_role(self, role: str) -> list[WindowInfo]:
+        with self._lock:
+            return [self._by_id[w] for w in self._by_role.get(role, ())]
+
+    def by_title(self, title: str, mapped: bool = False) -> WindowInfo | None:
+        return self._first(self._by_title, title, mapped)
+
+    def by_class(self, name: str, mapped: bool = False) -> WindowInfo | None:
+        return self._first(self._by_class, name.lower(), mapped)
+
+    def by_pid(self, pid: int, mapped: bool = False) -> WindowInfo | None:
+        return self._first(self._by_pid, pid, mapped)
+
+    def find_title(self, substring: str, mapped: bool = False) -> WindowInfo | None:
+        """First window whose title contains substring (case-sensitive, like the old wmctrl -l scan).
+        Linear in the number of windows, but in memory; prefer roles for hot paths."""
+        with self._lock:
+            for info in self._by_id.values():
+                if substring in info.title and (info.mapped or not mapped):
+                    return info
+        return None
+
+    def _first(self, table: dict, key, mapped: bool) -> WindowInfo | None:
+        with self._lock:
+            for wid in table.get(key, ()):
+                info = self._by_id[wid]
+                if info.mapped or not mapped:
+                    return info
+        return None
+
+
+def _keys_title(info: WindowInfo | None) -> tuple:
+    return (info.title,) if info is not None else ()
+
+
+def _keys_class(info: WindowInfo | None) -> set:
+    return {c.lower() for c in info.wm_class} if info is not None else set()
+
+
+def _keys_pid(info: WindowInfo | None) -> tuple:
+    return (info.pid,) if info is not None and info.pid is not None else ()
+
+
+def _rekey(table: dict, old_keys, new_keys, wid: int) -> None:
+    """Move wid from the buckets of old_keys to those of new_keys, leaving unchanged keys in place."""
+    new_keys = set(new_keys)
+    for key in old_keys:
+        if key in new_keys:
+            continue
+        bucket = table.get(key)
+        if bucket is not None:
+            bucket.pop(wid, None)
+            if not bucket:
+                del table[key]
+    for key in new_keys:
+        table.setdefault(key, {})[wid] = None
+
+
+class WindowTracker:
+    """
+    Event-driven view of the top-level windows on one X display.
+    Uses _NET_CLIENT_LIST when a window manager maintains it (host display); otherwise (bare
+    Xephyr frames) treats mapped children of the root as clients. All X traffic happens on the
+    tracker thread; callbacks also run there, so they must be short and thread-safe.
+    """
+
+    def __init__(self, display_name: str | None = None):
+        if not _XLIB_AVAILABLE:
+            raise RuntimeError("python-xlib is not installed")
+        self.display_name = display_name or os.environ.get("DISPLAY", "")
+        self._dpy = xdisplay.Display(self.display_name or None)
+        self._dpy.set_error_handler(self._on_x_error)
+        self._root = self._dpy.screen().root
+        self._atoms = {
+            name: self._dpy.intern_atom(name)
+            for name in _WATCHED_PROPERTIES + ("_NET_CLIENT_LIST", "_NET_CLIENT_LIST_STACKING", "UTF8_STRING")
+        }
+        self._atom_names: dict[int, str] = {}
+        self._lock = threading.Lock()
+        self.index = WindowIndex()
+        self._subscribers: dict[int, tuple] = {}  # token -> (match, callback, once)
+        self._stacking_listeners = []
+        self._next_token = 1
+        self._use_client_list = False
+        self._running = True
+        self._wake_r, self._wake_w = os.pipe()
+
+        self._root.change_attributes(event_mask=X.SubstructureNotifyMask | X.PropertyChangeMask)
+        self._sync_clients()
+        self._sync_stacking()
+        self._dpy.flush()
+        self._thread = threading.Thread(
+            target=self._run, name=f"x11-tracker{self.display_name}", daemon=True
+        )
+        self._thread.start()
+
+    # ---- public API (any thread) ----
+
+    def windows(self) -> list[WindowInfo]:
+        return self.index.windows()
+
+    def get(self, wid: int) -> WindowInfo | None:
+        return self.index.get(wid)
+
+    def find(self, match, mapped: bool = False) -> WindowInfo | None:
+        """First known window accepted by match: a role name, a WindowMatch or any callable taking WindowInfo."""
+        if isinstance(match, str):
+            return self.index.by_role(match, mapped)
+        for info in self.index.windows():
+            if (info.mapped or not mapped) and match(info):
+                return info
+        return None
+
+    def subscribe(self, match, callback, once: bool = False) -> int:
+        """Call callback(info) (on the tracker thread) whenever a matching window appears or changes.
+        match is a role name or a callable taking WindowInfo."""
+        match = self._resolve(match)
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._subscribers[token] = (match, callback, once)
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def on_stacking_changed(self, callback) -> None:
+        """Call callback() (on the tracker thread) when the WM's stacking order changes."""
+        with self._lock:
+            self._stacking_listeners.append(callback)
+
+    def wait_for(self, match, timeout: float | None = None, mapped: bool = True) -> WindowInfo | None:
+        """Block until a window accepted by match (role name or callable) exists and is mapped, or timeout.
+        Returns it or None."""
+        match = self._resolve(match)
+        found = []
+        event = threading.Event()
+
+        def accept(info):
+            if mapped and not info.mapped:
+                return False
+            return match(info)
+
+        def on_match(info):
+            found.append(info)
+            event.set()
+
+        with self._lock:
+            for info in self.index.windows():
+                if accept(info):
+                    return info
+            token = self._next_token
+            self._next_token += 1
+            self._subscribers[token] = (accept, on_match, True)
+        if not event.wait(timeout):
+            self.unsubscribe(token)
+        return found[0] if found else None
+
+    async def wait_for_async(self, match, timeout: float | None = None, mapped: bool = True) -> WindowInfo | None:
+        """wait_for() for coroutines: suspends the awaiting task instead of blocking a thread.
+        Cancelling the task drops the subscription."""
+        match = self._resolve(match)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def accept(info):
+            if mapped and not info.mapped:
+                return False
+            return match(info)
+
+        def resolve(info):
+            if not future.done():
+                future.set_result(info)
+
+        def on_match(info):
+            loop.call_soon_threadsafe(resolve, info)
+
+        with self._lock:
+            for info in self.index.windows():
+                if accept(info):
+                    return info
+            token = self._next_token
+            self._next_token += 1
+            self._subscribers[token] = (accept, on_match, True)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.unsubscribe(token)
+
+    def _resolve(self, match):
+        if isinstance(match, str):
+            role = match
+            return lambda info: role in self.index.roles_of(info.wid)
+        return match
+
+    def close(self) -> None:
+        self._running = False
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass
+
+    # ---- tracker thread ----
+
+    def _on_x_error(self, err, *args):
+        """Errors from requests on windows that vanished meanwhile are expected; ignore them."""
+
+    def _run(self) -> None:
+        fd = self._dpy.fileno()
+        try:
+            while self._running:
+                if not self._dpy.pending_events():
+                    ready, _, _ = select.select([fd, self._wake_r], [], [])
+                    if self._wake_r in ready:
+                        os.read(self._wake_r, 64)
+                        continue
+                while self._dpy.pending_events():
+                    self._handle_event(self._dpy.next_event())
+                self._dpy.flush()
+        except Exception as e:
+            # Connection lost (e.g. Xephyr frame exited); nothing left to track
+            print(f"Window tracker for {self.display_name or 'default display'} stopped: {e}")
+        finally:
+            self._running = False
+            try:
+                self._dpy.close()
+            except Exception:
+                pass
+            for fd_ in (self._wake_r, self._wake_w):
+                try:
+                    os.close(fd_)
+                except OSError:
+                    pass
+            _forget_tracker(self)
+
+    def _handle_event(self, ev) -> None:
+        etype = ev.type
+        if etype == X.PropertyNotify:
+            if ev.window.id == self._root.id:
+                if ev.atom == self._atoms["_NET_CLIENT_LIST"]:
+                    self._sync_clients()
+                elif ev.atom == self._atoms["_NET_CLIENT_LIST_STACKING"]:
+                    self._sync_stacking()
+            elif ev.atom in (self._atoms[name] for name in _WATCHED_PROPERTIES):
+                self._refresh_window(ev.window.id)
+        elif etype == X.MapNotify:
+            wid = ev.window.id
+            if wid in self.index:
+                self._update(wid, mapped=True)
+            elif not self._use_client_list and ev.event.id == self._root.id:
+                self._add_window(wid)
+        elif etype == X.UnmapNotify:
+            if ev.window.id in self.index:
+                self._update(ev.window.id, mapped=False)
+        elif etype == X.ConfigureNotify:
+            wid = ev.window.id
+            if wid in self.index:
+                if ev.send_event:
+                    # Synthetic ConfigureNotify from the WM carries root coordinates (ICCCM 4.1.5)
+                    x, y = ev.x, ev.y
+                else:
+                    x, y = self._root_position(wid, ev.x, ev.y)
+                self._update(wid, x=x, y=y, width=ev.width, height=ev.height)
+        elif etype == X.DestroyNotify:
+            self.index.remove(ev.window.id)
+
+    def _client_list(self) -> list[int]:
+        prop = self._root.get_full_property(self._atoms["_NET_CLIENT_LIST"], Xatom.WINDOW)
+        if prop is not None:
+            self._use_client_list = True
+            return list(prop.value)
+        self._use_client_list = False
+        clients = []
+        for child in self._root.query_tree().children:
+            try:
+                if child.get_attributes().map_state == X.IsViewable:
+                    clients.append(child.id)
+            except xerror.XError:
+                continue
+        return clients
+
+    def _sync_clients(self) -> None:
+        try:
+            current = set(self._client_list())
+        except xerror.XError:
+            return
+        known = {info.wid for info in self.index.windows()}
+        if self._use_client_list:
+            self.index.retain(current)
+        for wid in current - known:
+            self._add_window(wid)
+
+    def _sync_stacking(self) -> None:
+        try:
+            prop = self._root.get_full_property(self._atoms["_NET_CLIENT_LIST_STACKING"], Xatom.WINDOW)
+        except xerror.XError:
+            return
+        self.index.set_stacking(list(prop.value) if prop is not None else ())
+        with self._lock:
+            listeners = list(self._stacking_listeners)
+        for callback in listeners:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Window tracker callback error: {e}")
+
+    def _add_window(self, wid: int) -> None:
+        win = self._dpy.create_resource_object("window", wid)
+        try:
+            win.change_attributes(event_mask=X.PropertyChangeMask | X.StructureNotifyMask)
+            info = self._read_window(win)
+        except xerror.XError:
+            return
+        self._store(info)
+
+    def _refresh_window(self, wid: int) -> None:
+        win = self._dpy.create_resource_object("window", wid)
+        try:
+            info = self._read_window(win)
+        except xerror.XError:
+            return
+        self._store(info)
+
+    def _read_window(self, win) -> WindowInfo:
+        title = ""
+        prop = win.get_full_property(self._atoms["_NET_WM_NAME"], self._atoms["UTF8_STRING"])
+        if prop is not None and prop.value:
+            value = prop.value
+            title = value.decode("utf-8", "replace") if isinstance(value, bytes) else str(value)
+        else:
+            name = win.get_wm_name()
+            if name:
+                title = name.decode("latin-1") if isinstance(name, bytes) else str(name)
+        wm_class = win.get_wm_class() or ()
+        pid = None
+        prop = win.get_full_property(self._atoms["_NET_WM_PID"], Xatom.CARDINAL)
+        if prop is not None and len(prop.value):
+            pid = int(prop.value[0])
+        states = set()
+        prop = win.get_full_property(self._atoms["_NET_WM_STATE"], Xatom.ATOM)
+        if prop is not None:
+            for atom in prop.value:
+                name = self._atom_name(atom)
+                if name.startswith(_STATE_PREFIX):
+                    states.add(name[len(_STATE_PREFIX):].lower())
+        decorated = True
+        prop = win.get_full_property(self._atoms["_MOTIF_WM_HINTS"], X.AnyPropertyType)
+        if prop is not None and len(prop.value) >= 3:
+            # flags bit 1 (MWM_HINTS_DECORATIONS) set and decorations == 0 -> borderless
+            decorated = not (prop.value[0] & 2 and prop.value[2] == 0)
+        geom = win.get_geometry()
+        x, y = self._root_position(win.id, geom.x, geom.y)
+        mapped = win.get_attributes().map_state == X.IsViewable
+        return WindowInfo(
+            win.id, title=title, wm_class=wm_class, pid=pid,
+            x=x, y=y, width=geom.width, height=geom.height, mapped=mapped,
+            states=states, decorated=decorated,
+        )
+
+    def _atom_name(self, atom: int) -> str:
+        name = self._atom_names.get(atom)
+        if name is None:
+            name = self._dpy.get_atom_name(atom)
+            self._atom_names[atom] = name
+        return name
+
+    def _root_position(self, wid: int, fallback_x: int, fallback_y: int) -> tuple[int, int]:
+        try:
+            win = self._dpy.create_resource_object("window", wid)
+            t = self._root.translate_coords(win, 0, 0)
+            return t.x, t.y
+        except xerror.XError:
+            return fallback_x, fallback_y
+
+    def _update(self, wid: int, **changes) -> None:
+        info = self.index.get(wid)
+        if info is None:
+            return
+        self._store(info.replace(**changes))
+
+    def _store(self, info: WindowInfo) -> None:
+        self.index.put(info)
+        with self._lock:
+            matched = []
+            for token, (match, callback, once) in list(self._subscribers.items()):
+                try:
+                    ok = match(info)
+                except Exception:
+                    ok = False
+                if ok:
+                    matched.append(callback)
+                    if once:
+                        del self._subscribers[token]
+        for callback in matched:
+            try:
+                callback(info)
+            except Exception as e:
+                print(f"Window tracker callback error: {e}")
+
+
+_trackers: dict[str, WindowTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def _forget_tracker(tracker: WindowTracker) -> None:
+    with _trackers_lock:
+        if _trackers.get(tracker.display_name) is tracker:
+            del _trackers[tracker.display_name]
+
+
+def get_tracker(display: str | None = None) -> WindowTracker | None:
+    """Shared tracker for an X display (default: $DISPLAY). None if python-xlib is missing or the display can't be opened."""
+    if not _XLIB_AVAILABLE:
+        return None
+    name = display or os.environ.get("DISPLAY", "")
+    with _trackers_lock:
+        tracker = _trackers.get(name)
+        if tracker is not None:
+            return tracker
+        try:
+            tracker = WindowTracker(name)
+        except Exception:
+            return None
+        _trackers[name] = tracker
+        return tracker
+
+
+def get_index(display: str | None = None) -> WindowIndex | None:
+    """Window index of the shared tracker for an X display, or None when tracking is unavailable."""
+    tracker = get_tracker(display)
+    return tracker.index if tracker is not None else None
@@ -0,0 +1,104 @@
+"""
+Display numbers and readiness for the nested X servers (the Xephyr frames in hud_app).
+A free display number is picked at launch instead of a fixed :98 / :99, after removing the lock files
+(and sockets) of servers that died without cleaning up, which would otherwise make the launch fail.
+The server is started with -displayfd and reports the moment it accepts connections, so nobody waits
+longer than the server actually needs.
+"""
+
+import asyncio
+import glob
+import os
+import re
+
+_LOCK = "/tmp/.X{}-lock"
+_SOCKET = "/tmp/.X11-unix/X{}"
+_LOCK_NAME = re.compile(r"\.X(\d+)-lock")
+
+# How far past the preferred number to look for a free display
+_SEARCH = 32
+
+
+def _lock_pid(path: str) -> int | None:
+    """pid in an X lock file (ASCII, space padded); None if it holds no number. OSError if unreadable."""
+    with open(path) as f:
+        text = f.read().strip()
+    return int(text) if text.isdigit() else None
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # someone else's server
+    return True
+
+
+def clean_stale_locks() -> list[int]:
+    """Remove the lock files and sockets of X servers that are no longer running. Returns their numbers."""
+    removed = []
+    for path in glob.glob(_LOCK.format("*")):
+        match = _LOCK_NAME.fullmatch(os.path.basename(path))
+        if match is None:
+            continue
+        try:
+            pid = _lock_pid(path)
+        except OSError:
+            continue
+        if pid is not None and _alive(pid):
+            continue
+        number = int(match.group(1))
+        for stale in (path, _SOCKET.format(number)):
+            try:
+                os.unlink(stale)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Could not remove stale X lock {stale}: {e}")
+                break
+        else:
+            removed.append(number)
+    return removed
+
+
+def free_display(start: int, exclude=()) -> int | None:
+    """First display number from start on with no X server (lock file) that isn't in exclude; None when
+    every number in the search range is taken."""
+    for number in range(start, start + _SEARCH):
+        if number not in exclude and not os.path.exists(_LOCK.format(number)):
+            return number
+    return None
+
+
+async def wait_displayfd(fd: int, alive, timeout: float) -> int | None:
+    """
+    Display number an X server started with -displayfd writes to fd once it accepts connections.
+    None on timeout, or as soon as alive() returns False (the server exited, e.g. its display was taken).
+    fd must be non-blocking.
+    """
+    loop = asyncio.get_running_loop()
+    readable = asyncio.Event()
+    loop.add_reader(fd, readable.set)
+    data = b""
+    deadline = loop.time() + timeout
+    try:
+        while loop.time() < deadline:
+            try:
+                await asyncio.wait_for(readable.wait(), 0.1)
+            except asyncio.TimeoutError:
+                if not alive():
+                    return None
+                continue
+            readable.clear()
+            try:
+                data += os.read(fd, 64)
+            except BlockingIOError:
+                continue
+            line, newline, _rest = data.partition(b"\n")
+            if newline:
+                return int(line) if line.strip().isdigit() else None
+        return None
+    finally:
+        loop.remove_reader(fd)